@@ -43,6 +43,19 @@ else:
 class Settings:
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///db/sql_app.db")
+    # URL for the asyncio engine. Empty derives it from DATABASE_URL (sqlite:// becomes sqlite+aiosqlite://)
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    # Connection pool of each engine (file databases only)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # SQLite pragmas set on every new connection. An empty value keeps SQLite's default.
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: str = os.getenv("SQLITE_BUSY_TIMEOUT_MS", "15000")
+    SQLITE_CACHE_SIZE_MB: str = os.getenv("SQLITE_CACHE_SIZE_MB", "64")
+    SQLITE_MMAP_SIZE_MB: str = os.getenv("SQLITE_MMAP_SIZE_MB", "256")
+    SQLITE_TEMP_STORE: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
 
     # Authentication
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here")
@@ -66,6 +79,39 @@ class Settings:
     MQ_PASSWORD: str = os.getenv("MQ_PASSWORD", "guest")
     MQ_QUEUE_NAME: str = os.getenv("MQ_QUEUE_NAME", "terean_queue")
 
+    # 2D render caches (interpolated grids and finished figures), in megabytes
+    RENDER_GRID_CACHE_MB: int = int(os.getenv("RENDER_GRID_CACHE_MB", "512"))
+    RENDER_PNG_CACHE_MB: int = int(os.getenv("RENDER_PNG_CACHE_MB", "128"))
+    # Parsed project settings (options, picks, disper settings) served from memory
+    PROJECT_SETTINGS_CACHE_MB: int = int(os.getenv("PROJECT_SETTINGS_CACHE_MB", "64"))
+
+    # Render worker processes. 0 renders in the API process instead.
+    RENDER_WORKERS: int = int(os.getenv("RENDER_WORKERS", "2"))
+    RENDER_WORKER_MAX_JOBS: int = int(os.getenv("RENDER_WORKER_MAX_JOBS", "200"))
+    RENDER_JOB_TIMEOUT: float = float(os.getenv("RENDER_JOB_TIMEOUT", "120"))
+
+    # Compression of completed projects' SEG-Y records. Hours between passes, 0 disables the schedule.
+    ARCHIVE_COMPRESSION_INTERVAL_HOURS: float = float(os.getenv("ARCHIVE_COMPRESSION_INTERVAL_HOURS", "24"))
+    # Size limit for decompressed copies of archived records, in megabytes
+    DECOMPRESSED_CACHE_MB: int = int(os.getenv("DECOMPRESSED_CACHE_MB", "2048"))
+
+    # nginx internal location that maps to MQ_SAVE_DIR (e.g. /protected-data/). When set, downloads of files already
+    # on disk (uncompressed records, project files, prebuilt bundles) are handed off to nginx with X-Accel-Redirect
+    # instead of being streamed by the app. Empty disables.
+    DOWNLOAD_ACCEL_REDIRECT_PREFIX: str = os.getenv("DOWNLOAD_ACCEL_REDIRECT_PREFIX", "")
+
+    # Seconds a project must go without record changes before its records zip is prebuilt. Negative disables.
+    ARCHIVE_BUNDLE_DELAY_SECONDS: float = float(os.getenv("ARCHIVE_BUNDLE_DELAY_SECONDS", "60"))
+
+    # Threads used to deflate zip archive entries. 0 compresses in the request's thread.
+    ZIP_COMPRESSION_THREADS: int = int(os.getenv("ZIP_COMPRESSION_THREADS", "4"))
+
+    # Files of a multi-file upload that are received and written to disk at the same time
+    UPLOAD_CONCURRENCY: int = int(os.getenv("UPLOAD_CONCURRENCY", "4"))
+
+    # Storage GC leaves files modified or linked within this many hours alone
+    STORAGE_GC_GRACE_HOURS: float = float(os.getenv("STORAGE_GC_GRACE_HOURS", "24"))
+
     # Download URL
     DOWNLOAD_BASE_URL: str = os.getenv("DOWNLOAD_BASE_URL", "http://localhost:8000")
 
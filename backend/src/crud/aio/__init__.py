@@ -0,0 +1,7 @@
+"""
+Async versions of the CRUD modules, for request handlers using database.get_async_db.
+
+Reads are native async queries, and load every relationship the callers read up front, since an async session can't
+lazy load. Writes run the synchronous function of the same name through AsyncSession.run_sync, so revisions, cache
+invalidation and the rest of the write logic live in one place.
+"""
@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from crud import client_crud
+from models.client_model import ClientDBModel
+from schemas.client_schema import ClientCreate
+from utils.search_index import search_filter
+
+
+async def create_client(db: AsyncSession, new_client: ClientCreate) -> ClientDBModel:
+    client = await db.run_sync(client_crud.create_client, new_client)
+    return await get_client(db, client.id)
+
+
+async def get_client(db: AsyncSession, client_id: int) -> Optional[ClientDBModel]:
+    """The client with its contacts loaded, as the Client schema reads them."""
+    return await db.scalar(
+        select(ClientDBModel).filter(ClientDBModel.id == client_id).options(selectinload(ClientDBModel.contacts))
+    )
+
+
+async def get_clients(
+    db: AsyncSession, skip: int = 0, limit: int = 100, name_search: Optional[str] = None
+) -> List[ClientDBModel]:
+    query = select(ClientDBModel).options(selectinload(ClientDBModel.contacts))
+    if name_search:
+        query = query.filter(search_filter("clients", name_search))
+    return list(await db.scalars(query.offset(skip).limit(limit)))
@@ -0,0 +1,35 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import contact_crud
+from models.contact_model import ContactDBModel
+from schemas.contact_schema import ContactCreate
+from utils.search_index import search_filter
+
+
+async def create_contact(db: AsyncSession, new_contact: ContactCreate) -> ContactDBModel:
+    return await db.run_sync(contact_crud.create_contact, new_contact)
+
+
+async def get_contact(db: AsyncSession, contact_id: int) -> Optional[ContactDBModel]:
+    return await db.scalar(select(ContactDBModel).filter(ContactDBModel.id == contact_id))
+
+
+async def get_contacts(
+    db: AsyncSession, skip: int = 0, limit: int = 100, search: Optional[str] = None
+) -> List[ContactDBModel]:
+    query = select(ContactDBModel)
+    if search:
+        query = query.filter(search_filter("contacts", search))
+    return list(await db.scalars(query.offset(skip).limit(limit)))
+
+
+async def get_contacts_by_client(
+    db: AsyncSession, client_id: int, skip: int = 0, limit: int = 100, search: Optional[str] = None
+) -> List[ContactDBModel]:
+    query = select(ContactDBModel).filter(ContactDBModel.client_id == client_id)
+    if search:
+        query = query.filter(search_filter("contacts", search))
+    return list(await db.scalars(query.offset(skip).limit(limit)))
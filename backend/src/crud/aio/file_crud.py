@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import file_crud
+from models.file_model import FileDBModel
+
+
+async def get_file_info(db: AsyncSession, file_id: str) -> Optional[FileDBModel]:
+    return await db.scalar(select(FileDBModel).filter(FileDBModel.id == file_id))
+
+
+async def get_files_info_by_project(
+    db: AsyncSession, project_id: str, skip: int = 0, limit: int = 100
+) -> List[FileDBModel]:
+    rows = await db.scalars(select(FileDBModel).filter(FileDBModel.project_id == project_id).offset(skip).limit(limit))
+    return list(rows)
+
+
+async def delete_file_info(db: AsyncSession, file_id: str) -> bool:
+    return await db.run_sync(file_crud.delete_file_info, file_id)
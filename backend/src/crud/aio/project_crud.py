@@ -0,0 +1,78 @@
+from typing import Any, List, Optional
+
+from sqlalchemy import Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from crud import project_crud
+from models.client_model import ClientDBModel
+from models.project_model import ProjectDBModel
+from models.project_pick_model import ProjectPickDBModel
+from schemas.project_schema import ProjectUpdate
+
+
+async def get_project(db: AsyncSession, project_id: str) -> Optional[ProjectDBModel]:
+    """The project with everything Project.from_db reads loaded."""
+    return await db.scalar(
+        select(ProjectDBModel)
+        .filter(ProjectDBModel.id == project_id)
+        .options(
+            selectinload(ProjectDBModel.client).selectinload(ClientDBModel.contacts),
+            selectinload(ProjectDBModel.records),
+            selectinload(ProjectDBModel.additional_files),
+            selectinload(ProjectDBModel.picks),
+        )
+    )
+
+
+async def get_project_fields(db: AsyncSession, project_id: str, *fields: str) -> Optional[Row]:
+    columns = [getattr(ProjectDBModel, field) for field in fields]
+    return (await db.execute(select(*columns).filter(ProjectDBModel.id == project_id))).first()
+
+
+async def get_project_revision(db: AsyncSession, project_id: str) -> Optional[int]:
+    return await db.scalar(select(ProjectDBModel.revision).filter(ProjectDBModel.id == project_id))
+
+
+async def get_project_picks(db: AsyncSession, project_id: str) -> List[dict]:
+    rows = await db.scalars(
+        select(ProjectPickDBModel)
+        .filter(ProjectPickDBModel.project_id == project_id)
+        .order_by(ProjectPickDBModel.position)
+    )
+    return [row.to_dict() for row in rows]
+
+
+async def create_default_project(db: AsyncSession, project_id: str):
+    return await db.run_sync(project_crud.create_default_project, project_id)
+
+
+async def update_project_columns(db: AsyncSession, project_id: str, **values: Any) -> bool:
+    return await db.run_sync(project_crud.update_project_columns, project_id, **values)
+
+
+async def replace_project_picks(db: AsyncSession, project_id: str, picks: List[dict]) -> int:
+    return await db.run_sync(project_crud.replace_project_picks, project_id, picks)
+
+
+async def patch_project_picks(
+    db: AsyncSession,
+    project_id: str,
+    added: List[dict],
+    moved: dict[int, dict],
+    deleted: List[int],
+    base_revision: Optional[int] = None,
+) -> tuple[int, List[int]]:
+    return await db.run_sync(project_crud.patch_project_picks, project_id, added, moved, deleted, base_revision)
+
+
+async def update_project(db: AsyncSession, project_id: str, project: ProjectUpdate) -> Optional[ProjectDBModel]:
+    """Like project_crud.update_project, returning the project reloaded with its relationships."""
+    if await db.run_sync(project_crud.update_project, project_id, project) is None:
+        return None
+    db.expunge_all()
+    return await get_project(db, project_id)
+
+
+async def delete_project(db: AsyncSession, project_id: str) -> bool:
+    return await db.run_sync(project_crud.delete_project, project_id)
@@ -0,0 +1,24 @@
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from crud import sgy_file_crud
+from models.sgy_file_model import SgyFileDBModel
+
+
+async def get_sgy_file_info(db: AsyncSession, sgy_file_id: str) -> Optional[SgyFileDBModel]:
+    return await db.scalar(select(SgyFileDBModel).filter(SgyFileDBModel.id == sgy_file_id))
+
+
+async def get_sgy_files_info_by_project(
+    db: AsyncSession, project_id: str, skip: int = 0, limit: int = 100
+) -> List[SgyFileDBModel]:
+    rows = await db.scalars(
+        select(SgyFileDBModel).filter(SgyFileDBModel.project_id == project_id).offset(skip).limit(limit)
+    )
+    return list(rows)
+
+
+async def delete_sgy_file_info(db: AsyncSession, sgy_file_id: str) -> bool:
+    return await db.run_sync(sgy_file_crud.delete_sgy_file_info, sgy_file_id)
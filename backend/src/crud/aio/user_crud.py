@@ -0,0 +1,14 @@
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user_model import UserDBModel
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[UserDBModel]:
+    return await db.scalar(select(UserDBModel).filter(UserDBModel.username == username))
+
+
+async def get_user_by_id(db: AsyncSession, id: int) -> Optional[UserDBModel]:
+    return await db.scalar(select(UserDBModel).filter(UserDBModel.id == id))
@@ -0,0 +1,82 @@
+import logging
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from models.blob_model import BlobDBModel
+from utils.frame_compression import is_compressed
+
+logger = logging.getLogger(__name__)
+
+
+def get_blob(db: Session, content_hash: str):
+    return db.query(BlobDBModel).filter(BlobDBModel.hash == content_hash).first()
+
+
+def get_blobs(db: Session, skip: int = 0, limit: int = 100):
+    return db.query(BlobDBModel).offset(skip).limit(limit).all()
+
+
+def get_all_blobs(db: Session):
+    return db.query(BlobDBModel).all()
+
+
+def create_blob(db: Session, content_hash: str, path: str, size: int, commit: bool = True):
+    """
+    :param commit: Commit the new row. When False it is only flushed, for callers batching several writes into one
+        transaction.
+    """
+    db_blob = BlobDBModel(hash=content_hash, path=path, size=size, ref_count=0)
+    db.add(db_blob)
+    if commit:
+        db.commit()
+        db.refresh(db_blob)
+    else:
+        db.flush()
+    return db_blob
+
+
+def change_blob_ref_count(db: Session, content_hash: str, delta: int, commit: bool = True):
+    """
+    :param commit: Commit the change. When False it is only flushed.
+    """
+    db_blob = db.query(BlobDBModel).filter(BlobDBModel.hash == content_hash).first()
+    if db_blob:
+        db_blob.ref_count = max(db_blob.ref_count + delta, 0)
+        if commit:
+            db.commit()
+            db.refresh(db_blob)
+        else:
+            db.flush()
+        return db_blob
+    return None
+
+
+def release_row_blob_refs(db: Session, rows: Iterable):
+    """
+    Drop the blob references held by sgy_files/files rows that are being deleted, flushed into the caller's
+    transaction so the counts change together with the rows. Rows stored before the blob store and compressed records
+    (which gave up theirs when they were compressed) hold none. Blobs left without references stay on disk until
+    utils.blob_store.delete_unreferenced_blob or the storage GC removes them.
+    """
+    for row in rows:
+        if row.content_hash and not is_compressed(row.path):
+            change_blob_ref_count(db, row.content_hash, -1, commit=False)
+
+
+def set_blob_ref_count(db: Session, content_hash: str, ref_count: int):
+    db_blob = db.query(BlobDBModel).filter(BlobDBModel.hash == content_hash).first()
+    if db_blob:
+        db_blob.ref_count = ref_count
+        db.commit()
+        db.refresh(db_blob)
+    return db_blob
+
+
+def delete_blob(db: Session, content_hash: str):
+    db_blob = db.query(BlobDBModel).filter(BlobDBModel.hash == content_hash).first()
+    if db_blob:
+        db.delete(db_blob)
+        db.commit()
+        return True
+    return False
@@ -1,7 +1,10 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 from models.client_model import ClientDBModel
 from schemas.client_schema import ClientCreate
+from utils.search_index import search_filter
 
 
 def create_client(
@@ -24,5 +27,9 @@ def get_clients(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    name_search: Optional[str] = None,
 ):
-    return db.query(ClientDBModel).offset(skip).limit(limit).all() 
\ No newline at end of file
+    query = db.query(ClientDBModel)
+    if name_search:
+        query = query.filter(search_filter("clients", name_search))
+    return query.offset(skip).limit(limit).all() 
\ No newline at end of file
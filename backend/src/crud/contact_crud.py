@@ -1,7 +1,10 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 
 from models.contact_model import ContactDBModel
 from schemas.contact_schema import ContactCreate
+from utils.search_index import search_filter
 
 
 def create_contact(
@@ -24,5 +27,21 @@ def get_contacts(
     db: Session,
     skip: int = 0,
     limit: int = 100,
+    search: Optional[str] = None,
+):
+    query = db.query(ContactDBModel)
+    if search:
+        query = query.filter(search_filter("contacts", search))
+    return query.offset(skip).limit(limit).all()
+
+def get_contacts_by_client(
+    db: Session,
+    client_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None,
 ):
-    return db.query(ContactDBModel).offset(skip).limit(limit).all() 
\ No newline at end of file
+    query = db.query(ContactDBModel).filter(ContactDBModel.client_id == client_id)
+    if search:
+        query = query.filter(search_filter("contacts", search))
+    return query.offset(skip).limit(limit).all() 
\ No newline at end of file
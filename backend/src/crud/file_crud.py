@@ -1,7 +1,10 @@
 import logging
+from typing import List
 
 from sqlalchemy.orm import Session
 
+from crud.blob_crud import release_row_blob_refs
+from crud.project_crud import touch_projects
 from models.file_model import FileDBModel
 from schemas.file_schema import FileCreate
 
@@ -16,6 +19,10 @@ def get_files_info(db: Session, skip: int = 0, limit: int = 100):
     return db.query(FileDBModel).offset(skip).limit(limit).all()
 
 
+def get_all_files_info(db: Session):
+    return db.query(FileDBModel).all()
+
+
 def get_files_info_by_project(db: Session, project_id: str, skip: int = 0, limit: int = 100):
     return db.query(FileDBModel).filter(FileDBModel.project_id == project_id).offset(skip).limit(limit).all()
 
@@ -23,15 +30,35 @@ def get_files_info_by_project(db: Session, project_id: str, skip: int = 0, limit
 def create_file_info(db: Session, file: FileCreate):
     db_file = FileDBModel(**file.model_dump())
     db.add(db_file)
+    touch_projects(db, [db_file.project_id])
     db.commit()
     db.refresh(db_file)
     return db_file
 
 
+def create_files_info(db: Session, files: List[FileCreate], commit: bool = True) -> List[FileDBModel]:
+    """
+    Insert several rows in one transaction.
+
+    :param commit: Commit the rows. When False they are only flushed, so the caller can add more writes to the same
+        transaction before committing.
+    """
+    db_rows = [FileDBModel(**row.model_dump()) for row in files]
+    db.add_all(db_rows)
+    touch_projects(db, [row.project_id for row in db_rows])
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return db_rows
+
+
 def delete_file_info(db: Session, file_id: str):
     db_file = db.query(FileDBModel).filter(FileDBModel.id == file_id).first()
     if db_file:
         db.delete(db_file)
+        release_row_blob_refs(db, [db_file])
+        touch_projects(db, [db_file.project_id])
         db.commit()
         return True
     return False
@@ -40,8 +67,10 @@ def delete_file_info(db: Session, file_id: str):
 def update_file_info(db: Session, file_id: str, file: FileCreate):
     db_file = db.query(FileDBModel).filter(FileDBModel.id == file_id).first()
     if db_file:
+        old_project_id = db_file.project_id
         for key, value in file.model_dump().items():
             setattr(db_file, key, value)
+        touch_projects(db, [old_project_id, db_file.project_id])
         db.commit()
         db.refresh(db_file)
         return db_file
@@ -1,17 +1,22 @@
+import copy
 import datetime
 import json
 import logging
-from typing import List, Optional, Any, Type
+from typing import Iterable, List, Optional, Any, Type
 
+from sqlalchemy import Row, func, insert, update
 from sqlalchemy.orm import Session
 
+from crud.blob_crud import release_row_blob_refs
 from models import SgyFileDBModel
 from models.project_model import ProjectDBModel
+from models.project_pick_model import ProjectPickDBModel
 from schemas.project_schema import ProjectCreate, Project, ProjectUpdate
 from utils.custom_types.Priority import Priority
 from utils.custom_types.ProjectStatus import ProjectStatus
 from utils.custom_types.LengthUnit import LengthUnit
 from utils.custom_types.AsceVersion import AsceVersion
+from utils.project_cache import invalidate_on_commit, project_count_cache, project_settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +66,19 @@ DEFAULT_DISPER_SETTINGS = {
 }
 
 
+def _json_value(value: Any, default: Any) -> Any:
+    """Native value of a JSON field given as JSON text, a value, or None for the default."""
+    if value is None:
+        return copy.deepcopy(default)
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _pick_rows(picks: List[dict]) -> List[ProjectPickDBModel]:
+    return [ProjectPickDBModel(position=position, **pick) for position, pick in enumerate(picks)]
+
+
 def get_project(db: Session, project_id: str) -> Optional[ProjectDBModel]:
     return db.query(ProjectDBModel).filter(ProjectDBModel.id == project_id).first()
 
@@ -69,7 +87,167 @@ def get_projects(db: Session, skip: int = 0, limit: int = 100) -> list[Type[Proj
     return db.query(ProjectDBModel).offset(skip).limit(limit).all()
 
 
-def create_project(db: Session, project: ProjectCreate | Project) -> ProjectDBModel:
+def get_project_ids(db: Session) -> set[str]:
+    return {project_id for (project_id,) in db.query(ProjectDBModel.id).all()}
+
+
+def get_project_fields(db: Session, project_id: str, *fields: str) -> Optional[Row]:
+    """
+    Load only some columns of a project.
+
+    :param fields: Column names.
+    :return: Row with the columns as attributes, or None if the project doesn't exist.
+    """
+    columns = [getattr(ProjectDBModel, field) for field in fields]
+    return db.query(*columns).filter(ProjectDBModel.id == project_id).first()
+
+
+class RevisionConflict(Exception):
+    """The project changed since the revision a client based its edit on."""
+
+    def __init__(self, current_revision: Optional[int]):
+        super().__init__(f"Project is at revision {current_revision}")
+        self.current_revision = current_revision
+
+
+def _bump_revision(db: Session, project_id: str, base_revision: Optional[int] = None) -> int:
+    """
+    Increment a project's revision in the current transaction.
+
+    :param base_revision: Only bump if the project is still at this revision. None skips the check.
+    :return: The new revision.
+    :raises RevisionConflict: If the project is at another revision (or doesn't exist).
+    """
+    query = db.query(ProjectDBModel).filter(ProjectDBModel.id == project_id)
+    if base_revision is not None:
+        query = query.filter(ProjectDBModel.revision == base_revision)
+    # Compare and increment in one UPDATE, so concurrent editors can't both pass the check
+    if query.update({ProjectDBModel.revision: ProjectDBModel.revision + 1}, synchronize_session=False) == 0:
+        current = get_project_revision(db, project_id)
+        db.rollback()
+        raise RevisionConflict(current)
+    return get_project_revision(db, project_id)
+
+
+def get_project_revision(db: Session, project_id: str) -> Optional[int]:
+    return db.query(ProjectDBModel.revision).filter(ProjectDBModel.id == project_id).scalar()
+
+
+def touch_projects(db: Session, project_ids: Iterable[Optional[str]]):
+    """
+    Bump the revision of projects whose records or additional files change in the current transaction, so their
+    ETags change with them. Their cache entries are invalidated when the transaction commits.
+    """
+    project_ids = {project_id for project_id in project_ids if project_id}
+    if not project_ids:
+        return
+    db.query(ProjectDBModel).filter(ProjectDBModel.id.in_(project_ids)).update(
+        {ProjectDBModel.revision: ProjectDBModel.revision + 1}, synchronize_session=False
+    )
+    invalidate_on_commit(db, project_ids)
+
+
+def update_project_columns(db: Session, project_id: str, **values: Any) -> bool:
+    """
+    Write only the given columns of a project, in one UPDATE, and bump its revision.
+
+    :return: False if the project doesn't exist.
+    """
+    values[ProjectDBModel.revision] = ProjectDBModel.revision + 1
+    updated = db.query(ProjectDBModel).filter(ProjectDBModel.id == project_id).update(values)
+    db.commit()
+    project_settings_cache.invalidate(project_id)
+    return updated > 0
+
+
+def get_project_picks(db: Session, project_id: str) -> List[dict]:
+    rows = (
+        db.query(ProjectPickDBModel)
+        .filter(ProjectPickDBModel.project_id == project_id)
+        .order_by(ProjectPickDBModel.position)
+        .all()
+    )
+    return [row.to_dict() for row in rows]
+
+
+def replace_project_picks(db: Session, project_id: str, picks: List[dict]) -> int:
+    """
+    Replace all picks of a project, leaving the rest of the project row alone.
+
+    :return: The project's new revision.
+    """
+    db.query(ProjectPickDBModel).filter(ProjectPickDBModel.project_id == project_id).delete()
+    if picks:
+        db.execute(
+            insert(ProjectPickDBModel),
+            [{"project_id": project_id, "position": position, **pick} for position, pick in enumerate(picks)],
+        )
+    revision = _bump_revision(db, project_id)
+    db.commit()
+    project_settings_cache.invalidate(project_id)
+    return revision
+
+
+def patch_project_picks(
+    db: Session,
+    project_id: str,
+    added: List[dict],
+    moved: dict[int, dict],
+    deleted: List[int],
+    base_revision: Optional[int] = None,
+) -> tuple[int, List[int]]:
+    """
+    Apply a batch of pick edits in one transaction, touching only the picks named.
+
+    :param added: Picks to append after the existing ones.
+    :param moved: New values by pick id.
+    :param deleted: Ids of picks to delete.
+    :param base_revision: Revision the edits are based on. None skips the conflict check.
+    :return: Tuple of (new revision, ids of the added picks in order).
+    :raises RevisionConflict: If the project is no longer at base_revision.
+    :raises ValueError: If a moved or deleted pick doesn't belong to the project. Nothing is written.
+    """
+    revision = _bump_revision(db, project_id, base_revision)
+
+    touched_ids = set(moved) | set(deleted)
+    if touched_ids:
+        found_ids = {
+            pick_id for (pick_id,) in db.query(ProjectPickDBModel.id).filter(
+                ProjectPickDBModel.project_id == project_id, ProjectPickDBModel.id.in_(touched_ids)
+            )
+        }
+        missing_ids = touched_ids - found_ids
+        if missing_ids:
+            db.rollback()
+            raise ValueError(f"Picks not found: {sorted(missing_ids)}")
+
+    if deleted:
+        db.query(ProjectPickDBModel).filter(ProjectPickDBModel.id.in_(deleted)).delete(synchronize_session=False)
+    if moved:
+        db.execute(update(ProjectPickDBModel), [{"id": pick_id, **values} for pick_id, values in moved.items()])
+
+    added_rows = []
+    if added:
+        next_position = (
+            db.query(func.max(ProjectPickDBModel.position)).filter(ProjectPickDBModel.project_id == project_id).scalar()
+        )
+        next_position = 0 if next_position is None else next_position + 1
+        added_rows = [
+            ProjectPickDBModel(project_id=project_id, position=next_position + i, **pick)
+            for i, pick in enumerate(added)
+        ]
+        db.add_all(added_rows)
+        db.flush()
+    db.commit()
+    project_settings_cache.invalidate(project_id)
+    return revision, [row.id for row in added_rows]
+
+
+def create_project(db: Session, project: ProjectCreate | Project, commit: bool = True) -> ProjectDBModel:
+    """
+    :param commit: Commit the new project. When False it is only flushed, so the caller can add its files in the same
+        transaction.
+    """
     # Convert to dict and replace None values with defaults
     project_data = project.model_dump()
     logger.info(f"Received initial project data:\n{project_data}")
@@ -95,27 +273,26 @@ def create_project(db: Session, project: ProjectCreate | Project) -> ProjectDBMo
         project_data["asce_version"] = DEFAULT_ASCE_VERSION
     if project_data.get("received_date") is None:
         project_data["received_date"] = datetime.datetime.now()
-    if project_data.get("geometry") is None:
-        project_data["geometry"] = json.dumps(DEFAULT_GEOMETRY)
-    if project_data.get("record_options") is None:
-        project_data["record_options"] = json.dumps(DEFAULT_RECORD_OPTIONS)
-    if project_data.get("plot_limits") is None:
-        project_data["plot_limits"] = json.dumps(DEFAULT_PLOT_LIMITS)
-    if project_data.get("freq") is None:
-        project_data["freq"] = json.dumps(DEFAULT_FREQ)
-    if project_data.get("slow") is None:
-        project_data["slow"] = json.dumps(DEFAULT_SLOW)
-    if project_data.get("picks") is None:
-        project_data["picks"] = json.dumps(DEFAULT_PICKS)
-    if project_data.get("disper_settings") is None:
-        project_data["disper_settings"] = json.dumps(DEFAULT_DISPER_SETTINGS)
+    # JSON fields arrive as JSON text from the API and are stored natively
+    project_data["geometry"] = _json_value(project_data.get("geometry"), DEFAULT_GEOMETRY)
+    project_data["record_options"] = _json_value(project_data.get("record_options"), DEFAULT_RECORD_OPTIONS)
+    project_data["plot_limits"] = _json_value(project_data.get("plot_limits"), DEFAULT_PLOT_LIMITS)
+    project_data["freq"] = _json_value(project_data.get("freq"), DEFAULT_FREQ)
+    project_data["slow"] = _json_value(project_data.get("slow"), DEFAULT_SLOW)
+    project_data["disper_settings"] = _json_value(project_data.get("disper_settings"), DEFAULT_DISPER_SETTINGS)
+    picks = _json_value(project_data.pop("picks", None), DEFAULT_PICKS)
     
     logger.info(f"Replaced all none's with default, project data is now:\n{project_data}")
     db_project = ProjectDBModel(**project_data)
+    db_project.picks = _pick_rows(picks)
     logger.info(f"Created ProjectDBModel:\n{db_project}")
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    invalidate_on_commit(db, [db_project.id])
+    if commit:
+        db.commit()
+        db.refresh(db_project)
+    else:
+        db.flush()
     return db_project
 
 
@@ -124,18 +301,11 @@ def create_default_project(
     project_id: str,
 ):
     # Create a ProjectCreate with all defaults
-    default_project_create = Project(
+    default_project_create = ProjectCreate(
         id=project_id,
         name=DEFAULT_PROJECT_NAME,
         display_units=DEFAULT_DISPLAY_UNITS,
         asce_version=DEFAULT_ASCE_VERSION,
-        geometry=json.dumps(DEFAULT_GEOMETRY),
-        record_options=json.dumps(DEFAULT_RECORD_OPTIONS),
-        plot_limits=json.dumps(DEFAULT_PLOT_LIMITS),
-        freq=json.dumps(DEFAULT_FREQ),
-        slow=json.dumps(DEFAULT_SLOW),
-        picks=json.dumps(DEFAULT_PICKS),
-        disper_settings=json.dumps(DEFAULT_DISPER_SETTINGS)
     )
     created_project = create_project(db, default_project_create)
     return created_project
@@ -161,16 +331,29 @@ def update_project(db: Session, project_id: str, project: ProjectUpdate) -> Opti
                 if value is not None and value == datetime.datetime.fromtimestamp(0, datetime.timezone.utc):
                     continue
             setattr(db_project, key, value)
+        db_project.revision = ProjectDBModel.revision + 1
         db.commit()
+        project_settings_cache.invalidate(project_id)
+        project_count_cache.clear()
         db.refresh(db_project)
     return db_project
 
 
 def delete_project(db: Session, project_id: str) -> bool:
+    """
+    Delete a project with its record and file rows, releasing their blob references in the same transaction. The
+    files they link to are left for the caller (or the storage GC) to remove.
+    """
     db_project = get_project(db, project_id)
     if db_project:
+        rows = [*db_project.records, *db_project.additional_files]
+        release_row_blob_refs(db, rows)
+        for row in rows:
+            db.delete(row)
         db.delete(db_project)
         db.commit()
+        project_settings_cache.invalidate(project_id)
+        project_count_cache.clear()
         return True
     return False
 
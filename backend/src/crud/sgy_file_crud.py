@@ -1,9 +1,14 @@
 import logging
+from typing import List
 
 from sqlalchemy.orm import Session
 
+from crud.blob_crud import release_row_blob_refs
+from crud.project_crud import touch_projects
+from models.project_model import ProjectDBModel
 from models.sgy_file_model import SgyFileDBModel
 from schemas.sgy_file_schema import SgyFileCreate
+from utils.custom_types.ProjectStatus import ProjectStatus
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +26,53 @@ def get_sgy_files_info_by_project(db: Session, project_id: str, skip: int = 0, l
     return db.query(SgyFileDBModel).filter(SgyFileDBModel.project_id == project_id).offset(skip).limit(limit).all()
 
 
+def get_all_sgy_files_info(db: Session):
+    return db.query(SgyFileDBModel).all()
+
+
+def get_sgy_files_info_by_project_status(db: Session, status: ProjectStatus, exclude_suffix: str | None = None):
+    """
+    :param status: Project status to match.
+    :param exclude_suffix: Skip files whose path ends with this suffix.
+    """
+    query = db.query(SgyFileDBModel).join(ProjectDBModel).filter(ProjectDBModel.status == status)
+    if exclude_suffix:
+        query = query.filter(SgyFileDBModel.path.notlike(f"%{exclude_suffix}"))
+    return query.all()
+
+
 def create_sgy_file_info(db: Session, sgy_file: SgyFileCreate):
     db_sgy_file = SgyFileDBModel(**sgy_file.model_dump())
     db.add(db_sgy_file)
+    touch_projects(db, [db_sgy_file.project_id])
     db.commit()
     db.refresh(db_sgy_file)
     return db_sgy_file
 
 
+def create_sgy_files_info(db: Session, sgy_files: List[SgyFileCreate], commit: bool = True) -> List[SgyFileDBModel]:
+    """
+    Insert several rows in one transaction.
+
+    :param commit: Commit the rows. When False they are only flushed, so the caller can add more writes to the same
+        transaction before committing.
+    """
+    db_rows = [SgyFileDBModel(**row.model_dump()) for row in sgy_files]
+    db.add_all(db_rows)
+    touch_projects(db, [row.project_id for row in db_rows])
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return db_rows
+
+
 def delete_sgy_file_info(db: Session, sgy_file_id: str):
     db_sgy_file = db.query(SgyFileDBModel).filter(SgyFileDBModel.id == sgy_file_id).first()
     if db_sgy_file:
         db.delete(db_sgy_file)
+        release_row_blob_refs(db, [db_sgy_file])
+        touch_projects(db, [db_sgy_file.project_id])
         db.commit()
         return True
     return False
@@ -41,9 +81,21 @@ def delete_sgy_file_info(db: Session, sgy_file_id: str):
 def update_sgy_file_info(db: Session, sgy_file_id: str, sgy_file: SgyFileCreate):
     db_sgy_file = db.query(SgyFileDBModel).filter(SgyFileDBModel.id == sgy_file_id).first()
     if db_sgy_file:
+        old_project_id = db_sgy_file.project_id
         for key, value in sgy_file.model_dump().items():
             setattr(db_sgy_file, key, value)
+        touch_projects(db, [old_project_id, db_sgy_file.project_id])
         db.commit()
         db.refresh(db_sgy_file)
         return db_sgy_file
     return None
+
+
+def update_sgy_file_path(db: Session, sgy_file_id: str, path: str):
+    db_sgy_file = db.query(SgyFileDBModel).filter(SgyFileDBModel.id == sgy_file_id).first()
+    if db_sgy_file:
+        db_sgy_file.path = path
+        touch_projects(db, [db_sgy_file.project_id])
+        db.commit()
+        db.refresh(db_sgy_file)
+    return db_sgy_file
@@ -0,0 +1,71 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from models.upload_session_model import UploadSessionDBModel
+
+logger = logging.getLogger(__name__)
+
+
+def get_upload_session(db: Session, upload_id: str):
+    return db.query(UploadSessionDBModel).filter(UploadSessionDBModel.id == upload_id).first()
+
+
+def get_all_upload_sessions(db: Session):
+    return db.query(UploadSessionDBModel).all()
+
+
+def get_upload_sessions_by_project(db: Session, project_id: str):
+    return db.query(UploadSessionDBModel).filter(UploadSessionDBModel.project_id == project_id).all()
+
+
+def create_upload_session(
+    db: Session,
+    upload_id: str,
+    project_id: str,
+    original_name: str,
+    path: str,
+    file_type: str,
+    size: int,
+    checksum: str | None = None,
+):
+    db_upload = UploadSessionDBModel(
+        id=upload_id,
+        project_id=project_id,
+        original_name=original_name,
+        path=path,
+        type=file_type,
+        size=size,
+        offset=0,
+        checksum=checksum,
+    )
+    db.add(db_upload)
+    db.commit()
+    db.refresh(db_upload)
+    return db_upload
+
+
+def update_upload_session_offset(db: Session, upload_id: str, offset: int):
+    db_upload = db.query(UploadSessionDBModel).filter(UploadSessionDBModel.id == upload_id).first()
+    if db_upload:
+        db_upload.offset = offset
+        db.commit()
+        db.refresh(db_upload)
+        return db_upload
+    return None
+
+
+def delete_upload_session(db: Session, upload_id: str, commit: bool = True):
+    """
+    :param commit: Commit the delete. When False it is only flushed, for callers batching several writes into one
+        transaction.
+    """
+    db_upload = db.query(UploadSessionDBModel).filter(UploadSessionDBModel.id == upload_id).first()
+    if db_upload:
+        db.delete(db_upload)
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return True
+    return False
@@ -1,23 +1,105 @@
-from sqlalchemy import create_engine
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import Engine, create_engine, event, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 # Database URL from environment variable with fallback
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-# For SQLite, we need special connection args
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
-else:
-    connect_args = {}
+# Set on every new SQLite connection. WAL lets reads run alongside a write, and the busy timeout makes a writer wait
+# for the lock rather than fail with "database is locked".
+SQLITE_PRAGMAS: Dict[str, str] = {
+    "journal_mode": settings.SQLITE_JOURNAL_MODE,
+    "synchronous": settings.SQLITE_SYNCHRONOUS,
+    "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    # Negative cache_size is in KiB
+    "cache_size": settings.SQLITE_CACHE_SIZE_MB and str(-int(settings.SQLITE_CACHE_SIZE_MB) * 1024),
+    "mmap_size": settings.SQLITE_MMAP_SIZE_MB and str(int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024),
+    "temp_store": settings.SQLITE_TEMP_STORE,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, str]):
+    """
+    Set pragmas on a raw SQLite connection.
+
+    :param dbapi_connection: DBAPI connection (sqlite3 or the aiosqlite adapter).
+    :param pragmas: Pragma name -> value. Empty values are skipped.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if not value:
+                continue
+            cursor.execute(f"PRAGMA {name} = {value}")
+            if name == "journal_mode":
+                mode = cursor.fetchone()[0]
+                if mode.lower() != value.lower():
+                    logger.warning(f"SQLite journal_mode is {mode}, {value} was requested")
+    finally:
+        cursor.close()
+
+
+def tune_sqlite_engine(engine: Engine, pragmas: Optional[Dict[str, str]] = None):
+    """
+    Apply pragmas to every connection an engine opens. Does nothing for other databases.
+
+    :param engine: Sync engine, or the sync_engine of an async one.
+    :param pragmas: Pragma name -> value. Defaults to SQLITE_PRAGMAS from the settings.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
+    event.listen(engine, "connect", lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection, pragmas))
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args=connect_args
-)
+
+def engine_options(url: str) -> dict:
+    """
+    Keyword arguments for create_engine/create_async_engine. In-memory SQLite databases keep SQLAlchemy's default
+    pool, since every connection to them is a separate database.
+    """
+    url = make_url(url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        # Sessions are handed between threads by FastAPI's threadpool, never used by two at once
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+tune_sqlite_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url(url: str) -> str:
+    """The asyncio driver variant of a database URL."""
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.removeprefix("sqlite://")
+    return url
+
+
+# Asyncio engine for async request handlers, on the same database. Its queries run on the driver's own thread
+# (aiosqlite) instead of blocking the event loop.
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.ASYNC_DATABASE_URL or _async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, **engine_options(ASYNC_SQLALCHEMY_DATABASE_URL))
+tune_sqlite_engine(async_engine.sync_engine)
+# Objects stay usable after commit; an async session can't lazily reload expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency
@@ -27,3 +109,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,4 +1,5 @@
 import ast
+import asyncio
 import logging
 import aiofiles
 # import json_fix
@@ -15,7 +16,6 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException
-from tereancore.VelocityModel import VelocityModel
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s::%(lineno)d - %(levelname)s - %(message)s',
@@ -27,6 +27,7 @@ logger.error("START")
 from config import settings
 from crud.user_crud import get_user_by_username, create_user
 from database import engine, Base, get_db, SessionLocal
+from migrations.schema_updates import apply_schema_updates, migrate_project_data
 from router.admin import admin_router
 from router.authentication import authentication_router
 from router.process_router import process_router
@@ -34,10 +35,15 @@ from router.project_router import project_router
 from router.sgy_file_router import sgy_file_router
 from router.client_router import client_router
 from router.contact_router import contact_router
+from router.search_router import search_router
 from schemas.user_schema import UserCreate, User
 from utils.authentication import check_permissions, get_current_user
+from utils.archive_storage import archive_compression_loop
 from utils.consumer_utils import get_user_info
 from utils.email_utils import generate_vs_surf_results, send_email_gmail
+from utils.render_jobs import render_vel_model_png
+from utils.render_pool import render_pool, run_render_job
+from utils.search_index import setup_search_index
 from utils.utils import validate_id
 
 # Allows json to serialize objects using __json__
@@ -64,6 +70,9 @@ async def lifespan(app: FastAPI):
 
     # Initialize / Update DB tables
     Base.metadata.create_all(bind=engine)
+    apply_schema_updates(engine)
+    migrate_project_data(engine)
+    setup_search_index(engine)
 
     db = SessionLocal()
     raw_users = settings.INITIAL_USERS
@@ -93,7 +102,16 @@ async def lifespan(app: FastAPI):
             else:
                 logger.info(f"user {initial_user['username']} already exists")
     db.close()
+
+    # Start render workers; they warm up matplotlib in the background while the app starts serving
+    render_pool.start()
+    compression_task = None
+    if settings.ARCHIVE_COMPRESSION_INTERVAL_HOURS > 0:
+        compression_task = asyncio.create_task(archive_compression_loop(settings.ARCHIVE_COMPRESSION_INTERVAL_HOURS))
     yield
+    if compression_task is not None:
+        compression_task.cancel()
+    render_pool.stop()
     logger.info("after")
 
 
@@ -106,6 +124,7 @@ app.include_router(project_router)
 app.include_router(process_router)
 app.include_router(client_router)
 app.include_router(contact_router)
+app.include_router(search_router)
 
 app.add_middleware(
     CORSMiddleware,
@@ -153,15 +172,15 @@ async def generate_results_email(
         while content := await velocity_model.read(1024):  # async read chunk
             await out_file.write(content)  # async write chunk
 
-    # Ingest velocity model
-    ingested_model_meters = VelocityModel.from_file(model_file_path, to_meters_factor=1.0)
-    ingested_model_feet = VelocityModel.from_file(model_file_path, to_meters_factor=3.28084)
-    ingested_model_meters.plot_vel_model(savefig=os.path.join(final_results_dir, "VsSurf1dS_Model_Meters.png"),
-                                         show_fig=False, units="m")
-    ingested_model_feet.plot_vel_model(savefig=os.path.join(final_results_dir, "VsSurf1dS_Model_Feet.png"),
-                                       show_fig=False, units="ft")
-    ingested_model_meters.generate_pretty_model_file(os.path.join(final_results_dir, "VsSurf1dS_Model_Meters.txt"))
-    ingested_model_feet.generate_pretty_model_file(os.path.join(final_results_dir, "VsSurf1dS_Model_Feet.txt"))
+    # Render and write both unit variants in parallel on the render pool, each job parses the model once
+    await asyncio.gather(
+        run_render_job(render_vel_model_png, model_file_path, to_meters_factor=1.0, units="m",
+                       save_path=os.path.join(final_results_dir, "VsSurf1dS_Model_Meters.png"),
+                       pretty_model_path=os.path.join(final_results_dir, "VsSurf1dS_Model_Meters.txt")),
+        run_render_job(render_vel_model_png, model_file_path, to_meters_factor=3.28084, units="ft",
+                       save_path=os.path.join(final_results_dir, "VsSurf1dS_Model_Feet.png"),
+                       pretty_model_path=os.path.join(final_results_dir, "VsSurf1dS_Model_Feet.txt")),
+    )
 
     plain_text, html_text = generate_vs_surf_results(client_name)
     send_email_gmail(
@@ -0,0 +1,106 @@
+"""
+Lightweight schema updates for existing databases.
+
+Tables are created with Base.metadata.create_all, which never alters tables that already exist. Columns added to
+existing models are listed here and added with ALTER TABLE when missing, and data whose storage format changed is
+converted in place.
+"""
+import json
+import logging
+
+from sqlalchemy import Engine, inspect, text
+
+from models.column_types import PackedFloatArray
+
+logger = logging.getLogger(__name__)
+
+# (table, column, column DDL, optional index name)
+ADDED_COLUMNS = [
+    ("sgy_files", "content_hash", "VARCHAR", "ix_sgy_files_content_hash"),
+    ("files", "content_hash", "VARCHAR", "ix_files_content_hash"),
+    ("projects", "revision", "INTEGER NOT NULL DEFAULT 0", None),
+]
+
+
+def apply_schema_updates(engine: Engine):
+    """
+    Add any columns in ADDED_COLUMNS that are missing from the database. Safe to run on every startup.
+
+    :param engine: Engine for the application database.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as connection:
+        for table, column, ddl, index_name in ADDED_COLUMNS:
+            if table not in existing_tables:
+                continue
+            columns = {c["name"] for c in inspector.get_columns(table)}
+            if column in columns:
+                continue
+            logger.info(f"Adding column {table}.{column}")
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+            if index_name:
+                connection.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})"))
+
+_PICK_FIELDS = ("d1", "d2", "frequency", "d3", "slowness", "d4", "d5")
+
+
+def migrate_project_data(engine: Engine):
+    """
+    Convert project data stored before it was structured: picks move from the legacy projects.picks JSON text column
+    into project_picks, and freq/slow JSON text is rewritten as packed float arrays. Safe to run on every startup.
+
+    Finding the text values relies on SQLite's per-value types, so on other databases only the picks are moved.
+
+    :param engine: Engine for the application database.
+    """
+    inspector = inspect(engine)
+    if "projects" not in inspector.get_table_names():
+        return
+    columns = {c["name"] for c in inspector.get_columns("projects")}
+    packed = PackedFloatArray()
+    with engine.begin() as connection:
+        if "picks" in columns:
+            legacy_picks = connection.execute(
+                text("SELECT id, picks FROM projects WHERE picks IS NOT NULL AND picks != '[]'")
+            ).all()
+            for project_id, picks_json in legacy_picks:
+                already_moved = connection.execute(
+                    text("SELECT 1 FROM project_picks WHERE project_id = :project_id LIMIT 1"),
+                    {"project_id": project_id},
+                ).first()
+                if already_moved is None:
+                    picks = json.loads(picks_json)
+                    if picks:
+                        connection.execute(
+                            text(
+                                "INSERT INTO project_picks (project_id, position, d1, d2, frequency, d3, slowness, d4, "
+                                "d5) VALUES (:project_id, :position, :d1, :d2, :frequency, :d3, :slowness, :d4, :d5)"
+                            ),
+                            [
+                                {"project_id": project_id, "position": position,
+                                 **{field: pick.get(field, 0.0) for field in _PICK_FIELDS}}
+                                for position, pick in enumerate(picks)
+                            ],
+                        )
+            if legacy_picks:
+                logger.info(f"Moved picks of {len(legacy_picks)} projects to project_picks")
+            connection.execute(text("UPDATE projects SET picks = NULL WHERE picks IS NOT NULL"))
+
+        if engine.dialect.name != "sqlite":
+            logger.info("Packing freq/slow text needs SQLite, leaving them as they are")
+            return
+        legacy_arrays = connection.execute(
+            text("SELECT id, freq, slow FROM projects WHERE typeof(freq) = 'text' OR typeof(slow) = 'text'")
+        ).all()
+        for project_id, freq, slow in legacy_arrays:
+            connection.execute(
+                text("UPDATE projects SET freq = :freq, slow = :slow WHERE id = :project_id"),
+                {
+                    "project_id": project_id,
+                    "freq": packed.process_bind_param(freq, None),
+                    "slow": packed.process_bind_param(slow, None),
+                },
+            )
+        if legacy_arrays:
+            logger.info(f"Packed freq/slow of {len(legacy_arrays)} projects")
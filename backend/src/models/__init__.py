@@ -1,6 +1,9 @@
 from models.contact_model import ContactDBModel
 from models.client_model import ClientDBModel
 from models.project_model import ProjectDBModel
+from models.project_pick_model import ProjectPickDBModel
 from models.sgy_file_model import SgyFileDBModel
 from models.file_model import FileDBModel
-from models.user_model import UserDBModel
\ No newline at end of file
+from models.user_model import UserDBModel
+from models.upload_session_model import UploadSessionDBModel
+from models.blob_model import BlobDBModel
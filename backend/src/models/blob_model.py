@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Integer, String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from database import Base
+
+
+class BlobDBModel(Base):
+    """
+    A stored file body in the content-addressed blob store, shared by every file row with the same content_hash.
+    """
+    __tablename__ = "blobs"
+
+    hash: Mapped[str] = mapped_column(String, primary_key=True)  # sha256 hex digest
+    path: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
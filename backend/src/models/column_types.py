@@ -0,0 +1,30 @@
+import json
+
+import numpy as np
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+class PackedFloatArray(TypeDecorator):
+    """
+    List of floats stored as packed little endian float64 bytes instead of JSON text.
+
+    Values written before the column was packed are JSON text; they still read back as lists and are packed on their
+    next write (see migrations.schema_updates).
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, bytes):
+            return value
+        if isinstance(value, str):
+            value = json.loads(value)
+        return np.asarray(value, dtype="<f8").tobytes()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return json.loads(value)
+        return np.frombuffer(value, dtype="<f8").tolist()
@@ -20,5 +20,7 @@ class FileDBModel(Base):
     upload_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     mime_type: Mapped[str] = mapped_column(String, nullable=False)
     file_extension: Mapped[str] = mapped_column(String, nullable=False)
+    # sha256 of the contents; the file at `path` is a link into the blob store (see utils.blob_store)
+    content_hash: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"))
     project: Mapped["ProjectDBModel"] = relationship("ProjectDBModel", back_populates="additional_files") 
\ No newline at end of file
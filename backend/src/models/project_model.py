@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, String, DateTime, ForeignKey
+from sqlalchemy import JSON, Enum, Integer, String, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
+from models.column_types import PackedFloatArray
 from utils.custom_types.Priority import Priority
 from utils.custom_types.ProjectStatus import ProjectStatus
 from utils.custom_types.LengthUnit import LengthUnit
@@ -13,6 +14,7 @@ from utils.custom_types.AsceVersion import AsceVersion
 if TYPE_CHECKING:
     from models.sgy_file_model import SgyFileDBModel
     from models.file_model import FileDBModel
+    from models.project_pick_model import ProjectPickDBModel
 
 class ProjectDBModel(Base):
     __tablename__ = 'projects'
@@ -23,18 +25,24 @@ class ProjectDBModel(Base):
     priority: Mapped[Priority | None] = mapped_column(Enum(Priority), index=True)
     survey_date: Mapped[datetime | None] = mapped_column(DateTime, index=True)
     received_date: Mapped[datetime | None] = mapped_column(DateTime, index=True)
-    geometry: Mapped[str | None] = mapped_column(String, index=False)
-    record_options: Mapped[str | None] = mapped_column(String, index=False)
-    plot_limits: Mapped[str | None] = mapped_column(String, index=False)
-    freq: Mapped[str | None] = mapped_column(String, index=False)
-    slow: Mapped[str | None] = mapped_column(String, index=False)
-    picks: Mapped[str | None] = mapped_column(String, index=False)
-    disper_settings: Mapped[str | None] = mapped_column(String, index=False)
+    # Native JSON columns: read and written as Python lists/dicts, no json.loads/dumps in the callers
+    geometry: Mapped[list | None] = mapped_column(JSON, index=False)
+    record_options: Mapped[list | None] = mapped_column(JSON, index=False)
+    plot_limits: Mapped[dict | None] = mapped_column(JSON, index=False)
+    freq: Mapped[list[float] | None] = mapped_column(PackedFloatArray, index=False)
+    slow: Mapped[list[float] | None] = mapped_column(PackedFloatArray, index=False)
+    disper_settings: Mapped[dict | None] = mapped_column(JSON, index=False)
     display_units: Mapped[LengthUnit] = mapped_column(Enum(LengthUnit), default=LengthUnit.meters, server_default="m")
     asce_version: Mapped[AsceVersion] = mapped_column(Enum(AsceVersion), default=AsceVersion.asce_722, server_default="ASCE 7-22")
     client_id: Mapped[int | None] = mapped_column(ForeignKey("clients.id"), index=True)
+    # Incremented by every write to the project's data, for conflict detection and caching
+    revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     client: Mapped["ClientDBModel | None"] = relationship("ClientDBModel", back_populates="projects")
     records: Mapped[list["SgyFileDBModel"]] = relationship("SgyFileDBModel", back_populates="project")
     additional_files: Mapped[list["FileDBModel"]] = relationship("FileDBModel", back_populates="project")
+    picks: Mapped[list["ProjectPickDBModel"]] = relationship(
+        "ProjectPickDBModel", back_populates="project", order_by="ProjectPickDBModel.position",
+        cascade="all, delete-orphan",
+    )
@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Float, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from database import Base
+
+if TYPE_CHECKING:
+    from models.project_model import ProjectDBModel
+
+
+class ProjectPickDBModel(Base):
+    """One dispersion pick of a project, kept in the order the picks were saved (position)."""
+    __tablename__ = "project_picks"
+    # Pick ids are handed to clients for edits, so SQLite must never reuse the id of a deleted pick
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"), index=True)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    d1: Mapped[float] = mapped_column(Float, nullable=False)
+    d2: Mapped[float] = mapped_column(Float, nullable=False)
+    frequency: Mapped[float] = mapped_column(Float, nullable=False)
+    d3: Mapped[float] = mapped_column(Float, nullable=False)
+    slowness: Mapped[float] = mapped_column(Float, nullable=False)
+    d4: Mapped[float] = mapped_column(Float, nullable=False)
+    d5: Mapped[float] = mapped_column(Float, nullable=False)
+
+    project: Mapped["ProjectDBModel"] = relationship("ProjectDBModel", back_populates="picks")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "d1": self.d1,
+            "d2": self.d2,
+            "frequency": self.frequency,
+            "d3": self.d3,
+            "slowness": self.slowness,
+            "d4": self.d4,
+            "d5": self.d5,
+        }
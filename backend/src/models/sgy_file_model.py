@@ -19,5 +19,7 @@ class SgyFileDBModel(Base):
     size: Mapped[int] = mapped_column(Integer, nullable=False)
     upload_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     type: Mapped[str] = mapped_column(String, nullable=False)
+    # sha256 of the contents; the file at `path` is a link into the blob store (see utils.blob_store)
+    content_hash: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
     project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"))
     project: Mapped["ProjectDBModel"] = relationship("ProjectDBModel", back_populates="records") 
\ No newline at end of file
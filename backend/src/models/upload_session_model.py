@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, String, DateTime, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from database import Base
+
+
+class UploadSessionDBModel(Base):
+    """A resumable SEG-Y upload in progress. Deleted once the upload is finalized or aborted."""
+    __tablename__ = "upload_sessions"
+
+    id: Mapped[str] = mapped_column(primary_key=True, index=True)
+    project_id: Mapped[str] = mapped_column(ForeignKey("projects.id"), index=True)
+    original_name: Mapped[str] = mapped_column(String, nullable=False)
+    # Final file path. Chunks are written to path + ".part" until the upload is finalized.
+    path: Mapped[str] = mapped_column(String, nullable=False)
+    type: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    offset: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    checksum: Mapped[str | None] = mapped_column(String, nullable=True)  # Expected sha256 hex digest
+    created_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
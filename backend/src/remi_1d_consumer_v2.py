@@ -5,7 +5,6 @@ import sys
 import tempfile
 import traceback
 import json
-import zipfile
 from datetime import datetime
 
 import pika
@@ -19,6 +18,7 @@ from utils.consumer_utils import write_zip_bytes, extract_zip_data, make_for_pro
     make_for_processor_zip, get_user_info, extract_project_name
 from utils.email_utils import generate_request_received, send_email_gmail, generate_data_received_email
 from utils.token_manager import TokenManager
+from utils.zip_stream import file_entry, write_zip
 from utils.custom_types.ProjectStatus import ProjectStatus
 from utils.custom_types.Priority import Priority
 
@@ -201,12 +201,13 @@ def main():
                         qa_data_dir = os.path.join(extracted_dir, "QaData")
                         if os.path.exists(qa_data_dir):
                             qa_zip_path = os.path.join(temp_dir, "QaData.zip")
-                            with zipfile.ZipFile(qa_zip_path, 'w', zipfile.ZIP_DEFLATED) as qa_zip:
-                                for root, dirs, files in os.walk(qa_data_dir):
-                                    for file in files:
-                                        file_path = os.path.join(root, file)
-                                        arcname = os.path.relpath(file_path, extracted_dir)
-                                        qa_zip.write(file_path, arcname)
+                            qa_entries = []
+                            for root, dirs, files in os.walk(qa_data_dir):
+                                for file in files:
+                                    file_path = os.path.join(root, file)
+                                    arcname = os.path.relpath(file_path, extracted_dir)
+                                    qa_entries.append(file_entry(file_path, arcname))
+                            write_zip(qa_zip_path, qa_entries, workers=settings.ZIP_COMPRESSION_THREADS)
                             files_to_upload.append(
                                 ('additional_files', ('QaData.zip', open(qa_zip_path, 'rb'), 'application/zip'))
                             )
@@ -1,13 +1,15 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from database import get_db
 from models.user_model import UserDBModel
 from schemas.user_schema import UserCreate, User as UserSchema, UserUpdate, UserOut
+from utils.archive_storage import run_compression_job
 from utils.authentication import hash_password, require_auth_level
+from utils.storage_gc import run_storage_gc
 
 admin_router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -108,3 +110,26 @@ def update_user_disabled_status(
     user.disabled = payload.disabled
     db.commit()
     return {"message": f"User '{username}' disabled status set to {payload.disabled}."}
+
+
+# Compress SEG-Y records of completed projects now instead of waiting for the scheduled pass
+@admin_router.post("/storage/compress-archived", status_code=status.HTTP_202_ACCEPTED)
+def compress_archived_records(
+    background_tasks: BackgroundTasks,
+    current_user: UserSchema = Depends(require_auth_level(4))
+):
+    background_tasks.add_task(run_compression_job)
+    return {"message": "Archive compression started."}
+
+
+# Report disk usage under MQ_SAVE_DIR and remove orphaned files, rows and stale temp files (dry run by default)
+@admin_router.post("/storage/gc")
+def collect_storage_garbage(
+    dry_run: bool = Query(True),
+    grace_hours: Optional[float] = Query(None, ge=0),
+    current_user: UserSchema = Depends(require_auth_level(4))
+):
+    report = run_storage_gc(dry_run=dry_run, grace_hours=grace_hours)
+    if report is None:
+        raise HTTPException(status_code=409, detail="Storage GC or archive compression is already running")
+    return report
@@ -1,10 +1,12 @@
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_async_db, get_db
 from crud import client_crud
+from crud.aio import client_crud as async_client_crud
 from schemas.client_schema import Client, ClientCreate, ClientUpdate
 from schemas.user_schema import User
 from utils.authentication import get_current_user, check_permissions
@@ -15,14 +17,14 @@ client_router = APIRouter(prefix="/clients", tags=["Clients"])
 @client_router.post("/", response_model=Client, status_code=status.HTTP_201_CREATED)
 async def create_client(
     client: ClientCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new client."""
     check_permissions(current_user, 1)
     
     try:
-        db_client = client_crud.create_client(db=db, new_client=client)
+        db_client = await async_client_crud.create_client(db, client)
         return db_client
     except Exception as e:
         logger.error(f"Error creating client: {str(e)}")
@@ -36,15 +38,14 @@ async def get_clients(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     name_search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get list of all clients with optional filtering."""
     check_permissions(current_user, 1)
     
     try:
-        # TODO: Add name_search filtering in client_crud
-        clients = client_crud.get_clients(db=db, skip=skip, limit=limit)
+        clients = await async_client_crud.get_clients(db, skip=skip, limit=limit, name_search=name_search)
         return clients
     except Exception as e:
         logger.error(f"Error fetching clients: {str(e)}")
@@ -57,13 +58,13 @@ async def get_clients(
 async def get_client(
     client_id: int,
     include_projects: bool = Query(False),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific client by ID."""
     check_permissions(current_user, 1)
     
-    client = client_crud.get_client(db=db, client_id=client_id)
+    client = await async_client_crud.get_client(db, client_id)
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
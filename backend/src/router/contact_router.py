@@ -1,10 +1,12 @@
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_async_db, get_db
 from crud import contact_crud, client_crud
+from crud.aio import client_crud as async_client_crud, contact_crud as async_contact_crud
 from schemas.contact_schema import Contact, ContactCreate, ContactUpdate
 from schemas.user_schema import User
 from utils.authentication import get_current_user, check_permissions
@@ -15,14 +17,14 @@ contact_router = APIRouter(prefix="/contacts", tags=["Contacts"])
 @contact_router.post("/", response_model=Contact, status_code=status.HTTP_201_CREATED)
 async def create_contact(
     contact: ContactCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new contact."""
     check_permissions(current_user, 1)
     
     # Verify client exists
-    client = client_crud.get_client(db=db, client_id=contact.client_id)
+    client = await async_client_crud.get_client(db, contact.client_id)
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -30,7 +32,7 @@ async def create_contact(
         )
     
     try:
-        db_contact = contact_crud.create_contact(db=db, new_contact=contact)
+        db_contact = await async_contact_crud.create_contact(db, contact)
         return db_contact
     except Exception as e:
         logger.error(f"Error creating contact: {str(e)}")
@@ -44,19 +46,20 @@ async def get_contacts(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     client_id: Optional[int] = None,
-    db: Session = Depends(get_db),
+    search: Optional[str] = Query(None, description="Words to find in names, emails and phone numbers"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get list of all contacts with optional filtering by client."""
+    """Get list of all contacts with optional filtering by client and search."""
     check_permissions(current_user, 1)
     
     try:
         if client_id:
-            contacts = contact_crud.get_contacts_by_client(
-                db=db, client_id=client_id, skip=skip, limit=limit
+            contacts = await async_contact_crud.get_contacts_by_client(
+                db, client_id, skip=skip, limit=limit, search=search
             )
         else:
-            contacts = contact_crud.get_contacts(db=db, skip=skip, limit=limit)
+            contacts = await async_contact_crud.get_contacts(db, skip=skip, limit=limit, search=search)
         return contacts
     except Exception as e:
         logger.error(f"Error fetching contacts: {str(e)}")
@@ -68,13 +71,13 @@ async def get_contacts(
 @contact_router.get("/{contact_id}", response_model=Contact)
 async def get_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a specific contact by ID."""
     check_permissions(current_user, 1)
     
-    contact = contact_crud.get_contact(db=db, contact_id=contact_id)
+    contact = await async_contact_crud.get_contact(db, contact_id)
     if not contact:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -139,22 +142,20 @@ async def get_contacts_by_client(
     client_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all contacts for a specific client."""
     check_permissions(current_user, 1)
     
     # Verify client exists
-    client = client_crud.get_client(db=db, client_id=client_id)
+    client = await async_client_crud.get_client(db, client_id)
     if not client:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Client with ID {client_id} not found"
         )
     
-    contacts = contact_crud.get_contacts_by_client(
-        db=db, client_id=client_id, skip=skip, limit=limit
-    )
+    contacts = await async_contact_crud.get_contacts_by_client(db, client_id, skip=skip, limit=limit)
     
     return contacts
\ No newline at end of file
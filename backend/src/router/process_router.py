@@ -1,28 +1,52 @@
-import ast
+import asyncio
 import glob
+import io
 import json
 import logging
 import os
-import tempfile
+import zipfile
 from typing import Annotated
 
-import aiofiles
 import numpy as np
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Response, UploadFile
 from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.exceptions import HTTPException
-from tereancore.VelocityModel import VelocityModel
 from tereancore.plotting_utils import validate_contours, validate_unit_str, build_tick_dicts
 from tereancore.sgy_utils import load_segy_segyio, preprocess_streams
-from tereancore.twodp_utils import plot_2dp_from_geoct
-from tereancore.twods_utils import plot_2ds
-from tereancore.utils import lambda0, get_geom_func_from_excel, model_search_pattern
+from tereancore.utils import model_search_pattern
 from tereancore.vspect import vspect_stream
 
 from config import settings
+from crud.aio import project_crud as async_project_crud
+from database import get_async_db
+from schemas.section_schema import SectionVariant
 from schemas.user_schema import User as UserSchema
+from utils.archive_storage import COMPRESSED_SUFFIX, local_record_path
 from utils.authentication import check_permissions, get_current_user, require_auth_level
-from utils.utils import CHUNK_SIZE, get_fastapi_file_locally, validate_id
+from utils.render_cache import hash_inputs, section_grid_cache, section_png_cache
+from utils.render_jobs import build_2ds_section, read_elevation, read_velocity_models, render_2dp_png
+from utils.render_pool import run_render_job
+from utils.section_inputs import (
+    ElevationSource,
+    ModelSource,
+    SectionInputError,
+    SectionInputs,
+    load_elevation,
+    load_model_set,
+    save_elevation,
+    save_model_set,
+)
+from utils.section_utils import (
+    SectionGrid,
+    default_2ds_labels,
+    figure_grid_shape,
+    interpolate_2dp_section,
+    render_section_png,
+    section_tick_params,
+    velocity_model_layers,
+)
+from utils.utils import get_fastapi_file_locally, validate_id
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +61,327 @@ GLOBAL_DATA_DIR = settings.MQ_SAVE_DIR
 GLOBAL_SGY_FILES_DIR = os.path.join(GLOBAL_DATA_DIR, "SGYFiles")
 os.makedirs(GLOBAL_SGY_FILES_DIR, exist_ok=True)
 
+# Output formats for the 2D endpoints. "data" returns the interpolated section instead of a rendered figure.
+OUTPUT_FORMATS = ("png", "data")
+
+# 2D-S grids being interpolated, by grid key
+_pending_sections: dict[str, asyncio.Task] = {}
+
+
+def validate_output_format(output_format: str) -> str:
+    output_format = (output_format or "png").strip().lower()
+    if output_format not in OUTPUT_FORMATS:
+        raise HTTPException(400, f"Invalid output format {output_format}. Valid options are: {', '.join(OUTPUT_FORMATS)}")
+    return output_format
+
+
+def section_grid_headers(grid: SectionGrid) -> dict:
+    """Headers describing the interpolated grid (rows,columns and y,x spacing) a response was built from."""
+    return {
+        'X-Section-Shape': f"{grid.shape[0]},{grid.shape[1]}",
+        'X-Section-Resolution': "{:g},{:g}".format(*grid.resolution),
+    }
+
+
+def section_data_response(grid: SectionGrid, contours) -> Response:
+    """Build a binary .npz response containing the section grid, surface profile and contour polylines."""
+    headers = {
+        'Content-Disposition': 'attachment; filename="section.npz"',
+        **section_grid_headers(grid),
+    }
+    return Response(grid.to_npz_bytes(contours), headers=headers, media_type="application/octet-stream")
+
+
+def png_response(png_bytes: bytes, grid_headers: dict | None = None) -> Response:
+    headers = {'Content-Disposition': 'inline; filename="out.png"', **(grid_headers or {})}
+    return Response(png_bytes, headers=headers, media_type="image/png")
+
+
+async def read_elevation_upload(elevation_data: UploadFile, reverse_elevation: bool) -> ElevationSource:
+    """Read an uploaded elevation spreadsheet. It is parsed where the section is built."""
+    await elevation_data.seek(0)
+    file_name = elevation_data.filename
+    split = file_name.split('.')
+    if len(split) <= 1:
+        raise HTTPException(400, "No file extension found.")
+    extension = "." + file_name.split('.')[-1]
+    return ElevationSource(
+        spreadsheet=await elevation_data.read(), extension=extension, reverse_elevation=reverse_elevation
+    )
+
+
+async def read_model_uploads(velocity_models: list[UploadFile]) -> list[ModelSource]:
+    sources = []
+    for vel_model in velocity_models:
+        await vel_model.seek(0)
+        sources.append((vel_model.filename, await vel_model.read()))
+    return sources
+
+
+def elevation_profile(geom_interp_func, x_min: float | None = None, x_max: float | None = None):
+    """
+    Recover the x/z points behind an elevation function so they can be stored.
+
+    Interpolator objects (e.g. scipy's interp1d) expose their points directly; anything else is sampled over
+    [x_min, x_max].
+    """
+    x = getattr(geom_interp_func, "x", None)
+    z = getattr(geom_interp_func, "y", None)
+    if x is not None and z is not None:
+        return np.asarray(x, dtype=np.float64), np.asarray(z, dtype=np.float64)
+    if x_min is None or x_max is None:
+        raise HTTPException(400, "x_min and x_max are required to store this elevation file.")
+    x = np.linspace(x_min, x_max, 2001)
+    return x, np.asarray(geom_interp_func(x), dtype=np.float64)
+
+
+async def require_project(db: AsyncSession, project_id: str):
+    """Raise 400 for a malformed project ID and 404 for a project that doesn't exist."""
+    if not validate_id(project_id):
+        raise HTTPException(400, "Invalid project ID")
+    if await async_project_crud.get_project_revision(db, project_id) is None:
+        raise HTTPException(404, f"Project with ID {project_id} not found")
+
+
+async def read_2ds_inputs(
+    velocity_models: list[UploadFile] | None,
+    elevation_data: UploadFile | None,
+    project_id: str | None,
+    model_set_id: str | None,
+    elevation_id: str | None,
+    reverse_elevation: bool,
+) -> tuple[tuple, SectionInputs]:
+    """
+    Collect the models and ground surface of a 2D-S request. They come either from uploaded files or from inputs
+    stored earlier for the project (see /2d-s/inputs/models and /2d-s/inputs/elevation), in which case nothing is
+    re-uploaded or parsed again, for figures as well as for the data output.
+
+    :return: Tuple of (cache key parts identifying the inputs, inputs).
+    """
+    if (model_set_id is not None or elevation_id is not None) and (project_id is None or not validate_id(project_id)):
+        raise HTTPException(400, "A valid project_id is required to use stored inputs.")
+
+    if model_set_id is not None:
+        if not validate_id(model_set_id):
+            raise HTTPException(400, "Invalid model set ID")
+        inputs = load_model_set(project_id, model_set_id)
+        if inputs is None:
+            raise HTTPException(404, "Model set not found")
+        model_key = ("model_set", project_id, model_set_id)
+    elif velocity_models:
+        sources = await read_model_uploads(velocity_models)
+        if not any(model_search_pattern.search(file_name) for file_name, _ in sources):
+            raise HTTPException(400, "No valid velocity model files found.")
+        inputs = SectionInputs(model_sources=sources)
+        model_key = ([file_name for file_name, _ in sources], *[content for _, content in sources])
+    else:
+        raise HTTPException(400, "Either velocity_models or model_set_id is required.")
+
+    if elevation_id is not None:
+        if not validate_id(elevation_id):
+            raise HTTPException(400, "Invalid elevation ID")
+        inputs.elevation = load_elevation(project_id, elevation_id)
+        if inputs.elevation is None:
+            raise HTTPException(404, "Elevation profile not found")
+        elevation_key = ("elevation", project_id, elevation_id)
+    elif elevation_data is not None:
+        inputs.elevation = await read_elevation_upload(elevation_data, reverse_elevation)
+        elevation_key = inputs.elevation.spreadsheet
+    else:
+        elevation_key = None
+
+    return (*model_key, elevation_key, reverse_elevation), inputs
+
+
+def section_2ds_params(
+    x_min: float | None,
+    x_max: float | None,
+    min_depth: float | None,
+    max_depth: float | None,
+    resolution: float,
+    smoothing: int,
+    reverse_data: bool,
+    adaptive_resolution: bool,
+) -> dict:
+    """Section extent and interpolation arguments, named as both interpolate_2ds_section and plot_2ds take them."""
+    return dict(
+        x_min=x_min,
+        x_max=x_max,
+        y_min=min_depth,
+        y_max=max_depth,
+        res=resolution,
+        smoothing_sigma=smoothing,
+        reverse=reverse_data,
+        max_shape=figure_grid_shape() if adaptive_resolution else None,
+    )
+
+
+async def _build_2ds_section(
+    grid_key: str,
+    inputs: SectionInputs,
+    unit_override: str | None,
+    display_as_depth: bool | None,
+    params: dict,
+) -> SectionGrid:
+    try:
+        grid = await asyncio.to_thread(build_2ds_section, inputs, unit_override, display_as_depth, **params)
+        section_grid_cache.put(grid_key, grid, grid.nbytes)
+        return grid
+    finally:
+        _pending_sections.pop(grid_key, None)
+
+
+async def get_2ds_section(
+    section_key: str,
+    inputs: SectionInputs,
+    unit_override: str | None,
+    display_as_depth: bool | None,
+    params: dict,
+) -> SectionGrid:
+    """
+    Return the interpolated section, building it only on a cache miss and in a thread so the event loop isn't
+    blocked. The grid only depends on the inputs and the interpolation parameters, so it is shared by the data
+    output and every figure of the same section. Requests arriving while the grid is being built wait for that
+    build instead of starting their own.
+
+    :param section_key: Key of the inputs and params, see process_2ds.
+    """
+    grid_key = hash_inputs(section_key, unit_override)
+    grid = section_grid_cache.get(grid_key)
+    if grid is not None:
+        return grid
+    pending = _pending_sections.get(grid_key)
+    if pending is None:
+        pending = _pending_sections[grid_key] = asyncio.create_task(
+            _build_2ds_section(grid_key, inputs, unit_override, display_as_depth, params)
+        )
+    try:
+        # Shielded so one disconnecting client doesn't cancel the build for the others waiting on it
+        return await asyncio.shield(pending)
+    except SectionInputError as e:
+        raise HTTPException(400, str(e))
+
+
+@process_router.post("/2d-s/inputs/models")
+async def store_2ds_models(
+    project_id: Annotated[str, Form(...)],
+    velocity_models: Annotated[list[UploadFile], File(...)],
+    current_user: UserSchema = Depends(require_auth_level(1)),
+    unit_override: Annotated[str, Form(...)] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Parse a set of 1D model files once and store them for the project. Pass the returned model_set_id to the 2D-S
+    endpoints instead of re-uploading the files.
+    """
+    await require_project(db, project_id)
+    sources = await read_model_uploads(velocity_models)
+    try:
+        vel_models, unit_str = await asyncio.to_thread(read_velocity_models, sources, validate_unit_str(unit_override))
+    except SectionInputError as e:
+        raise HTTPException(400, str(e))
+    layers = [velocity_model_layers(vel_model) for vel_model in vel_models]
+    model_set_id = save_model_set(project_id, layers, unit_str)
+    return {
+        "model_set_id": model_set_id,
+        "unit": unit_str,
+        "positions": [position for position, _, _ in layers],
+    }
+
+
+@process_router.post("/2d-s/inputs/elevation")
+async def store_2ds_elevation(
+    project_id: Annotated[str, Form(...)],
+    elevation_data: Annotated[UploadFile, File(...)],
+    current_user: UserSchema = Depends(require_auth_level(1)),
+    reverse_elevation: Annotated[bool, Form(...)] = False,
+    x_min: Annotated[float, Form(...)] = None,
+    x_max: Annotated[float, Form(...)] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Parse an elevation spreadsheet once and store its profile for the project. Pass the returned elevation_id to
+    the 2D-S endpoints instead of re-uploading the spreadsheet. reverse_elevation is applied here, at parse time.
+    """
+    await require_project(db, project_id)
+    elevation = await read_elevation_upload(elevation_data, reverse_elevation)
+    try:
+        geom_interp_func, peak_elevation = await asyncio.to_thread(read_elevation, elevation)
+    except SectionInputError as e:
+        raise HTTPException(400, str(e))
+    elevation_x, elevation_z = elevation_profile(geom_interp_func, x_min, x_max)
+    elevation_id = save_elevation(project_id, elevation_x, elevation_z, peak_elevation)
+    return {"elevation_id": elevation_id, "peak_elevation": peak_elevation}
+
+
+def section_2ds_style(variant: SectionVariant) -> dict:
+    """
+    Resolve a variant into render_section_png styling arguments. Labels left as None get their defaults once the
+    section's unit and elevation are known.
+    """
+    contours = variant.contours
+    if isinstance(contours, str):
+        contours = validate_contours(contours)
+
+    return dict(
+        title=variant.title,
+        x_label=variant.x_label,
+        y_label=variant.y_label,
+        cbar_label=variant.cbar_label,
+        cbar_vmin=variant.vel_min,
+        cbar_vmax=variant.vel_max,
+        contours=contours,
+        contour_color=variant.contour_color,
+        contour_width=variant.contour_width,
+        label_pad_size=variant.label_pad_size,
+        cbar_pad_size=variant.cbar_pad_size,
+        colorbar=variant.enable_colorbar,
+        invert_colorbar_axis=variant.invert_colorbar_axis,
+        aboveground_color=variant.aboveground_color,
+        aboveground_border_color=variant.aboveground_border_color,
+        shift_elevation=variant.shift_elevation,
+        cbar_ticks=variant.cbar_ticks,
+        elevation_tick_increment=variant.elevation_tick_increment,
+        tick_params=section_tick_params(
+            tick_right=variant.tick_right, tick_left=variant.tick_left, tick_top=variant.tick_top,
+            tick_bottom=variant.tick_bottom, ticklabel_right=variant.ticklabel_right,
+            ticklabel_left=variant.ticklabel_left, ticklabel_top=variant.ticklabel_top,
+            ticklabel_bottom=variant.ticklabel_bottom
+        ),
+        x_label_position=variant.x_axis_label_pos,
+        y_label_position=variant.y_axis_label_pos,
+    )
+
+
+async def render_2ds(
+    section_key: str,
+    inputs: SectionInputs,
+    unit_override: str | None,
+    display_as_depth: bool | None,
+    params: dict,
+    variant: SectionVariant,
+) -> tuple[bytes, dict]:
+    """
+    Render a section figure, going through both cache levels: a cached figure is returned as is, otherwise the
+    cached grid (interpolated only if it isn't cached either) is styled on the render pool.
+
+    :return: The PNG and the section_grid_headers of the grid it was drawn from, which are cached with it.
+    """
+    unit = variant.unit or unit_override
+    style = section_2ds_style(variant)
+    png_key = hash_inputs(section_key, unit, sorted(style.items()))
+    cached = section_png_cache.get(png_key)
+    if cached is not None:
+        return cached
+    grid = await get_2ds_section(section_key, inputs, unit, display_as_depth, params)
+    style["x_label"], style["y_label"], style["cbar_label"] = default_2ds_labels(
+        grid.unit, grid.y_is_elevation, style["x_label"], style["y_label"], style["cbar_label"]
+    )
+    png_bytes = await run_render_job(render_section_png, grid, **style)
+    grid_headers = section_grid_headers(grid)
+    section_png_cache.put(png_key, (png_bytes, grid_headers), len(png_bytes))
+    return png_bytes, grid_headers
+
 
 @process_router.post("/2d-p")
 async def process_2dp(
@@ -81,25 +426,18 @@ async def process_2dp(
     ticklabel_bottom: Annotated[bool, Form(...)] = False,
     x_axis_label_pos: Annotated[str, Form(...)] = "top",
     y_axis_label_pos: Annotated[str, Form(...)] = "left",
+    output_format: Annotated[str, Form(...)] = "png",
     test_mode: Annotated[bool, Form(...)] = False,
 ):
-    """Process 2D P-wave velocity model visualization."""
+    """
+    Process 2D P-wave velocity model visualization.
+
+    With output_format="data" the interpolated section is returned as an .npz archive instead of a PNG, so the
+    client can restyle it without another request.
+    """
     if test_mode is not None and test_mode:
         return FileResponse("backend/Terean-logo.png")
-
-    # Get GeoCT Model and TT files as local files
-    model_ret = await get_fastapi_file_locally(background_tasks=None, file_data=geoct_model_file)
-    if model_ret is Exception:
-        raise HTTPException(500, "Error loading model file.")
-    _, model_local, _ = model_ret
-
-    if travel_time_file is not None:
-        tt_ret = await get_fastapi_file_locally(background_tasks=None, file_data=travel_time_file)
-        if tt_ret is Exception:
-            raise HTTPException(500, "Error loading tt file.")
-        _, tt_local, _ = tt_ret
-    else:
-        tt_local = None
+    output_format = validate_output_format(output_format)
 
     contours = validate_contours(contours)
     unit_override = validate_unit_str(unit_override)
@@ -119,10 +457,63 @@ async def process_2dp(
     if cbar_label is None:
         cbar_label = "P-Wave Velocity, " + unit_override + "/sec"
 
-    # Create temp file to write to
-    fd, path = tempfile.mkstemp(suffix=".png")
-    with os.fdopen(fd, 'w') as f:
-        _, img_buff = plot_2dp_from_geoct(
+    model_bytes = await geoct_model_file.read()
+    tt_bytes = await travel_time_file.read() if travel_time_file is not None else None
+    grid_key = hash_inputs(
+        "2d-p", model_bytes, tt_bytes, unit_override, x_min, x_max, min_depth, max_depth, smoothing, reverse_data,
+    )
+
+    if output_format == "data":
+        grid = section_grid_cache.get(grid_key)
+        if grid is None:
+            try:
+                grid = interpolate_2dp_section(
+                    model_text=model_bytes.decode(),
+                    x_min=x_min,
+                    x_max=x_max,
+                    min_depth=min_depth,
+                    max_depth=max_depth,
+                    res=0.5,
+                    smoothing_sigma=smoothing,
+                    reverse=reverse_data,
+                    unit=unit_override,
+                )
+            except (ValueError, UnicodeDecodeError) as e:
+                logger.error(f"Failed to read GeoCT model: {e}")
+                raise HTTPException(400, "Failed to read GeoCT model file.")
+            section_grid_cache.put(grid_key, grid, grid.nbytes)
+        return section_data_response(grid, contours)
+
+    # P-wave figures are rendered by tereancore (travel time masking happens there), so only whole figures are cached.
+    png_key = hash_inputs(
+        grid_key, title, x_label, y_label, cbar_label, vel_min, vel_max, contours, label_pad_size, cbar_pad_size,
+        contour_width, invert_colorbar_axis, tick_param, ticklabel_param,
+    )
+    png_bytes = section_png_cache.get(png_key)
+    if png_bytes is not None:
+        return png_response(png_bytes)
+
+    # Get GeoCT Model and TT files as local files
+    await geoct_model_file.seek(0)
+    model_ret = await get_fastapi_file_locally(background_tasks=None, file_data=geoct_model_file)
+    if model_ret is Exception:
+        raise HTTPException(500, "Error loading model file.")
+    model_fd, model_local, _ = model_ret
+    temp_files = [(model_fd, model_local)]
+
+    if travel_time_file is not None:
+        await travel_time_file.seek(0)
+        tt_ret = await get_fastapi_file_locally(background_tasks=None, file_data=travel_time_file)
+        if tt_ret is Exception:
+            raise HTTPException(500, "Error loading tt file.")
+        tt_fd, tt_local, _ = tt_ret
+        temp_files.append((tt_fd, tt_local))
+    else:
+        tt_local = None
+
+    try:
+        png_bytes = await run_render_job(
+            render_2dp_png,
             geoct_model_path=model_local,
             travel_time_path=tt_local,
             x_min=x_min,
@@ -145,8 +536,6 @@ async def process_2dp(
             limit_tt_to_plot=True,
             poly_color="w",
             poly_border_color=None,
-            save_path=None,
-            show_plot=False,
             reverse_data=reverse_data,
             show_max_survey_depth=False,
             valid_survey_depth_override=None,
@@ -157,16 +546,22 @@ async def process_2dp(
             colorbar=True,
             invert_colorbar_axis=invert_colorbar_axis,
         )
-    background_tasks.add_task(img_buff.close)
-    headers = {'Content-Disposition': 'inline; filename="out.png"'}
-    return Response(img_buff.getvalue(), headers=headers, media_type="image/png")
+    finally:
+        for fd, path in temp_files:
+            os.close(fd)
+            os.remove(path)
+    section_png_cache.put(png_key, png_bytes, len(png_bytes))
+    return png_response(png_bytes)
 
 
 @process_router.post("/2d-s")
 async def process_2ds(
-    velocity_models: Annotated[list[UploadFile], File(...)],
     background_tasks: BackgroundTasks,
     current_user: UserSchema = Depends(require_auth_level(1)),
+    velocity_models: Annotated[list[UploadFile], File(...)] = None,
+    project_id: Annotated[str, Form(...)] = None,
+    model_set_id: Annotated[str, Form(...)] = None,
+    elevation_id: Annotated[str, Form(...)] = None,
     title: Annotated[str, Form(...)] = None,
     elevation_data: Annotated[UploadFile, File(...)] = None,
     min_depth: Annotated[float, Form(...)] = None,
@@ -210,135 +605,156 @@ async def process_2ds(
     ticklabel_bottom: Annotated[bool, Form(...)] = False,
     x_axis_label_pos: Annotated[str, Form(...)] = "top",
     y_axis_label_pos: Annotated[str, Form(...)] = "left",
+    output_format: Annotated[str, Form(...)] = "png",
+    adaptive_resolution: Annotated[bool, Form(...)] = False,
     test_mode: Annotated[bool, Form(...)] = False,
 ):
-    """Process 2D S-wave velocity model visualization."""
+    """
+    Process 2D S-wave velocity model visualization.
+
+    With output_format="data" the interpolated section is returned as an .npz archive instead of a PNG, so the
+    client can restyle it without another request.
+
+    Models and elevation can be uploaded with the request, or referenced with project_id plus model_set_id /
+    elevation_id from /2d-s/inputs/models and /2d-s/inputs/elevation so repeat renders skip upload and parsing.
+
+    With adaptive_resolution the grid is coarsened (never finer than `resolution`) to what the output figure can
+    show, so long lines cost about the same as short ones. Depth and distance are coarsened separately, each only
+    as far as the figure's height or width needs. Both data and PNG responses report the grid that was used in the
+    X-Section-Shape (rows,columns) and X-Section-Resolution (y,x spacing) headers.
+    """
     if test_mode is not None and test_mode:
         logger.info(f"elevation tick size: {elevation_tick_size}")
         logger.info(f"colorbar fraction: {cbar_fraction}")
         logger.info(f"colorbar orientation: {cbar_orientation}")
         logger.info(f"aspect ratio: {aspect_ratio}")
         return FileResponse("backend/Terean-logo.png")
+    output_format = validate_output_format(output_format)
 
-    contours = validate_contours(contours)
     unit_override = validate_unit_str(unit_override)
-    tick_param, ticklabel_param = build_tick_dicts(
-        tick_right=tick_right, tick_left=tick_left, tick_top=tick_top, tick_bottom=tick_bottom,
-        ticklabel_right=ticklabel_right, ticklabel_left=ticklabel_left, ticklabel_top=ticklabel_top,
-        ticklabel_bottom=ticklabel_bottom
+
+    input_key, inputs = await read_2ds_inputs(
+        velocity_models, elevation_data, project_id, model_set_id, elevation_id, reverse_elevation
+    )
+    params = section_2ds_params(
+        x_min, x_max, min_depth, max_depth, resolution, smoothing, reverse_data, adaptive_resolution
+    )
+    section_key = hash_inputs("2d-s", *input_key, display_as_depth, sorted(params.items()))
+
+    if output_format == "data":
+        grid = await get_2ds_section(section_key, inputs, unit_override, display_as_depth, params)
+        return section_data_response(grid, validate_contours(contours))
+
+    variant = SectionVariant(
+        title=title,
+        x_label=x_label,
+        y_label=y_label,
+        cbar_label=cbar_label,
+        vel_min=vel_min,
+        vel_max=vel_max,
+        contours=contours,
+        enable_colorbar=enable_colorbar,
+        invert_colorbar_axis=invert_colorbar_axis,
+        label_pad_size=label_pad_size,
+        cbar_pad_size=cbar_pad_size,
+        cbar_ticks=cbar_ticks,
+        contour_color=contour_color,
+        contour_width=contour_width,
+        cbar_fraction=cbar_fraction,
+        cbar_orientation=cbar_orientation,
+        aspect_ratio=aspect_ratio,
+        aboveground_color=aboveground_color,
+        aboveground_border_color=aboveground_border_color,
+        shift_elevation=shift_elevation,
+        elevation_tick_increment=elevation_tick_increment,
+        tick_right=tick_right,
+        tick_left=tick_left,
+        tick_top=tick_top,
+        tick_bottom=tick_bottom,
+        ticklabel_right=ticklabel_right,
+        ticklabel_left=ticklabel_left,
+        ticklabel_top=ticklabel_top,
+        ticklabel_bottom=ticklabel_bottom,
+        x_axis_label_pos=x_axis_label_pos,
+        y_axis_label_pos=y_axis_label_pos,
     )
+    png_bytes, grid_headers = await render_2ds(section_key, inputs, unit_override, display_as_depth, params, variant)
+    return png_response(png_bytes, grid_headers)
 
-    # Process Excel file
-    if elevation_data is None:
-        geom_interp_func = lambda0
-        peak_elevation = None
-    else:
-        file_name = elevation_data.filename
-        split = file_name.split('.')
-        if len(split) <= 1:
-            raise HTTPException(400, "No file extension found.")
-        extension = "." + file_name.split('.')[-1]
-        try:
-            fd, path = tempfile.mkstemp(suffix=extension)
-            async with aiofiles.open(path, 'wb') as f:
-                while chunk := await elevation_data.read(CHUNK_SIZE):
-                    await f.write(chunk)
-            geom_interp_func, peak_elevation = get_geom_func_from_excel(path, reverse_elevation=reverse_elevation)
-            if display_as_depth:
-                peak_elevation = None
-        except Exception as e:
-            logger.error(f"Failed to parse excel file: {e}")
-            raise HTTPException(400, "Failed to parse excel file.")
-
-    # Set model elevation using geometry
-    ingested_velocity_models = []
-    unit_str = None
-    prev_units_str = None
-    for vel_model in velocity_models:
-        matches = model_search_pattern.search(vel_model.filename)
-        if matches is not None and len(matches.groups()) == 2:
-            position = ast.literal_eval(matches.group(1))
-            unit = matches.group(2).lower()
-            if unit_override is None:
-                if unit == "ft":
-                    to_meters_factor = 3.28084
-                    unit_str = "ft"
-                else:
-                    to_meters_factor = 1.0
-                    unit_str = "m"
-            else:
-                if unit_override == "ft":
-                    to_meters_factor = 3.28084
-                    unit_str = "ft"
-                else:
-                    to_meters_factor = 1.0
-                    unit_str = "m"
-            if (unit_str is not None
-                and prev_units_str is not None
-                and prev_units_str != unit):
-                logger.error("ERROR: Unit string changed between models!")
-            ingested_model = VelocityModel.from_file(
-                vel_model.file,
-                position=position,
-                to_meters_factor=to_meters_factor,
-            )
-            ingested_velocity_models.append(ingested_model)
-        else:
-            logger.error(f"ERROR Reading file {vel_model.filename}")
 
-    if x_label is None:
-        x_label = "Array Dist., " + unit_str
-    if y_label is None:
-        if peak_elevation is not None:
-            y_label = "Elevation, " + unit_str
-        else:
-            y_label = "Depth, " + unit_str
-    if cbar_label is None:
-        cbar_label = "Shear-Wave Velocity, " + unit_str + "/sec"
+@process_router.post("/2d-s/batch")
+async def process_2ds_batch(
+    variants: Annotated[str, Form(...)],  # JSON list of SectionVariant
+    current_user: UserSchema = Depends(require_auth_level(1)),
+    velocity_models: Annotated[list[UploadFile], File(...)] = None,
+    project_id: Annotated[str, Form(...)] = None,
+    model_set_id: Annotated[str, Form(...)] = None,
+    elevation_id: Annotated[str, Form(...)] = None,
+    elevation_data: Annotated[UploadFile, File(...)] = None,
+    min_depth: Annotated[float, Form(...)] = None,
+    max_depth: Annotated[float, Form(...)] = None,
+    resolution: Annotated[float, Form(...)] = 0.1,
+    smoothing: Annotated[int, Form(...)] = 20,
+    x_min: Annotated[float, Form(...)] = None,
+    x_max: Annotated[float, Form(...)] = None,
+    unit_override: Annotated[str, Form(...)] = None,
+    display_as_depth: Annotated[bool, Form(...)] = None,
+    reverse_elevation: Annotated[bool, Form(...)] = False,
+    reverse_data: Annotated[bool, Form(...)] = False,
+    adaptive_resolution: Annotated[bool, Form(...)] = False,
+):
+    """
+    Render several figure variants (units, colorbar, labels, ...) of one 2D S-wave section in a single request.
+
+    The inputs are read once and the section is interpolated once per unit, shared by every variant in that unit.
+    Only the styling runs per variant, in parallel on the render pool (figures already rendered come from the
+    figure cache). Returns a zip with one PNG per variant, named after the variant's "name" (or variant_<index>).
+    The X-Section-Shape and X-Section-Resolution headers hold the grid of each variant, in variant order,
+    separated by ";".
+    """
+    try:
+        parsed_variants = [SectionVariant(**variant) for variant in json.loads(variants)]
+    except Exception as e:
+        logger.error(f"Failed to parse variants: {e}")
+        raise HTTPException(400, f"Invalid variants: {e}")
+    if not parsed_variants:
+        raise HTTPException(400, "At least one variant is required.")
+
+    file_names = []
+    for i, variant in enumerate(parsed_variants):
+        name = variant.name or f"variant_{i}"
+        if not validate_id(name):
+            raise HTTPException(400, f"Invalid variant name {name}")
+        if variant.unit is not None:
+            variant.unit = validate_unit_str(variant.unit)
+        file_names.append(name + ".png")
+    if len(set(file_names)) != len(file_names):
+        raise HTTPException(400, "Variant names must be unique.")
 
-    fd, path = tempfile.mkstemp(suffix=".png")
-    with os.fdopen(fd, 'w') as f:
-        _, img_buff = plot_2ds(
-            vel_models=ingested_velocity_models,
-            elevation_func=geom_interp_func,
-            x_min=x_min,
-            x_max=x_max,
-            x_min_trim=None,
-            x_max_trim=None,
-            y_min=min_depth,
-            y_max=max_depth,
-            res=resolution,
-            smoothing_sigma=smoothing,
-            contours=contours,
-            title=title,
-            y_label=y_label,
-            x_label=x_label,
-            cbar_label=cbar_label,
-            cbar_vmin=vel_min,
-            cbar_vmax=vel_max,
-            contour_color=contour_color,
-            contour_width=contour_width,
-            label_pad_size=label_pad_size,
-            cbar_pad_size=cbar_pad_size,
-            colorbar=enable_colorbar,
-            invert_colorbar_axis=invert_colorbar_axis,
-            save_path=path,
-            aboveground_color=aboveground_color,
-            aboveground_border_color=aboveground_border_color,
-            shift_elevation=shift_elevation,
-            peak_elevation=peak_elevation,
-            cbar_ticks=cbar_ticks,
-            reverse=reverse_data,
-            elevation_tick_increment=elevation_tick_increment,
-            show_plot=False,
-            ticks=tick_param,
-            ticklabels=ticklabel_param,
-            x_label_position=x_axis_label_pos,
-            y_label_position=y_axis_label_pos,
-        )
-    background_tasks.add_task(img_buff.close)
-    headers = {'Content-Disposition': 'inline; filename="out.png"'}
-    return Response(img_buff.getvalue(), headers=headers, media_type="image/png")
+    unit_override = validate_unit_str(unit_override)
+    input_key, inputs = await read_2ds_inputs(
+        velocity_models, elevation_data, project_id, model_set_id, elevation_id, reverse_elevation
+    )
+    params = section_2ds_params(
+        x_min, x_max, min_depth, max_depth, resolution, smoothing, reverse_data, adaptive_resolution
+    )
+    section_key = hash_inputs("2d-s", *input_key, display_as_depth, sorted(params.items()))
+
+    render_tasks = [
+        render_2ds(section_key, inputs, unit_override, display_as_depth, params, variant)
+        for variant in parsed_variants
+    ]
+    images = await asyncio.gather(*render_tasks)
+
+    # PNGs are already compressed, store them as-is
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_STORED) as zip_file:
+        for file_name, (png_bytes, _) in zip(file_names, images):
+            zip_file.writestr(file_name, png_bytes)
+    headers = {'Content-Disposition': 'attachment; filename="sections.zip"'}
+    for header in ('X-Section-Shape', 'X-Section-Resolution'):
+        headers[header] = ";".join(grid_headers[header] for _, grid_headers in images)
+    return Response(zip_buffer.getvalue(), headers=headers, media_type="application/zip")
 
 
 @process_router.post("/grids")
@@ -418,11 +834,14 @@ async def process_grids_from_input(
             matching_files = glob.glob(file_path_pattern)
             logger.info(f"Searching in global directory: {file_path_pattern}")
 
+        # Skip files still being uploaded or compressed
+        matching_files = [path for path in matching_files if not path.endswith((".part", ".tmp"))]
         if not matching_files:
             logger.error(f"File with ID {file_id} not found in project {project_id}")
             continue
 
-        file_path = matching_files[0]
+        # segyio needs a plain file, so archived records are read from a decompressed copy
+        file_path = local_record_path(matching_files[0])
         # file_name = os.path.basename(file_path)
         file_name = option["fileName"]
         logger.info(f"Found file: {file_path}, using name: {file_name}")
@@ -506,6 +925,7 @@ async def auto_limit(
         project_sgy_dir = os.path.join(GLOBAL_SGY_FILES_DIR, project_id)
         if os.path.exists(project_sgy_dir):
             sgy_files = glob.glob(os.path.join(project_sgy_dir, "*.sgy"))
+            sgy_files += glob.glob(os.path.join(project_sgy_dir, f"*.sgy{COMPRESSED_SUFFIX}"))
             logger.info(f"Found {len(sgy_files)} SGY files for project {project_id}")
         else:
             logger.warning(f"No SGY directory found for project {project_id}")
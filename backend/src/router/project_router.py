@@ -1,44 +1,59 @@
+import base64
 import json
 import logging
 import os
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Annotated
+from typing import Any, List, Optional, Annotated, Tuple
 
-import aiofiles
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, Request, Form
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, Request, Response, Form
 from pydantic import BaseModel
-from sqlalchemy import desc, asc, not_
-from sqlalchemy.orm import Session
+from sqlalchemy import desc, asc, not_, and_, or_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, selectinload
 from tereancore.utils import generate_time_based_uid
 
 from config import settings
-from crud.file_crud import create_file_info, get_files_info_by_project, delete_file_info, get_file_info
-from crud.project_crud import update_project, create_project, get_project
-from crud.sgy_file_crud import create_sgy_file_info
-from database import get_db
+from crud.aio import project_crud as async_project_crud
+from crud.file_crud import create_files_info, get_files_info_by_project, delete_file_info, get_file_info
+from crud.project_crud import create_project, get_project, get_project_revision, RevisionConflict
+from crud.sgy_file_crud import create_sgy_files_info
+from database import get_async_db, get_db
+from models.client_model import ClientDBModel
 from models.project_model import ProjectDBModel
 from schemas.additional_models import (
     DisperSettingsModel,
     OptionsModel,
-    PickData
+    PickData,
+    PicksPatch,
 )
 from schemas.file_schema import FileCreate, FileSchema
-from schemas.project_schema import ProjectCreate, Project, ProjectUpdate
+from schemas.project_schema import ProjectCreate, Project, ProjectUpdate, SUMMARY_FIELDS
 from schemas.sgy_file_schema import SgyFileCreate
 from schemas.user_schema import User
+from utils.archive_bundles import schedule_bundle_build
 from utils.authentication import get_current_user, check_permissions
+from utils.blob_store import commit_staged_batch, delete_unreferenced_blob, stage_uploads
 from utils.custom_types.Priority import Priority
+from utils.download_utils import etag_matches, file_download_response
 from utils.custom_types.ProjectStatus import ProjectStatus
-from utils.project_utils import init_project
-from utils.utils import CHUNK_SIZE, validate_id
+from utils.project_cache import project_count_cache, project_settings_cache
+from utils.project_utils import (
+    get_project_settings,
+    init_project_fields,
+    project_not_modified,
+    set_project_etag,
+)
+from utils.render_cache import hash_inputs
+from utils.search_index import search_filter
+from utils.utils import safe_file_extension, validate_id
 
 logger = logging.getLogger(__name__)
 project_router = APIRouter(prefix="/project", tags=["Project"])
 
 # Dependency
 db_dependency = Depends(get_db)
+async_db_dependency = Depends(get_async_db)
 
 # Create a global directory for storing project files
 GLOBAL_DATA_DIR = settings.MQ_SAVE_DIR
@@ -50,26 +65,30 @@ os.makedirs(GLOBAL_PROJECT_FILES_DIR, exist_ok=True)
 @project_router.get("/{project_id}/disper-settings")
 async def get_disper_settings(
         project_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        response: Response,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ) -> DisperSettingsModel:
     check_permissions(current_user, 1)
-    project = init_project(project_id=project_id, db=db)
-    return json.loads(project.disper_settings)
+    not_modified = await project_not_modified(request, project_id, db)
+    if not_modified is not None:
+        return not_modified
+    project = await get_project_settings(project_id, db)
+    set_project_etag(response, project["revision"])
+    return project["disper_settings"]
 
 
 @project_router.post("/{project_id}/disper-settings")
 async def save_disper_settings(
         project_id: str,
         model: DisperSettingsModel,
-        db: Session = db_dependency,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ):
     check_permissions(current_user, 1)
-    project = init_project(project_id=project_id, db=db)
-    project_update = ProjectCreate(**project.model_dump())
-    project_update.disper_settings = json.dumps(model.model_dump())
-    update_project(db=db, project_id=project_id, project=project_update)
+    await init_project_fields(project_id, db, "id")
+    await async_project_crud.update_project_columns(db, project_id, disper_settings=model.model_dump())
     return {"status": "success"}
 
 
@@ -79,17 +98,23 @@ async def save_disper_settings(
 @project_router.get("/{project_id}/options")
 async def get_options(
         project_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        response: Response,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ):
     logger.info(f"Hit options endpoint for project_id {project_id}.")
     check_permissions(current_user, 1)
     logger.info(f"Passed permissions check.")
-    project = init_project(project_id=project_id, db=db)
+    not_modified = await project_not_modified(request, project_id, db)
+    if not_modified is not None:
+        return not_modified
+    project = await get_project_settings(project_id, db)
+    set_project_etag(response, project["revision"])
     response_data = {}
-    response_data["geometry"] = json.loads(project.geometry)
-    response_data["records"] = json.loads(project.record_options)
-    response_data["plotLimits"] = json.loads(project.plot_limits)
+    response_data["geometry"] = project["geometry"]
+    response_data["records"] = project["record_options"]
+    response_data["plotLimits"] = project["plot_limits"]
 
     return response_data
 
@@ -98,18 +123,20 @@ async def get_options(
 async def save_options(
         project_id: str,
         options: OptionsModel,
-        db: Session = db_dependency,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ):
     check_permissions(current_user, 1)
     logger.info(f"Options: {options}")
-    project = init_project(project_id=project_id, db=db)
-    project_update = ProjectCreate(**project.model_dump())
-    project_update.geometry = json.dumps(options.geometry)
-    project_update.record_options = json.dumps(options.records)
+    await init_project_fields(project_id, db, "id")
     logger.info(f"options.plotLimits: {options.plotLimits}")
-    project_update.plot_limits = json.dumps(options.plotLimits)
-    update_project(db=db, project_id=project_id, project=project_update)
+    await async_project_crud.update_project_columns(
+        db,
+        project_id,
+        geometry=[item.model_dump() for item in options.geometry],
+        record_options=[record.model_dump() for record in options.records],
+        plot_limits=options.plotLimits.model_dump(),
+    )
     return {"status": "success"}
 
 
@@ -119,27 +146,70 @@ async def save_options(
 @project_router.get("/{project_id}/picks")
 async def get_picks(
         project_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        response: Response,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ):
     check_permissions(current_user, 1)
-    project = init_project(project_id=project_id, db=db)
-    return json.loads(project.picks)
+    not_modified = await project_not_modified(request, project_id, db)
+    if not_modified is not None:
+        return not_modified
+    project = await get_project_settings(project_id, db)
+    response.headers["X-Project-Revision"] = str(project["revision"])
+    set_project_etag(response, project["revision"])
+    return project["picks"]
 
 
 @project_router.post("/{project_id}/picks")
 async def save_picks(
         project_id: str,
         picks: List[PickData],
-        db: Session = db_dependency,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ):
     check_permissions(current_user, 1)
-    project = init_project(project_id=project_id, db=db)
-    project_update = ProjectCreate(**project.model_dump())
-    project_update.picks = json.dumps(picks)
-    update_project(db=db, project_id=project_id, project=project_update)
-    return {"status": "success", "count": len(picks)}
+    await init_project_fields(project_id, db, "id")
+    revision = await async_project_crud.replace_project_picks(
+        db, project_id, [pick.model_dump() for pick in picks]
+    )
+    return {"status": "success", "count": len(picks), "revision": revision}
+
+
+@project_router.patch("/{project_id}/picks")
+async def patch_picks(
+        project_id: str,
+        patch: PicksPatch,
+        db: AsyncSession = async_db_dependency,
+        current_user: User = Depends(get_current_user),
+):
+    """
+    Add, move and delete individual picks by id in one transaction, instead of resending every pick.
+    Responds 409 with the current revision if base_revision is given and the project has changed since.
+    """
+    check_permissions(current_user, 1)
+    await init_project_fields(project_id, db, "id")
+
+    added, moved, deleted = [], {}, []
+    for edit in patch.edits:
+        if edit.op == "add":
+            added.append(edit.pick.model_dump())
+        elif edit.op == "move":
+            moved[edit.id] = edit.pick.model_dump()
+        else:
+            deleted.append(edit.id)
+    try:
+        revision, added_ids = await async_project_crud.patch_project_picks(
+            db, project_id, added, moved, deleted, patch.base_revision
+        )
+    except RevisionConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Picks were changed by someone else", "revision": e.current_revision},
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"status": "success", "revision": revision, "added_ids": added_ids}
 
 
 # endregion
@@ -148,23 +218,26 @@ async def save_picks(
 @project_router.get("/{project_id}/project-data")
 async def get_project_data(
         project_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        response: Response,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user),
 ):
     check_permissions(current_user, 1)
+    not_modified = await project_not_modified(request, project_id, db)
+    if not_modified is not None:
+        return not_modified
     try:
-        project = init_project(project_id=project_id, db=db)
+        project = await get_project_settings(project_id, db)
+        set_project_etag(response, project["revision"])
         return {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at,
-            "updated_at": project.updated_at,
-            "disper_settings": json.loads(project.disper_settings),
-            "geometry": json.loads(project.geometry),
-            "record_options": json.loads(project.record_options),
-            "plot_limits": json.loads(project.plot_limits),
-            "picks": json.loads(project.picks)
+            "id": project["id"],
+            "name": project["name"],
+            "disper_settings": project["disper_settings"],
+            "geometry": project["geometry"],
+            "record_options": project["record_options"],
+            "plot_limits": project["plot_limits"],
+            "picks": project["picks"]
         }
     except Exception as e:
         logger.error(f"Error getting project data: {str(e)}")
@@ -188,68 +261,66 @@ async def upload_files_to_project(
     # Validate project_id to prevent path traversal
     if not validate_id(project_id):
         raise HTTPException(status_code=400, detail="Invalid project ID")
+    if get_project_revision(db, project_id) is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
 
     # Get the dir to write to (Adding project ID)
     write_dir = os.path.join(GLOBAL_PROJECT_FILES_DIR, project_id)
 
     # Ensure the directory exists
     os.makedirs(write_dir, exist_ok=True)
+    # Stream every file to staging first, several at a time; the DB is only touched once all of them arrived
+    named_files = [file for file in files if file.filename]  # Skip files with no name
     try:
-        result_files = []
-
-        for file in files:
-            try:
-                # Get original filename
-                original_filename = file.filename
-                if not original_filename:
-                    continue  # Skip files with no name
-
-                # Get file extension and mime type
-                file_extension = original_filename.split('.')[-1] if '.' in original_filename else ''
-                mime_type = file.content_type or 'application/octet-stream'
-
-                # Generate unique filename
-                file_id = generate_time_based_uid()
-                unique_filename = f"{file_id}.{file_extension}"
-                file_path = os.path.join(write_dir, unique_filename)
-
-                # Save the file
-                async with aiofiles.open(file_path, 'wb') as f:
-                    while chunk := await file.read(CHUNK_SIZE):
-                        await f.write(chunk)
-
-                # Create FileCreate object
-                file_create = FileCreate(
-                    id=file_id,
-                    original_name=original_filename,
-                    path=file_path,
-                    size=os.path.getsize(file_path),
-                    mime_type=mime_type,
-                    file_extension=file_extension,
-                    project_id=project_id,
-                    upload_date=datetime.now()
-                )
-
-                # Add it to the DB
-                db_file = create_file_info(db=db, file=file_create)
-
-                result_files.append({
-                    "id": file_create.id,
-                    "original_name": file_create.original_name,
-                    "path": file_create.path,
-                    "size": file_create.size,
-                    "upload_date": file_create.upload_date.isoformat(),
-                    "mime_type": file_create.mime_type,
-                    "file_extension": file_create.file_extension
-                })
-                logger.info(f"Successfully saved file: {original_filename} to {file_path} with ID: {file_id}")
-
-            except Exception as file_error:
-                logger.error(f"Error processing file {file.filename}: {str(file_error)}")
-                # Continue with other files
+        staged_files = await stage_uploads(named_files)
+    except Exception as e:
+        logger.error(f"Error receiving upload for project {project_id}: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error receiving files: {str(e)}")
+
+    staged = []
+    file_creates = []
+    for file, staged_file in zip(named_files, staged_files):
+        # Get file extension and mime type
+        original_filename = file.filename
+        file_extension = safe_file_extension(original_filename)
+        mime_type = file.content_type or 'application/octet-stream'
+
+        # Generate unique filename
+        file_id = generate_time_based_uid()
+        file_path = os.path.join(write_dir, f"{file_id}.{file_extension}")
+
+        staged.append((staged_file, file_path))
+        file_creates.append(FileCreate(
+            id=file_id,
+            original_name=original_filename,
+            path=file_path,
+            size=staged_file.size,
+            mime_type=mime_type,
+            file_extension=file_extension,
+            project_id=project_id,
+            upload_date=datetime.now(),
+            content_hash=staged_file.content_hash,
+        ))
+
+    if not staged:
+        raise HTTPException(status_code=400, detail="No files were successfully uploaded")
 
-        if not result_files:
-            raise HTTPException(status_code=400, detail="No files were successfully uploaded")
+    try:
+        # Move the files into the blob store and insert every row in one transaction
+        commit_staged_batch(db, staged, lambda: create_files_info(db, file_creates, commit=False))
+        result_files = [
+            {
+                "id": file_create.id,
+                "original_name": file_create.original_name,
+                "path": file_create.path,
+                "size": file_create.size,
+                "upload_date": file_create.upload_date.isoformat(),
+                "mime_type": file_create.mime_type,
+                "file_extension": file_create.file_extension
+            }
+            for file_create in file_creates
+        ]
+        logger.info(f"Saved {len(result_files)} file(s) to project {project_id}")
 
         return {
             "status": "success",
@@ -317,6 +388,7 @@ async def delete_project_file(
 
         # Delete from database
         if delete_file_info(db=db, file_id=file_id):
+            delete_unreferenced_blob(db, file_to_delete.content_hash)
             return {"status": "success", "message": f"File {file_id} deleted successfully"}
         else:
             raise HTTPException(
@@ -335,12 +407,14 @@ async def delete_project_file(
 async def download_project_file(
         project_id: str,
         file_id: str,
+        request: Request,
         db: Session = db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
     Download a file from a project.
     Requires authentication.
+    Supports Range requests for resuming, and If-None-Match against the file's content hash ETag.
     """
     check_permissions(current_user, 1)
 
@@ -366,17 +440,12 @@ async def download_project_file(
                 detail=f"File {file_id} exists in database but not found on disk"
             )
 
-        async def file_generator():
-            async with aiofiles.open(file_info.path, 'rb') as f:
-                while chunk := await f.read(CHUNK_SIZE):
-                    yield chunk
-
-        return StreamingResponse(
-            file_generator(),
+        return file_download_response(
+            request,
+            file_info.path,
+            filename=file_info.original_name,
+            content_hash=file_info.content_hash,
             media_type=file_info.mime_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{file_info.original_name}"'
-            }
         )
 
     except HTTPException:
@@ -392,22 +461,28 @@ async def download_project_file(
 @project_router.get("/{project_id}", response_model=Project)
 async def get_project_by_id(
         project_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        response: Response,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
     Get a single project by ID.
-    Requires authentication.
+    Requires authentication. Answers If-None-Match with 304 while the project's revision is unchanged.
     """
     check_permissions(current_user, 1)
+    not_modified = await project_not_modified(request, project_id, db)
+    if not_modified is not None:
+        return not_modified
 
     try:
-        project = get_project(db, project_id)
+        project = await async_project_crud.get_project(db, project_id)
         if not project:
             raise HTTPException(
                 status_code=404,
                 detail=f"Project with ID {project_id} not found"
             )
+        set_project_etag(response, project.revision)
         return Project.from_db(project)
     except HTTPException:
         raise
@@ -420,7 +495,7 @@ async def get_project_by_id(
 async def update_project_fields(
     project_id: str,
     project_update: ProjectUpdate,
-    db: Session = db_dependency,
+    db: AsyncSession = async_db_dependency,
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -430,8 +505,7 @@ async def update_project_fields(
     check_permissions(current_user, 1)
     
     try:
-        project = get_project(db, project_id)
-        if not project:
+        if await async_project_crud.get_project_revision(db, project_id) is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Project with ID {project_id} not found"
@@ -442,7 +516,7 @@ async def update_project_fields(
         project_update = ProjectUpdate(**project_update.model_dump(exclude_unset=True))
         
         try:
-            updated_project = update_project(db=db, project_id=project_id, project=project_update)
+            updated_project = await async_project_crud.update_project(db, project_id, project_update)
         except ValueError as e:
             # Handle client not found error
             raise HTTPException(status_code=400, detail=str(e))
@@ -483,7 +557,9 @@ async def update_project_client(
             )
     
     project.client_id = client_id
+    project.revision = ProjectDBModel.revision + 1
     db.commit()
+    project_settings_cache.invalidate(project_id)
     db.refresh(project)
     
     return {"detail": f"Project client updated successfully", "client_id": client_id}
@@ -502,18 +578,87 @@ class SortField(str, Enum):
     RECEIVED_DATE = "received_date"
 
 
+class ProjectListView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
 class ProjectListResponse(BaseModel):
     items: List[Project]
-    total: int
-    page: int
+    # total and pages are None when the request set include_total=false
+    total: Optional[int]
+    # 1-based page number of skip/limit paging; None for cursor pages, whose position in the list isn't known
+    page: Optional[int]
     size: int
-    pages: int
+    pages: Optional[int]
+    # Pass as `cursor` to get the next page; None once a page comes back short
+    next_cursor: Optional[str] = None
+
+
+# Parse the sort value stored in a cursor back to the column's type
+_CURSOR_VALUE_TYPES = {
+    SortField.STATUS: ProjectStatus,
+    SortField.PRIORITY: Priority,
+    SortField.SURVEY_DATE: datetime.fromisoformat,
+    SortField.RECEIVED_DATE: datetime.fromisoformat,
+}
+
+
+def _encode_cursor(project: ProjectDBModel, sort_by: SortField) -> str:
+    """Opaque cursor holding the sort value and id of the last project on a page."""
+    value = getattr(project, sort_by.value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Enum):
+        value = value.value
+    return base64.urlsafe_b64encode(json.dumps([value, project.id]).encode()).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: SortField) -> Tuple[Any, str]:
+    """
+    :return: Tuple of (sort value, project id).
+    :raises HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        value, project_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if value is not None and sort_by in _CURSOR_VALUE_TYPES:
+            value = _CURSOR_VALUE_TYPES[sort_by](value)
+        return value, str(project_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(sort_column, value: Any, project_id: str, descending: bool):
+    """
+    Filter for the projects after (value, project_id) in ORDER BY sort_column, id. SQLite sorts NULLs first in
+    ascending order and last in descending order.
+    """
+    id_column = ProjectDBModel.id
+    if not descending:
+        if value is None:
+            return or_(and_(sort_column.is_(None), id_column > project_id), sort_column.isnot(None))
+        return or_(sort_column > value, and_(sort_column == value, id_column > project_id))
+    if value is None:
+        return and_(sort_column.is_(None), id_column < project_id)
+    return or_(sort_column < value, and_(sort_column == value, id_column < project_id), sort_column.is_(None))
+
+
+def _project_list_etag(*parts: Any) -> str:
+    """
+    :param parts: The request's paging and view, the total and the (id, revision) of each project on the page.
+    """
+    return f'"{hash_inputs(*parts)}"'
 
 
 @project_router.get("/", response_model=ProjectListResponse)
 async def get_all_projects(
+        request: Request,
+        response: Response,
         skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = Query(None, description="next_cursor of the previous page, used instead of skip"),
+        view: ProjectListView = ProjectListView.FULL,
+        include_total: bool = True,
         status: Optional[List[ProjectStatus]] = Query(None, description="Filter by project status(es)"),
         not_status: Optional[List[ProjectStatus]] = Query(None,
                                                           description="Filter out projects with these status(es)"),
@@ -527,21 +672,28 @@ async def get_all_projects(
         received_date_end: Optional[datetime] = Query(None, description="Filter by received date (inclusive)"),
         sort_by: SortField = SortField.NAME,
         sort_order: SortOrder = SortOrder.ASC,
-        db: Session = db_dependency,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
     Get a list of all projects with pagination, filtering, and sorting.
-    Requires authentication.
+    Requires authentication. The ETag covers the ids and revisions of the page's projects, so If-None-Match is
+    answered with 304 from those two columns without loading or serializing the projects.
     
     Parameters:
     - skip: Number of records to skip (for pagination)
     - limit: Maximum number of records to return
+    - cursor: next_cursor of the previous page. Seeks straight to the next page instead of skipping over the earlier
+      ones, so deep pages cost the same as the first. skip is ignored when it is given, and the response's page is
+      null
+    - view: full returns whole projects, summary only the list fields (id, name, status, priority, dates, units and
+      client) without the project data, records or files
+    - include_total: Count the matching projects. Totals are cached until a project is created, changed or deleted
     - status: Filter by project status(es) (can provide multiple)
     - not_status: Filter out projects with these status(es) (can provide multiple)
     - priority: Filter by project priority(ies) (can provide multiple)
     - not_priority: Filter out projects with these priority(ies) (can provide multiple)
-    - name_search: Search in project names (case-insensitive partial match)
+    - name_search: Search in project names (every word matches as a word prefix, see utils.search_index)
     - survey_date_start: Filter by survey date (inclusive)
     - survey_date_end: Filter by survey date (inclusive)
     - received_date_start: Filter by received date (inclusive)
@@ -550,10 +702,11 @@ async def get_all_projects(
     - sort_order: Sort order (asc or desc)
     """
     check_permissions(current_user, 1)
+    after = _decode_cursor(cursor, sort_by) if cursor else None
 
     try:
         # Start with base query
-        query = db.query(ProjectDBModel)
+        query = select(ProjectDBModel)
 
         # Apply status filters
         if status:
@@ -569,7 +722,7 @@ async def get_all_projects(
 
         # Apply name search
         if name_search:
-            query = query.filter(ProjectDBModel.name.ilike(f"%{name_search}%"))
+            query = query.filter(search_filter("projects", name_search))
 
         # Apply date range filters
         if survey_date_start:
@@ -582,31 +735,71 @@ async def get_all_projects(
             query = query.filter(ProjectDBModel.received_date <= received_date_end)
 
         # Get total count before pagination
-        total = query.count()
-
-        # Apply sorting
+        total = None
+        if include_total:
+            count_key = hash_inputs(status, not_status, priority, not_priority, name_search, survey_date_start,
+                                    survey_date_end, received_date_start, received_date_end)
+            total = project_count_cache.get(count_key)
+            if total is None:
+                generation = project_count_cache.generation()
+                total = await db.scalar(select(func.count()).select_from(query.subquery()))
+                project_count_cache.put(count_key, total, generation)
+
+        # Apply sorting, with the id as tie breaker so pages are stable and cursors unambiguous
         sort_column = getattr(ProjectDBModel, sort_by.value)
-        if sort_order == SortOrder.DESC:
-            query = query.order_by(desc(sort_column))
-        else:
-            query = query.order_by(asc(sort_column))
+        descending = sort_order == SortOrder.DESC
+        direction = desc if descending else asc
+        query = query.order_by(direction(sort_column), direction(ProjectDBModel.id))
 
         # Apply pagination
-        query = query.offset(skip).limit(limit)
-
-        # Execute query
-        projects = query.all()
+        if after is not None:
+            query = query.filter(_after_cursor(sort_column, *after, descending))
+        else:
+            query = query.offset(skip)
+        query = query.limit(limit)
+
+        etag_parts = (view, cursor, skip, limit, total)
+        if request.headers.get("if-none-match") is not None:
+            versions = [
+                tuple(row)
+                for row in await db.execute(query.with_only_columns(ProjectDBModel.id, ProjectDBModel.revision))
+            ]
+            etag = _project_list_etag(*etag_parts, versions)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+
+        # Execute query, loading the relationships of the whole page in one query each
+        if view == ProjectListView.SUMMARY:
+            summary_columns = [getattr(ProjectDBModel, field) for field in SUMMARY_FIELDS]
+            query = query.options(
+                load_only(*summary_columns, ProjectDBModel.revision),
+                selectinload(ProjectDBModel.client).selectinload(ClientDBModel.contacts),
+            )
+        else:
+            query = query.options(
+                selectinload(ProjectDBModel.client).selectinload(ClientDBModel.contacts),
+                selectinload(ProjectDBModel.records),
+                selectinload(ProjectDBModel.additional_files),
+                selectinload(ProjectDBModel.picks),
+            )
+        projects = list(await db.scalars(query))
+        response.headers["ETag"] = _project_list_etag(
+            *etag_parts, [(project.id, project.revision) for project in projects]
+        )
+        response.headers["Cache-Control"] = "private, no-cache"
 
         # Calculate pagination info
-        page = (skip // limit) + 1
-        pages = (total + limit - 1) // limit  # Ceiling division
+        page = (skip // limit) + 1 if after is None else None
+        pages = (total + limit - 1) // limit if total is not None else None  # Ceiling division
 
+        to_schema = Project.summary_from_db if view == ProjectListView.SUMMARY else Project.from_db
         return ProjectListResponse(
-            items=[Project.from_db(project) for project in projects],
+            items=[to_schema(project) for project in projects],
             total=total,
             page=page,
             size=limit,
-            pages=pages
+            pages=pages,
+            next_cursor=_encode_cursor(projects[-1], sort_by) if len(projects) == limit else None,
         )
 
     except Exception as e:
@@ -690,142 +883,113 @@ async def create_new_project(
                 detail=f"Project with ID {project_id} already exists"
             )
 
-        # Create project directory
+        # Create project directories
         project_dir = os.path.join(GLOBAL_PROJECT_FILES_DIR, project_id)
         os.makedirs(project_dir, exist_ok=True)
+        sgy_project_dir = os.path.join(settings.MQ_SAVE_DIR, "SGYFiles", project_id)
+        if sgy_files:
+            os.makedirs(sgy_project_dir, exist_ok=True)
+
+        # Stream every file to staging first, several at a time; the DB is only touched once all of them arrived
+        named_sgy_files = [file for file in sgy_files or [] if file.filename]
+        named_additional_files = [file for file in additional_files or [] if file.filename]
+        try:
+            staged_files = await stage_uploads(named_sgy_files + named_additional_files)
+        except Exception as e:
+            logger.error(f"Error receiving files for project {project_id}: {str(e)}")
+            raise HTTPException(status_code=400, detail=f"Error receiving files: {str(e)}")
+        staged_sgy_files = staged_files[:len(named_sgy_files)]
+        staged_additional_files = staged_files[len(named_sgy_files):]
+
+        staged = []
+        sgy_file_creates = []
+        file_creates = []
+        # Parse existing record_options from the project, to fill in the generated file IDs
+        record_options = json.loads(project.record_options) if project.record_options else []
+        updated_record_options = []
+        for file_index, (file, staged_file) in enumerate(zip(named_sgy_files, staged_sgy_files)):
+            # Generate unique filename
+            original_filename = file.filename
+            file_id = generate_time_based_uid()
+            file_extension = safe_file_extension(original_filename, 'sgy')
+            file_path = os.path.join(sgy_project_dir, f"{file_id}.{file_extension}")
+
+            staged.append((staged_file, file_path))
+            sgy_file_creates.append(SgyFileCreate(
+                id=file_id,
+                original_name=original_filename,
+                path=file_path,
+                size=staged_file.size,
+                type=file_extension.upper(),
+                project_id=project_id,
+                upload_date=datetime.now(),
+                content_hash=staged_file.content_hash,
+            ))
+            logger.info(f"Staged SEG-Y file {original_filename} as {file_id}")
+
+            # Update record_options with the generated ID
+            if file_index < len(record_options):
+                # Update existing record option with the generated ID
+                record_option = record_options[file_index]
+                record_option['id'] = file_id
+                updated_record_options.append(record_option)
+            else:
+                # Create new record option if not provided in initial data
+                updated_record_options.append({
+                    'id': file_id,
+                    'enabled': False,
+                    'weight': 100,
+                    'fileName': original_filename
+                })
+
+        for file, staged_file in zip(named_additional_files, staged_additional_files):
+            # Get file extension and mime type
+            original_filename = file.filename
+            file_extension = safe_file_extension(original_filename)
+            mime_type = file.content_type or 'application/octet-stream'
+
+            # Generate unique filename
+            file_id = generate_time_based_uid()
+            file_path = os.path.join(project_dir, f"{file_id}.{file_extension}")
+
+            staged.append((staged_file, file_path))
+            file_creates.append(FileCreate(
+                id=file_id,
+                original_name=original_filename,
+                path=file_path,
+                size=staged_file.size,
+                mime_type=mime_type,
+                file_extension=file_extension,
+                project_id=project_id,
+                upload_date=datetime.now(),
+                content_hash=staged_file.content_hash,
+            ))
+            logger.info(f"Staged additional file {original_filename} as {file_id}")
 
         # Create project in database - pass ProjectCreate with the ID set
         project_data = project.model_dump()
         project_data["id"] = project_id
+        if updated_record_options:
+            project_data["record_options"] = json.dumps(updated_record_options)
         project_with_id = ProjectCreate(**project_data)
-        
+
+        def write_rows():
+            new_project = create_project(db=db, project=project_with_id, commit=False)
+            create_sgy_files_info(db, sgy_file_creates, commit=False)
+            create_files_info(db, file_creates, commit=False)
+            return new_project
+
+        # The project, its files and their blobs are written in one transaction
         try:
-            db_project = create_project(db=db, project=project_with_id)
+            db_project = commit_staged_batch(db, staged, write_rows)
         except ValueError as e:
             # Handle client not found error
             raise HTTPException(status_code=400, detail=str(e))
-
-        # Handle SEG-Y file uploads
-        if sgy_files:
-            # Get project dir and ensure it exists.
-            sgy_project_dir = os.path.join(settings.MQ_SAVE_DIR, "SGYFiles", project_id)
-            os.makedirs(sgy_project_dir, exist_ok=True)
-
-            # Parse existing record_options from the project
-            record_options = json.loads(project.record_options) if project.record_options else []
-            updated_record_options = []
-            file_index = 0
-
-            for file in sgy_files:
-                try:
-                    # Get original filename
-                    logger.info(f"Processing sgy file {file}")
-                    original_filename = file.filename
-                    if not original_filename:
-                        continue
-                    logger.info(f"Got original filename {original_filename}")
-
-                    # Generate unique filename
-                    file_id = generate_time_based_uid()
-                    file_extension = original_filename.split('.')[-1] if '.' in original_filename else 'sgy'
-                    unique_filename = f"{file_id}.{file_extension}"
-                    file_path = os.path.join(sgy_project_dir, unique_filename)
-                    logger.info(f"Generated unique filename {unique_filename} and file path {file_path}")
-
-                    # Save the file
-                    async with aiofiles.open(file_path, 'wb') as f:
-                        while chunk := await file.read(CHUNK_SIZE):
-                            await f.write(chunk)
-                    logger.info(f"Successfully saved file to {file_path}")
-
-                    # Create SgyFileCreate object
-                    sgy_file_create = SgyFileCreate(
-                        id=file_id,
-                        original_name=original_filename,
-                        path=file_path,
-                        size=os.path.getsize(file_path),
-                        type=file_extension.upper(),
-                        project_id=project_id,
-                        upload_date=datetime.now()
-                    )
-                    logger.info(f"Creating db entry with data {sgy_file_create}")
-
-                    # Add it to the DB
-                    create_sgy_file_info(db=db, sgy_file=sgy_file_create)
-                    logger.info(f"Successfully saved SEG-Y file: {original_filename} to {file_path} with ID: {file_id}")
-
-                    # Update record_options with the generated ID
-                    if file_index < len(record_options):
-                        # Update existing record option with the generated ID
-                        record_option = record_options[file_index]
-                        record_option['id'] = file_id
-                        updated_record_options.append(record_option)
-                    else:
-                        # Create new record option if not provided in initial data
-                        updated_record_options.append({
-                            'id': file_id,
-                            'enabled': False,
-                            'weight': 100,
-                            'fileName': original_filename
-                        })
-
-                    file_index += 1
-
-                except Exception as file_error:
-                    logger.error(f"Error processing SEG-Y file {file.filename}: {str(file_error)}")
-                    continue
-
-            # Update the project's record_options with the file IDs
-            if updated_record_options:
-                logger.info(f"Updating project record_options with file IDs: {updated_record_options}")
-                db_project.record_options = json.dumps(updated_record_options)
-                db.commit()
-                db.refresh(db_project)
-                logger.info("Successfully updated project record_options with file IDs")
-
-        # Handle additional file uploads
-        if additional_files:
-            for file in additional_files:
-                try:
-                    # Get original filename
-                    original_filename = file.filename
-                    if not original_filename:
-                        continue
-
-                    # Get file extension and mime type
-                    file_extension = original_filename.split('.')[-1] if '.' in original_filename else ''
-                    mime_type = file.content_type or 'application/octet-stream'
-
-                    # Generate unique filename
-                    file_id = generate_time_based_uid()
-                    unique_filename = f"{file_id}.{file_extension}"
-                    file_path = os.path.join(project_dir, unique_filename)
-
-                    # Save the file
-                    async with aiofiles.open(file_path, 'wb') as f:
-                        while chunk := await file.read(CHUNK_SIZE):
-                            await f.write(chunk)
-
-                    # Create FileCreate object
-                    file_create = FileCreate(
-                        id=file_id,
-                        original_name=original_filename,
-                        path=file_path,
-                        size=os.path.getsize(file_path),
-                        mime_type=mime_type,
-                        file_extension=file_extension,
-                        project_id=project_id,
-                        upload_date=datetime.now()
-                    )
-
-                    # Add it to the DB
-                    create_file_info(db=db, file=file_create)
-                    logger.info(
-                        f"Successfully saved additional file: {original_filename} to {file_path} with ID: {file_id}")
-
-                except Exception as file_error:
-                    logger.error(f"Error processing additional file {file.filename}: {str(file_error)}")
-                    continue
+        db.refresh(db_project)
+        logger.info(f"Created project {project_id} with {len(sgy_file_creates)} SEG-Y and {len(file_creates)} "
+                    f"additional files")
+        if sgy_file_creates:
+            schedule_bundle_build(project_id)
 
         logger.info("Getting return data from db")
         ret_project = Project.from_db(db_project)
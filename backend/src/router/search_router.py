@@ -0,0 +1,65 @@
+import logging
+from enum import Enum
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session, selectinload
+
+from database import get_db
+from models.client_model import ClientDBModel
+from models.project_model import ProjectDBModel
+from schemas.client_schema import Client
+from schemas.contact_schema import Contact
+from schemas.project_schema import Project
+from schemas.user_schema import User
+from utils.authentication import get_current_user, check_permissions
+from utils.search_index import search_rows
+
+logger = logging.getLogger(__name__)
+search_router = APIRouter(prefix="/search", tags=["Search"])
+
+
+class SearchKind(str, Enum):
+    PROJECTS = "projects"
+    CLIENTS = "clients"
+    CONTACTS = "contacts"
+
+
+class SearchResponse(BaseModel):
+    projects: List[Project] = []
+    clients: List[Client] = []
+    contacts: List[Contact] = []
+
+
+@search_router.get("/", response_model=SearchResponse)
+async def search(
+        q: str = Query(..., min_length=1, description="Words to find; each matches as a word prefix"),
+        kinds: Optional[List[SearchKind]] = Query(None, description="What to search (default everything)"),
+        limit: int = Query(20, ge=1, le=100, description="Maximum results of each kind"),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Search project names, client names and contact names, emails and phone numbers.
+    Requires authentication. Results of each kind are ranked best match first; projects are returned in the summary
+    form of the project list.
+    """
+    check_permissions(current_user, 1)
+    kinds = set(kinds or SearchKind)
+
+    try:
+        response = SearchResponse()
+        if SearchKind.PROJECTS in kinds:
+            projects = search_rows(db, "projects", q, limit, options=[selectinload(ProjectDBModel.client)])
+            response.projects = [Project.summary_from_db(project) for project in projects]
+        if SearchKind.CLIENTS in kinds:
+            clients = search_rows(db, "clients", q, limit, options=[selectinload(ClientDBModel.contacts)])
+            response.clients = [Client.model_validate(client) for client in clients]
+        if SearchKind.CONTACTS in kinds:
+            contacts = search_rows(db, "contacts", q, limit)
+            response.contacts = [Contact.model_validate(contact) for contact in contacts]
+        return response
+    except Exception as e:
+        logger.error(f"Error searching for {q!r}: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error searching: {str(e)}")
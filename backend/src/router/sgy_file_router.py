@@ -1,28 +1,48 @@
+import asyncio
 import logging
 import os
 from datetime import datetime
 from typing import List
 
 import aiofiles
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, File, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.requests import ClientDisconnect
 from tereancore.utils import generate_time_based_uid
 
 from config import settings
+from crud.aio import sgy_file_crud as async_sgy_file_crud
+from crud.project_crud import get_project_revision
 from crud.sgy_file_crud import (
     get_sgy_file_info,
     get_sgy_files_info,
-    get_sgy_files_info_by_project,
-    create_sgy_file_info,
+    create_sgy_files_info,
     delete_sgy_file_info,
 )
-from database import get_db
+from crud.upload_session_crud import (
+    get_upload_session,
+    create_upload_session,
+    update_upload_session_offset,
+    delete_upload_session,
+)
+from database import get_async_db, get_db
 from schemas.sgy_file_schema import SgyFile, SgyFileCreate
+from schemas.upload_session_schema import UploadSession, UploadSessionCreate
 from schemas.user_schema import User
+from utils.archive_bundles import MAX_BUNDLE_RECORDS, get_bundle, records_to_zip, schedule_bundle_build
 from utils.authentication import get_current_user, check_permissions
+from utils.blob_store import (
+    StagedFile,
+    commit_staged_batch,
+    delete_unreferenced_blob,
+    hash_file,
+    stage_uploads,
+)
+from utils.download_utils import file_download_response
+from utils.sgy_header import SGY_HEADER_SIZE, parse_sgy_header
 from utils.streaming_utils import create_streaming_zip_response
-from utils.utils import CHUNK_SIZE, validate_id
+from utils.utils import safe_file_extension, validate_id
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -37,6 +57,10 @@ os.makedirs(GLOBAL_SGY_FILES_DIR, exist_ok=True)
 
 # Dependency
 db_dependency = Depends(get_db)
+async_db_dependency = Depends(get_async_db)
+
+# One writer per resumable upload at a time
+_upload_locks: dict[str, asyncio.Lock] = {}
 
 
 @sgy_file_router.get("/", response_model=List[SgyFile])
@@ -58,7 +82,7 @@ async def get_sgy_files_info_endpoint(
 @sgy_file_router.get("/{sgy_file_id}", response_model=SgyFile)
 async def read_sgy_file_endpoint(
         sgy_file_id: str,
-        db: Session = db_dependency,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
@@ -66,7 +90,7 @@ async def read_sgy_file_endpoint(
     Requires authentication.
     """
     check_permissions(current_user, 1)
-    db_sgy_file = get_sgy_file_info(db, sgy_file_id)
+    db_sgy_file = await async_sgy_file_crud.get_sgy_file_info(db, sgy_file_id)
     if db_sgy_file is None:
         raise HTTPException(status_code=404, detail="SEG-Y file not found")
     return db_sgy_file
@@ -77,7 +101,7 @@ async def read_project_sgy_files_endpoint(
         project_id: str,
         skip: int = 0,
         limit: int = 100,
-        db: Session = db_dependency,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
@@ -85,7 +109,7 @@ async def read_project_sgy_files_endpoint(
     Requires authentication.
     """
     check_permissions(current_user, 1)
-    return get_sgy_files_info_by_project(db, project_id, skip=skip, limit=limit)
+    return await async_sgy_file_crud.get_sgy_files_info_by_project(db, project_id, skip=skip, limit=limit)
 
 
 @sgy_file_router.post("/project/{project_id}/upload", status_code=status.HTTP_201_CREATED)
@@ -109,6 +133,8 @@ async def upload_sgy_files_to_project_endpoint(
     # Validate project_id to prevent path traversal
     if not validate_id(project_id):
         raise HTTPException(status_code=400, detail="Invalid project ID")
+    if get_project_revision(db, project_id) is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
 
     # Get the dir to write to (Adding project ID)
     write_dir = os.path.join(GLOBAL_SGY_FILES_DIR, project_id)
@@ -117,72 +143,68 @@ async def upload_sgy_files_to_project_endpoint(
     os.makedirs(write_dir, exist_ok=True)
     logger.info(f"Write directory: {write_dir}")
 
+    named_files = []
+    for i, sgy_file in enumerate(files):
+        logger.info(f"Processing file {i}: {sgy_file.filename}")
+        if not sgy_file.filename:
+            logger.warning(f"File {i} has no name, skipping")
+            continue  # Skip files with no name
+        named_files.append(sgy_file)
+
+    # Stream every file to staging first, several at a time; the DB is only touched once all of them arrived
     try:
-        result_files = []
-
-        for i, sgy_file in enumerate(files):
-            try:
-                # Get original filename
-                original_filename = sgy_file.filename
-                logger.info(f"Processing file {i}: {original_filename}")
-
-                if not original_filename:
-                    logger.warning(f"File {i} has no name, skipping")
-                    continue  # Skip files with no name
-
-                # Assign the file a unique id
-                file_id = generate_time_based_uid()
-                logger.info(f"Generated file ID: {file_id}")
-
-                file_extension = original_filename.split('.')[-1] if '.' in original_filename else 'sgy'
-                unique_filename = f"{file_id}.{file_extension}"
-                file_path = os.path.join(write_dir, unique_filename)
-
-                logger.info(f"Saving file to: {file_path}")
-
-                # Save the file
-                async with aiofiles.open(file_path, 'wb') as f:
-                    while chunk := await sgy_file.read(CHUNK_SIZE):
-                        await f.write(chunk)
-
-                file_size = os.path.getsize(file_path)
-                logger.info(f"File saved successfully. Size: {file_size} bytes")
-
-                # Create SgyFileCreate object
-                sgy_file_create = SgyFileCreate(
-                    id=file_id,
-                    original_name=original_filename,
-                    path=file_path,
-                    size=file_size,
-                    type=file_extension.upper(),
-                    project_id=project_id,
-                    upload_date=datetime.now(),
-                )
-
-                # Add it to the DB
-                db_sgy_file = create_sgy_file_info(db=db, sgy_file=sgy_file_create)
-                logger.info(f"File info saved to database with ID: {file_id}")
-
-                result_files.append({
-                    "id": sgy_file_create.id,
-                    "original_name": sgy_file_create.original_name,
-                    "path": sgy_file_create.path,
-                    "size": sgy_file_create.size,
-                    "upload_date": sgy_file_create.upload_date.isoformat(),
-                    "file_type": sgy_file_create.type
-                })
-                logger.info(f"Successfully processed file: {original_filename} with ID: {file_id}")
-
-            except Exception as file_error:
-                logger.error(f"Error processing file {sgy_file.filename}: {str(file_error)}")
-                # Continue with other files
-
-        if not result_files:
-            logger.error("No files were successfully uploaded")
-            raise HTTPException(status_code=400, detail="No files were successfully uploaded")
+        staged_files = await stage_uploads(named_files, header_size=SGY_HEADER_SIZE)
+    except Exception as e:
+        logger.error(f"Error receiving upload for project {project_id}: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error receiving files: {str(e)}")
+
+    staged = []
+    sgy_file_creates = []
+    header_summaries = []
+    for sgy_file, staged_file in zip(named_files, staged_files):
+        # Assign the file a unique id
+        original_filename = sgy_file.filename
+        file_id = generate_time_based_uid()
+        file_extension = safe_file_extension(original_filename, 'sgy')
+        file_path = os.path.join(write_dir, f"{file_id}.{file_extension}")
+        staged.append((staged_file, file_path))
+        logger.info(f"Staged {original_filename} as {file_id}. Size: {staged_file.size} bytes")
+
+        sgy_file_creates.append(SgyFileCreate(
+            id=file_id,
+            original_name=original_filename,
+            path=file_path,
+            size=staged_file.size,
+            type=file_extension.upper(),
+            project_id=project_id,
+            upload_date=datetime.now(),
+            content_hash=staged_file.content_hash,
+        ))
+        header_summaries.append(parse_sgy_header(staged_file.header, staged_file.size))
+
+    if not staged:
+        logger.error("No files were successfully uploaded")
+        raise HTTPException(status_code=400, detail="No files were successfully uploaded")
+
+    try:
+        # Move the files into the blob store and insert every row in one transaction
+        commit_staged_batch(db, staged, lambda: create_sgy_files_info(db, sgy_file_creates, commit=False))
+        result_files = [
+            {
+                "id": sgy_file_create.id,
+                "original_name": sgy_file_create.original_name,
+                "path": sgy_file_create.path,
+                "size": sgy_file_create.size,
+                "upload_date": sgy_file_create.upload_date.isoformat(),
+                "file_type": sgy_file_create.type,
+                "header": header_summary.to_dict() if header_summary else None,
+            }
+            for sgy_file_create, header_summary in zip(sgy_file_creates, header_summaries)
+        ]
 
         logger.info(f"=== Upload Complete ===")
         logger.info(f"Successfully uploaded {len(result_files)} files")
+        schedule_bundle_build(project_id)
 
         return {
             "status": "success",
@@ -195,6 +217,228 @@ async def upload_sgy_files_to_project_endpoint(
         raise HTTPException(status_code=500, detail=f"Error uploading files: {str(e)}")
 
 
+def _part_path(upload) -> str:
+    return upload.path + ".part"
+
+
+def _get_upload_or_404(db: Session, upload_id: str):
+    if not validate_id(upload_id):
+        raise HTTPException(status_code=400, detail="Invalid upload ID")
+    upload = get_upload_session(db, upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
+
+@sgy_file_router.post(
+    "/project/{project_id}/uploads", response_model=UploadSession, status_code=status.HTTP_201_CREATED
+)
+async def create_sgy_upload_endpoint(
+        project_id: str,
+        upload: UploadSessionCreate,
+        db: Session = db_dependency,
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Start a resumable upload of one SEG-Y file into a project.
+
+    Send the file with PUT /sgy-files/uploads/{upload_id}?offset=N (raw bytes, any chunk size), check progress
+    with GET /sgy-files/uploads/{upload_id} after a dropped connection, then POST .../finalize. Several uploads can
+    run in parallel. Requires authentication.
+    """
+    check_permissions(current_user, 1)
+
+    # Validate project_id to prevent path traversal
+    if not validate_id(project_id):
+        raise HTTPException(status_code=400, detail="Invalid project ID")
+    if upload.size < 0:
+        raise HTTPException(status_code=400, detail="Invalid file size")
+    if not upload.original_name:
+        raise HTTPException(status_code=400, detail="File name is required")
+    if get_project_revision(db, project_id) is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {project_id} not found")
+
+    # The upload id doubles as the final file id
+    file_id = generate_time_based_uid()
+    file_extension = safe_file_extension(upload.original_name, 'sgy')
+    write_dir = os.path.join(GLOBAL_SGY_FILES_DIR, project_id)
+    file_path = os.path.join(write_dir, f"{file_id}.{file_extension}")
+    os.makedirs(write_dir, exist_ok=True)
+
+    db_upload = create_upload_session(
+        db=db,
+        upload_id=file_id,
+        project_id=project_id,
+        original_name=upload.original_name,
+        path=file_path,
+        file_type=file_extension.upper(),
+        size=upload.size,
+        checksum=upload.checksum.lower() if upload.checksum else None,
+    )
+    # Chunks are written straight into the project's SGY dir; the .part suffix keeps unfinished files out of globs
+    async with aiofiles.open(_part_path(db_upload), 'wb'):
+        pass
+    logger.info(f"Created upload {file_id} for {upload.original_name} ({upload.size} bytes) in project {project_id}")
+    return db_upload
+
+
+@sgy_file_router.get("/uploads/{upload_id}", response_model=UploadSession)
+async def get_sgy_upload_endpoint(
+        upload_id: str,
+        db: Session = db_dependency,
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Get the state of a resumable upload. `offset` is the number of bytes received, resume from there.
+    Requires authentication.
+    """
+    check_permissions(current_user, 1)
+    return _get_upload_or_404(db, upload_id)
+
+
+@sgy_file_router.put("/uploads/{upload_id}", response_model=UploadSession)
+async def put_sgy_upload_chunk_endpoint(
+        upload_id: str,
+        offset: int,
+        request: Request,
+        db: Session = db_dependency,
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Append a chunk to a resumable upload. The request body is the raw chunk and `offset` must equal the number of
+    bytes received so far, otherwise 409 is returned with the current offset.
+    Requires authentication.
+    """
+    check_permissions(current_user, 1)
+    upload = _get_upload_or_404(db, upload_id)
+
+    lock = _upload_locks.setdefault(upload_id, asyncio.Lock())
+    if lock.locked():
+        raise HTTPException(status_code=409, detail="A chunk for this upload is already being written")
+    async with lock:
+        db.refresh(upload)
+        if offset != upload.offset:
+            raise HTTPException(status_code=409, detail={"message": "Offset mismatch", "offset": upload.offset})
+
+        written = 0
+        try:
+            async with aiofiles.open(_part_path(upload), 'r+b') as f:
+                await f.seek(offset)
+                async for chunk in request.stream():
+                    if offset + written + len(chunk) > upload.size:
+                        raise HTTPException(status_code=413, detail="Chunk runs past the declared file size")
+                    await f.write(chunk)
+                    written += len(chunk)
+                await f.truncate(offset + written)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Upload data not found")
+        except ClientDisconnect:
+            # Keep what arrived; the client resumes from the recorded offset
+            logger.warning(f"Client disconnected during upload {upload_id} after {written} bytes")
+        finally:
+            if written:
+                update_upload_session_offset(db, upload_id, offset + written)
+    if _upload_locks.get(upload_id) is lock and not lock.locked():
+        _upload_locks.pop(upload_id, None)
+
+    db.refresh(upload)
+    return upload
+
+
+@sgy_file_router.post("/uploads/{upload_id}/finalize", status_code=status.HTTP_201_CREATED)
+async def finalize_sgy_upload_endpoint(
+        upload_id: str,
+        db: Session = db_dependency,
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Finish a resumable upload: check the size and checksum, move the file into place and register it with the
+    project. The blob, the file row and the end of the upload session are committed together, so a failure leaves
+    none of them behind. Requires authentication.
+    """
+    check_permissions(current_user, 1)
+    upload = _get_upload_or_404(db, upload_id)
+    if get_project_revision(db, upload.project_id) is None:
+        raise HTTPException(status_code=404, detail=f"Project with ID {upload.project_id} not found")
+    if _upload_locks.get(upload_id) is not None and _upload_locks[upload_id].locked():
+        raise HTTPException(status_code=409, detail="A chunk for this upload is still being written")
+
+    part_path = _part_path(upload)
+    if not os.path.exists(part_path):
+        raise HTTPException(status_code=404, detail="Upload data not found")
+    file_size = os.path.getsize(part_path)
+    if upload.offset != upload.size or file_size != upload.size:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Upload incomplete", "offset": upload.offset, "size": upload.size},
+        )
+    checksum, _ = await asyncio.to_thread(hash_file, part_path)
+    if upload.checksum:
+        if checksum != upload.checksum:
+            logger.error(f"Checksum mismatch for upload {upload_id}: expected {upload.checksum}, got {checksum}")
+            # The data is bad, start over from the beginning
+            async with aiofiles.open(part_path, 'wb'):
+                pass
+            update_upload_session_offset(db, upload_id, 0)
+            raise HTTPException(status_code=422, detail="Checksum mismatch, upload restarted")
+
+    sgy_file_create = SgyFileCreate(
+        id=upload.id,
+        original_name=upload.original_name,
+        path=upload.path,
+        size=file_size,
+        type=upload.type,
+        project_id=upload.project_id,
+        upload_date=datetime.now(),
+        content_hash=checksum,
+    )
+
+    def write_rows():
+        create_sgy_files_info(db, [sgy_file_create], commit=False)
+        delete_upload_session(db, upload_id, commit=False)
+
+    # The .part file is the staged data: it moves into the blob store and is linked at the file's path
+    staged = StagedFile(tmp_path=part_path, content_hash=checksum, size=file_size)
+    try:
+        commit_staged_batch(db, [(staged, upload.path)], write_rows)
+    except Exception as e:
+        logger.error(f"Error finalizing upload {upload_id}: {e}")
+        # The received data was discarded with the failed transaction, start over from the beginning
+        async with aiofiles.open(part_path, 'wb'):
+            pass
+        update_upload_session_offset(db, upload_id, 0)
+        raise HTTPException(status_code=500, detail="Failed to finalize upload, upload restarted")
+    logger.info(f"Finalized upload {upload_id}: {upload.original_name} ({file_size} bytes)")
+    schedule_bundle_build(upload.project_id)
+
+    return {
+        "id": sgy_file_create.id,
+        "original_name": sgy_file_create.original_name,
+        "path": sgy_file_create.path,
+        "size": sgy_file_create.size,
+        "upload_date": sgy_file_create.upload_date.isoformat(),
+        "file_type": sgy_file_create.type
+    }
+
+
+@sgy_file_router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_sgy_upload_endpoint(
+        upload_id: str,
+        db: Session = db_dependency,
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Abort a resumable upload and delete the data received so far.
+    Requires authentication.
+    """
+    check_permissions(current_user, 1)
+    upload = _get_upload_or_404(db, upload_id)
+    part_path = _part_path(upload)
+    if os.path.exists(part_path):
+        os.remove(part_path)
+    delete_upload_session(db, upload_id)
+
+
 @sgy_file_router.delete("/{sgy_file_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_sgy_file_endpoint(
         sgy_file_id: str,
@@ -221,23 +465,27 @@ async def remove_sgy_file_endpoint(
     success = delete_sgy_file_info(db, sgy_file_id)
     if not success:
         raise HTTPException(status_code=404, detail="SEG-Y file not found")
+    delete_unreferenced_blob(db, sgy_file_info.content_hash)
+    schedule_bundle_build(sgy_file_info.project_id)
     return {"status": "success", "message": f"SEG-Y file {sgy_file_id} deleted successfully"}
 
 
 @sgy_file_router.get("/download_file/{sgy_file_id}", status_code=status.HTTP_200_OK)
 async def download_sgy_file_endpoint(
         sgy_file_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
     Download a specific SEG-Y file by ID.
     Requires authentication and auth_level >= 1.
+    Supports Range requests for resuming, and If-None-Match against the file's content hash ETag.
     """
     check_permissions(current_user, 1)
 
     # Get file info from database
-    sgy_file_info = get_sgy_file_info(db, sgy_file_id)
+    sgy_file_info = await async_sgy_file_crud.get_sgy_file_info(db, sgy_file_id)
     if not sgy_file_info:
         raise HTTPException(status_code=404, detail="SEG-Y file not found")
 
@@ -245,49 +493,52 @@ async def download_sgy_file_endpoint(
     if not os.path.exists(sgy_file_info.path):
         raise HTTPException(status_code=404, detail="File not found on server")
 
-    # Return file as streaming response
-    return StreamingResponse(
-        open(sgy_file_info.path, 'rb'),
-        media_type='application/octet-stream',
-        headers={
-            'Content-Disposition': f'attachment; filename="{sgy_file_info.original_name}"'
-        }
+    return file_download_response(
+        request,
+        sgy_file_info.path,
+        filename=sgy_file_info.original_name,
+        content_hash=sgy_file_info.content_hash,
     )
 
 
 @sgy_file_router.get("/download_project_sgy/{project_id}", status_code=status.HTTP_200_OK)
 async def download_sgy_files_for_project_endpoint(
         project_id: str,
-        db: Session = db_dependency,
+        request: Request,
+        db: AsyncSession = async_db_dependency,
         current_user: User = Depends(get_current_user)
 ):
     """
     Download all SEG-Y files for a specific project as a zip archive.
     Requires authentication and auth_level >= 1.
-    Uses streaming to handle large files efficiently.
+    Uses streaming to handle large files efficiently, or the project's prebuilt bundle when it is up to date.
     """
     check_permissions(current_user, 1)
 
     # Get all files for the project
-    sgy_files = get_sgy_files_info_by_project(db, project_id)
+    sgy_files = await async_sgy_file_crud.get_sgy_files_info_by_project(db, project_id, limit=MAX_BUNDLE_RECORDS)
     if not sgy_files:
         err_string = f"No SEG-Y files found for project {project_id}"
         logger.error(err_string)
         raise HTTPException(status_code=404, detail=err_string)
     logger.info(f"Found {len(sgy_files)} files for project {project_id}")
 
-    # Prepare files for streaming zip
-    files_to_zip = []
-    for sgy_file in sgy_files:
-        if os.path.exists(sgy_file.path):
-            files_to_zip.append((sgy_file.path, sgy_file.original_name))
-        else:
-            logger.warning(f"File not found on disk: {sgy_file.path}")
+    filename = f"project_{project_id}_records.zip"
+    # Serve the prebuilt bundle if nothing changed since it was built
+    bundle = get_bundle(project_id, sgy_files)
+    if bundle is not None:
+        bundle_file, key = bundle
+        return file_download_response(
+            request, bundle_file, filename=filename, content_hash=key, media_type="application/x-zip-compressed"
+        )
 
+    # Prepare files for streaming zip
+    files_to_zip = records_to_zip(sgy_files)
     if not files_to_zip:
         raise HTTPException(status_code=404, detail="No files found on disk")
 
+    schedule_bundle_build(project_id)
     return await create_streaming_zip_response(
         files_to_zip=files_to_zip,
-        filename=f"project_{project_id}_records.zip"
+        filename=filename
     )
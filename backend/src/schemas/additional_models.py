@@ -1,6 +1,6 @@
-from typing import List, Union
+from typing import List, Literal, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 class GeometryItem(BaseModel):
@@ -127,6 +127,27 @@ class PickData(BaseModel):
         }
 
 
+class PickEdit(BaseModel):
+    """One change to a project's picks. add needs pick, move needs id and pick, delete needs id."""
+    op: Literal["add", "move", "delete"]
+    id: Optional[int] = None
+    pick: Optional[PickData] = None
+
+    @model_validator(mode="after")
+    def check_fields(self):
+        if self.op != "add" and self.id is None:
+            raise ValueError(f"{self.op} needs the id of the pick")
+        if self.op != "delete" and self.pick is None:
+            raise ValueError(f"{self.op} needs the pick values")
+        return self
+
+
+class PicksPatch(BaseModel):
+    # Revision the edits were made against; the patch is rejected if the project has changed since. None skips the check
+    base_revision: Optional[int] = None
+    edits: List[PickEdit]
+
+
 class Grid(BaseModel):
     name: str
     data: list
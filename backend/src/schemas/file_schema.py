@@ -13,6 +13,7 @@ class FileBase(BaseModel):
     mime_type: str
     file_extension: str
     project_id: Optional[str] = None
+    content_hash: Optional[str] = None
     
     class Config:
         from_attributes = True
@@ -1,4 +1,5 @@
 import datetime
+import json
 from typing import Optional, List
 
 from pydantic import BaseModel
@@ -12,6 +13,13 @@ from utils.custom_types.LengthUnit import LengthUnit
 from utils.custom_types.AsceVersion import AsceVersion
 
 
+# Fields stored as JSON columns (picks as a child table) and exchanged as JSON text
+JSON_FIELDS = ['geometry', 'record_options', 'plot_limits', 'freq', 'slow', 'picks', 'disper_settings']
+# Fields of the project list's summary view
+SUMMARY_FIELDS = ['id', 'name', 'status', 'priority', 'survey_date', 'received_date', 'display_units', 'asce_version',
+                  'client_id']
+
+
 class ProjectBase(BaseModel):
     name: str
     status: Optional[ProjectStatus] = None
@@ -45,11 +53,18 @@ class Project(ProjectBase):
         project_data = {}
         
         # Add all fields from ProjectBase
-        for field in ['name', 'status', 'priority', 'survey_date', 'received_date', 
-                      'geometry', 'record_options', 'plot_limits', 'freq', 'slow', 
-                      'picks', 'disper_settings', 'display_units', 'asce_version', 'client_id']:
+        for field in ['name', 'status', 'priority', 'survey_date', 'received_date', 'display_units', 'asce_version',
+                      'client_id']:
             if hasattr(db_project, field):
                 project_data[field] = getattr(db_project, field)
+
+        # Structured fields are stored natively but keep their JSON text form in the API
+        for field in JSON_FIELDS:
+            if hasattr(db_project, field):
+                value = getattr(db_project, field)
+                if field == 'picks':
+                    value = [pick.to_dict() for pick in value]
+                project_data[field] = json.dumps(value) if value is not None else None
         
         # Add id
         project_data['id'] = db_project.id
@@ -75,6 +90,14 @@ class Project(ProjectBase):
         
         return cls(**project_data)
 
+    @classmethod
+    def summary_from_db(cls, db_project):
+        """Like from_db, but only the SUMMARY_FIELDS and the client, so the project's data and files aren't loaded."""
+        project_data = {field: getattr(db_project, field) for field in SUMMARY_FIELDS}
+        if db_project.client:
+            project_data['client'] = Client.model_validate(db_project.client, from_attributes=True)
+        return cls(**project_data)
+
 
 class ProjectCreate(ProjectBase):
     id: Optional[str] = None
@@ -0,0 +1,42 @@
+from typing import List, Optional, Union
+
+from pydantic import BaseModel
+
+
+class SectionVariant(BaseModel):
+    """
+    Styling for one figure of a 2D section. Field names and defaults match the /process/2d-s form fields.
+    """
+    name: Optional[str] = None
+    unit: Optional[str] = None  # "m" or "ft", None keeps the unit the section was built in
+    title: Optional[str] = None
+    x_label: Optional[str] = None
+    y_label: Optional[str] = None
+    cbar_label: Optional[str] = None
+    vel_min: Optional[float] = None
+    vel_max: Optional[float] = None
+    contours: Optional[Union[int, List[float], str]] = None
+    enable_colorbar: bool = True
+    invert_colorbar_axis: bool = False
+    label_pad_size: float = -58
+    cbar_pad_size: float = 0.10
+    cbar_ticks: Optional[List[float]] = None
+    contour_color: str = "k"
+    contour_width: float = 0.8
+    cbar_fraction: float = 0.05
+    cbar_orientation: str = "vertical"
+    aspect_ratio: Optional[str] = None
+    aboveground_color: str = "w"
+    aboveground_border_color: Optional[str] = None
+    shift_elevation: bool = False
+    elevation_tick_increment: float = 50
+    tick_right: bool = False
+    tick_left: bool = True
+    tick_top: bool = True
+    tick_bottom: bool = False
+    ticklabel_right: bool = False
+    ticklabel_left: bool = True
+    ticklabel_top: bool = True
+    ticklabel_bottom: bool = False
+    x_axis_label_pos: str = "top"
+    y_axis_label_pos: str = "left"
@@ -12,6 +12,7 @@ class SgyFileBase(BaseModel):
     upload_date: datetime = None
     type: str
     project_id: Optional[str] = None
+    content_hash: Optional[str] = None
     
     class Config:
         from_attributes = True
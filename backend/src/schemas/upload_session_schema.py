@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class UploadSessionCreate(BaseModel):
+    original_name: str
+    size: int
+    checksum: Optional[str] = None  # sha256 hex digest of the whole file, verified on finalize
+
+
+class UploadSession(BaseModel):
+    id: str
+    project_id: str
+    original_name: str
+    size: int
+    offset: int
+    checksum: Optional[str] = None
+    created_date: Optional[datetime] = None
+    updated_date: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,143 @@
+"""
+Prebuilt zip bundles of a project's SEG-Y records.
+
+A bundle is stored as ArchiveBundles/{project_id}/{key}.zip, where the key hashes the project's record set (ids,
+names and content hashes), so a bundle can only ever be served for exactly the records it was built from. Uploads
+and deletes drop a project's bundles and schedule a rebuild once the project has been quiet for
+ARCHIVE_BUNDLE_DELAY_SECONDS, so a burst of uploads builds one bundle rather than one per file.
+
+Projects whose records were moved to compressed storage (see utils.archive_storage) get no bundle: it would keep an
+uncompressed copy of records that are rarely downloaded anymore, so their zips are streamed from the frames instead.
+"""
+import asyncio
+import logging
+import os
+import shutil
+from typing import List, Optional, Sequence, Tuple
+
+from config import settings
+from crud.sgy_file_crud import get_sgy_files_info_by_project
+from database import SessionLocal
+from models.sgy_file_model import SgyFileDBModel
+from utils.frame_compression import is_compressed
+from utils.render_cache import hash_inputs
+from utils.streaming_utils import StreamingZip
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BUNDLES_DIR = os.path.join(settings.MQ_SAVE_DIR, "ArchiveBundles")
+# Upper bound on records fetched for one project's bundle
+MAX_BUNDLE_RECORDS = 100000
+
+# Pending rebuild per project, replaced whenever the project changes again before it runs
+_pending_builds: dict[str, asyncio.Task] = {}
+
+
+def records_to_zip(sgy_files: Sequence[SgyFileDBModel]) -> List[Tuple[str, str]]:
+    """(path, archive name) pairs for the records that exist on disk."""
+    files_to_zip = []
+    for sgy_file in sgy_files:
+        if os.path.exists(sgy_file.path):
+            files_to_zip.append((sgy_file.path, sgy_file.original_name))
+        else:
+            logger.warning(f"File not found on disk: {sgy_file.path}")
+    return files_to_zip
+
+
+def bundle_key(sgy_files: Sequence[SgyFileDBModel]) -> str:
+    """
+    Key identifying a record set. Records without a content hash (stored before hashing existed) fall back to their
+    path, size and modification time.
+    """
+    parts = []
+    for sgy_file in sorted(sgy_files, key=lambda f: f.id):
+        version = sgy_file.content_hash
+        if not version:
+            try:
+                stat = os.stat(sgy_file.path)
+                version = f"{sgy_file.path}:{stat.st_size}:{stat.st_mtime_ns}"
+            except OSError:
+                version = "missing"
+        parts.append((sgy_file.id, sgy_file.original_name, version))
+    return hash_inputs(*parts)
+
+
+def bundle_path(project_id: str, key: str) -> str:
+    return os.path.join(ARCHIVE_BUNDLES_DIR, project_id, f"{key}.zip")
+
+
+def get_bundle(project_id: str, sgy_files: Sequence[SgyFileDBModel]) -> Optional[Tuple[str, str]]:
+    """
+    :return: Tuple of (bundle path, key) if a bundle for exactly these records exists, otherwise None.
+    """
+    key = bundle_key(sgy_files)
+    path = bundle_path(project_id, key)
+    return (path, key) if os.path.exists(path) else None
+
+
+def invalidate_bundles(project_id: str):
+    """Delete a project's bundles. Keys already keep stale bundles from being served; this frees the disk."""
+    project_dir = os.path.join(ARCHIVE_BUNDLES_DIR, project_id)
+    if os.path.isdir(project_dir):
+        shutil.rmtree(project_dir, ignore_errors=True)
+
+
+def build_bundle(project_id: str) -> Optional[str]:
+    """
+    Build the bundle for a project's current records, replacing any older ones.
+
+    :return: Path of the bundle, or None if the project has no records on disk or has compressed records.
+    """
+    with SessionLocal() as db:
+        sgy_files = get_sgy_files_info_by_project(db, project_id, limit=MAX_BUNDLE_RECORDS)
+    files_to_zip = records_to_zip(sgy_files)
+    if not files_to_zip or any(is_compressed(sgy_file.path) for sgy_file in sgy_files):
+        invalidate_bundles(project_id)
+        return None
+
+    path = bundle_path(project_id, bundle_key(sgy_files))
+    if os.path.exists(path):
+        return path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    try:
+        StreamingZip(files_to_zip).write_zip(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    # Drop bundles of earlier record sets
+    for name in os.listdir(os.path.dirname(path)):
+        old_path = os.path.join(os.path.dirname(path), name)
+        if old_path != path and name.endswith(".zip"):
+            os.remove(old_path)
+    logger.info(f"Built archive bundle for project {project_id}: {path}")
+    return path
+
+
+async def _build_after_delay(project_id: str, delay: float):
+    await asyncio.sleep(delay)
+    try:
+        await asyncio.to_thread(build_bundle, project_id)
+    except Exception as e:
+        logger.error(f"Error building archive bundle for project {project_id}: {e}")
+    finally:
+        if _pending_builds.get(project_id) is asyncio.current_task():
+            del _pending_builds[project_id]
+
+
+def schedule_bundle_build(project_id: str):
+    """
+    Drop a project's bundles and rebuild them once the project has had no changes for ARCHIVE_BUNDLE_DELAY_SECONDS.
+    Must be called from the event loop.
+    """
+    invalidate_bundles(project_id)
+    if settings.ARCHIVE_BUNDLE_DELAY_SECONDS < 0:
+        return
+    pending = _pending_builds.get(project_id)
+    if pending is not None:
+        pending.cancel()
+    _pending_builds[project_id] = asyncio.create_task(
+        _build_after_delay(project_id, settings.ARCHIVE_BUNDLE_DELAY_SECONDS)
+    )
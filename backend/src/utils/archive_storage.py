@@ -0,0 +1,222 @@
+"""
+Compressed storage tier for SEG-Y records of completed projects.
+
+Once a project is completed its records are rarely read, so a background job rewrites each one in the seekable framed
+format from utils.frame_compression (SGYFiles/{project_id}/{file_id}.sgy -> {file_id}.sgy.tfrz) and points the row at
+the compressed file. Reads stay transparent: downloads stream decompressed byte ranges straight from the frames, and
+code that needs a real file on disk (segyio) gets a decompressed copy from a size-bounded cache.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from crud.sgy_file_crud import get_sgy_files_info_by_project_status, update_sgy_file_path
+from database import SessionLocal
+from models.sgy_file_model import SgyFileDBModel
+from utils.blob_store import hash_file, release_blob
+from utils.custom_types.ProjectStatus import ProjectStatus
+from utils.frame_compression import (
+    COMPRESSED_SUFFIX,
+    DEFAULT_FRAME_SIZE,
+    FrameReader,
+    compress_file,
+    decompress_file,
+    is_compressed,
+    iter_frame_range,
+)
+
+logger = logging.getLogger(__name__)
+
+# Decompressed copies of archived records for readers that need a plain file
+DECOMPRESSED_CACHE_DIR = os.path.join(settings.MQ_SAVE_DIR, "DecompressedCache")
+
+# Only one compression pass at a time, whether started by the schedule or by an admin
+_compression_lock = threading.Lock()
+
+
+def record_size(path: str) -> int:
+    """Size of a record's original (decompressed) contents."""
+    if is_compressed(path):
+        with FrameReader(path) as reader:
+            return reader.size
+    return os.path.getsize(path)
+
+
+def iter_record(
+    path: str, start: int = 0, end: Optional[int] = None, chunk_size: int = DEFAULT_FRAME_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield a record's original bytes [start, end), decompressing only the frames that range touches.
+
+    :param path: Record path, compressed or not.
+    :param start: First byte.
+    :param end: One past the last byte, None for the end of the file.
+    :param chunk_size: Bytes per yielded chunk.
+    """
+    if is_compressed(path):
+        yield from iter_frame_range(path, start, end, chunk_size)
+        return
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = (os.path.getsize(path) if end is None else end) - start
+        while remaining > 0 and (chunk := f.read(min(chunk_size, remaining))):
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _prune_decompressed_cache(keep: str):
+    budget = settings.DECOMPRESSED_CACHE_MB * 1024 * 1024
+    entries = []
+    for name in os.listdir(DECOMPRESSED_CACHE_DIR):
+        path = os.path.join(DECOMPRESSED_CACHE_DIR, name)
+        if path == keep or name.endswith(".tmp"):
+            continue
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries) + os.path.getsize(keep)
+    # Oldest first; cache hits touch their file so recently used copies survive
+    for _, size, path in sorted(entries):
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError as e:
+            logger.warning(f"Could not evict {path} from the decompressed cache: {e}")
+
+
+def local_record_path(path: str) -> str:
+    """
+    Path to a plain, uncompressed copy of a record, for readers that need a real SEG-Y file.
+
+    Uncompressed records are returned as is. Compressed ones are decompressed into DECOMPRESSED_CACHE_DIR once and
+    reused until the cache outgrows DECOMPRESSED_CACHE_MB.
+
+    :param path: Record path, compressed or not.
+    """
+    if not is_compressed(path):
+        return path
+    project_dir = os.path.basename(os.path.dirname(path))
+    record_name = os.path.basename(path)[:-len(COMPRESSED_SUFFIX)]
+    cached_path = os.path.join(DECOMPRESSED_CACHE_DIR, f"{project_dir}_{record_name}")
+    if os.path.exists(cached_path) and os.path.getmtime(cached_path) >= os.path.getmtime(path):
+        os.utime(cached_path)
+        return cached_path
+
+    os.makedirs(DECOMPRESSED_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cached_path}.{threading.get_ident()}.tmp"
+    try:
+        decompress_file(path, tmp_path)
+        os.replace(tmp_path, cached_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _prune_decompressed_cache(keep=cached_path)
+    return cached_path
+
+
+def compress_record(db: Session, sgy_file: SgyFileDBModel) -> Optional[tuple[int, int]]:
+    """
+    Move one record to compressed storage.
+
+    The compressed file is checked against the record's content hash before it replaces the original, the row is
+    pointed at it, and the record's blob reference is released (the compressed file is not part of the blob store).
+
+    :param db: DB session.
+    :param sgy_file: Record to compress.
+    :return: Tuple of (original size, compressed size), or None if there was nothing to compress.
+    """
+    src_path = sgy_file.path
+    if is_compressed(src_path) or not os.path.exists(src_path):
+        return None
+
+    expected_hash = sgy_file.content_hash or hash_file(src_path)[0]
+    dst_path = src_path + COMPRESSED_SUFFIX
+    tmp_path = dst_path + ".tmp"
+    try:
+        compressed_size = compress_file(src_path, tmp_path)
+        digest = hashlib.sha256()
+        for chunk in iter_frame_range(tmp_path):
+            digest.update(chunk)
+        if digest.hexdigest() != expected_hash:
+            raise ValueError(f"Compressed copy of {src_path} does not match its content hash")
+        os.replace(tmp_path, dst_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    original_size = os.path.getsize(src_path)
+    update_sgy_file_path(db, sgy_file.id, dst_path)
+    os.remove(src_path)
+    release_blob(db, sgy_file.content_hash)
+    logger.info(f"Compressed {src_path}: {original_size} -> {compressed_size} bytes")
+    return original_size, compressed_size
+
+
+def compress_completed_projects(db: Session) -> dict:
+    """
+    Compress every uncompressed record of a completed project, and drop the archive bundles of the projects that
+    had records compressed.
+
+    :param db: DB session.
+    :return: Summary with the number of records compressed and failed, and the bytes before and after.
+    """
+    # archive_bundles zips records through streaming_utils, which reads compressed records with this module
+    from utils.archive_bundles import invalidate_bundles
+
+    summary = {"compressed": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    compressed_projects = set()
+    for sgy_file in get_sgy_files_info_by_project_status(db, ProjectStatus.completed, exclude_suffix=COMPRESSED_SUFFIX):
+        try:
+            result = compress_record(db, sgy_file)
+        except Exception as e:
+            logger.error(f"Error compressing record {sgy_file.id}: {e}")
+            db.rollback()
+            summary["failed"] += 1
+            continue
+        if result is not None:
+            compressed_projects.add(sgy_file.project_id)
+            summary["compressed"] += 1
+            summary["bytes_before"] += result[0]
+            summary["bytes_after"] += result[1]
+    for project_id in compressed_projects:
+        invalidate_bundles(project_id)
+    return summary
+
+
+def run_compression_job() -> Optional[dict]:
+    """
+    Run one compression pass with its own DB session. Returns None without doing anything if a pass is already
+    running.
+    """
+    if not _compression_lock.acquire(blocking=False):
+        logger.info("Archive compression already running, skipping")
+        return None
+    try:
+        with SessionLocal() as db:
+            summary = compress_completed_projects(db)
+        logger.info(f"Archive compression finished: {summary}")
+        return summary
+    finally:
+        _compression_lock.release()
+
+
+async def archive_compression_loop(interval_hours: float):
+    """
+    Run the compression job every interval_hours, off the event loop. Started from the app lifespan.
+    """
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            await asyncio.to_thread(run_compression_job)
+        except Exception as e:
+            logger.error(f"Archive compression failed: {e}")
@@ -8,13 +8,15 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from starlette import status
 from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import bcrypt
 if not hasattr(bcrypt, '__about__'):
     ## Fix issue with passlib depending on about, which was removed in 4.2
     bcrypt.__about__ = type('about', (object,), {'__version__': bcrypt.__version__})
 
-from database import get_db
+from crud.aio import user_crud as async_user_crud
+from database import get_async_db
 from models.user_model import UserDBModel
 from schemas.user_schema import User as UserSchema
 from config import settings
@@ -45,9 +47,9 @@ def decode_jwt(token, secret=SECRET_KEY, algorithms=None) -> dict:
     return jwt.decode(token, secret, algorithms)
 
 
-def get_current_user(
+async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> UserSchema:
     # Read the token data
     try:
@@ -59,7 +61,7 @@ def get_current_user(
         ) from e
 
     # Get the user from the database
-    user = db.query(UserDBModel).filter(UserDBModel.id == payload.get("id")).first()
+    user = await async_user_crud.get_user_by_id(db, payload.get("id"))
 
     # Check if the user exists
     if not user:
@@ -0,0 +1,250 @@
+"""
+Content-addressed, deduplicated file storage.
+
+File bodies are stored once under MQ_SAVE_DIR/Blobs/<first 2 hex chars>/<sha256>, with a BlobDBModel row counting
+the file rows that use it. Each file row keeps its own path (e.g. SGYFiles/{project_id}/{file_id}.sgy) as a hard link
+to the blob, so code that reads, globs or downloads those paths keeps working while the data is on disk once.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Sequence, Tuple, TypeVar
+
+import aiofiles
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+
+from config import settings
+from crud.blob_crud import change_blob_ref_count, create_blob, delete_blob, get_blob
+from utils.utils import CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BLOB_DIR = os.path.join(settings.MQ_SAVE_DIR, "Blobs")
+# Incoming data is staged next to the blobs so moving it into place is a rename
+BLOB_TMP_DIR = os.path.join(BLOB_DIR, "tmp")
+
+
+def blob_path(content_hash: str) -> str:
+    return os.path.join(BLOB_DIR, content_hash[:2], content_hash)
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """
+    :param path: File to hash.
+    :return: Tuple of (sha256 hex digest, size in bytes).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _link(src: str, dst: str):
+    if os.path.lexists(dst):
+        os.remove(dst)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        # Different filesystem or no hard link support, fall back to a plain copy
+        logger.warning(f"Could not hard link {dst} to blob, copying instead: {e}")
+        shutil.copyfile(src, dst)
+
+
+def _commit_blob(db: Session, src_path: str, content_hash: str, size: int, link_path: str, commit: bool = True):
+    """
+    Move data with a known hash into the store (or drop it if the blob already exists), link it at link_path and
+    take a reference. With commit=False the blob row changes are only flushed.
+    """
+    final_path = blob_path(content_hash)
+    db_blob = get_blob(db, content_hash)
+    if db_blob is None or not os.path.exists(final_path):
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(src_path, final_path)
+        if db_blob is None:
+            create_blob(db, content_hash=content_hash, path=final_path, size=size, commit=commit)
+    else:
+        logger.info(f"Blob {content_hash} already stored, deduplicating {link_path}")
+        os.remove(src_path)
+    _link(final_path, link_path)
+    change_blob_ref_count(db, content_hash, 1, commit=commit)
+
+
+@dataclass
+class StagedFile:
+    """Upload data written to the blob store's staging dir, not yet in the store or the DB."""
+    tmp_path: str
+    content_hash: str
+    size: int
+    # First bytes of the upload, when requested from stage_upload
+    header: bytes = b""
+
+
+async def stage_upload(upload_file: UploadFile, header_size: int = 0) -> StagedFile:
+    """
+    Stream an upload into the staging dir, hashing it on the way. Touches no DB state, so several uploads can be
+    staged before a single transaction commits them all (see `commit_staged`).
+
+    :param upload_file: Upload to stage. Read from its current position.
+    :param header_size: Number of leading bytes to keep on the result, e.g. for parsing file headers.
+    """
+    os.makedirs(BLOB_TMP_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=BLOB_TMP_DIR)
+    os.close(fd)
+    digest = hashlib.sha256()
+    size = 0
+    header = b""
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            while chunk := await upload_file.read(CHUNK_SIZE):
+                if len(header) < header_size:
+                    header += chunk[:header_size - len(header)]
+                size += len(chunk)
+                # hashlib releases the GIL on large buffers, so hashing overlaps with the write
+                await asyncio.gather(f.write(chunk), asyncio.to_thread(digest.update, chunk))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return StagedFile(tmp_path, digest.hexdigest(), size, header)
+
+
+async def stage_uploads(
+    upload_files: Sequence[UploadFile], header_size: int = 0, concurrency: int | None = None
+) -> List[StagedFile]:
+    """
+    Stage several uploads concurrently, with at most `concurrency` of them being written at a time. If any upload
+    fails, the others are cancelled and everything staged so far is removed before the error is raised.
+
+    :param upload_files: Uploads to stage.
+    :param header_size: See `stage_upload`.
+    :param concurrency: Maximum uploads in flight. Defaults to UPLOAD_CONCURRENCY.
+    :return: The staged files, in the order of upload_files.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or settings.UPLOAD_CONCURRENCY))
+
+    async def stage_one(upload_file: UploadFile) -> StagedFile:
+        async with semaphore:
+            return await stage_upload(upload_file, header_size)
+
+    tasks = [asyncio.create_task(stage_one(upload_file)) for upload_file in upload_files]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, StagedFile) and os.path.exists(result.tmp_path):
+                os.remove(result.tmp_path)
+        raise
+
+
+def commit_staged(db: Session, staged: StagedFile, link_path: str):
+    """
+    Move a staged upload into the store and link it at link_path. Blob rows are flushed but not committed; the
+    caller commits (or rolls back and calls `discard_staged`).
+    """
+    _commit_blob(db, staged.tmp_path, staged.content_hash, staged.size, link_path, commit=False)
+
+
+def discard_staged(db: Session, staged_files: Iterable[StagedFile], link_paths: Iterable[str] = ()):
+    """
+    Clean up after a batch of staged uploads failed. Call after rolling back: removes leftover staging files, the
+    links made for the batch, and blobs the rolled back transaction had created.
+
+    :param db: DB session, already rolled back.
+    :param staged_files: Uploads of the batch.
+    :param link_paths: Paths the batch linked blobs at.
+    """
+    for path in link_paths:
+        if os.path.lexists(path):
+            os.remove(path)
+    for staged in staged_files:
+        if os.path.exists(staged.tmp_path):
+            os.remove(staged.tmp_path)
+        elif get_blob(db, staged.content_hash) is None and os.path.exists(blob_path(staged.content_hash)):
+            os.remove(blob_path(staged.content_hash))
+
+
+def commit_staged_batch(db: Session, staged: List[Tuple[StagedFile, str]], write_rows: Callable[[], T]) -> T:
+    """
+    Commit a batch of staged uploads and the rows that use them in one transaction, all or nothing.
+
+    :param db: DB session.
+    :param staged: (staged upload, link path) pairs.
+    :param write_rows: Adds the batch's rows to the session without committing; its return value is passed back.
+    :return: The result of write_rows.
+    """
+    try:
+        for staged_file, link_path in staged:
+            commit_staged(db, staged_file, link_path)
+        result = write_rows()
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        discard_staged(db, [staged_file for staged_file, _ in staged], [link_path for _, link_path in staged])
+        raise
+
+
+def adopt_file(db: Session, path: str, content_hash: str | None = None) -> Tuple[str, int]:
+    """
+    Move an existing file into the blob store and leave a link in its place. Duplicate content is dropped in favor
+    of the blob that already exists.
+
+    :param db: DB session.
+    :param path: File to adopt.
+    :param content_hash: sha256 of the file if already known, otherwise it is computed.
+    :return: Tuple of (content hash, size).
+    """
+    if content_hash is None:
+        content_hash, size = hash_file(path)
+    else:
+        size = os.path.getsize(path)
+    _commit_blob(db, path, content_hash, size, path)
+    return content_hash, size
+
+
+def release_blob(db: Session, content_hash: str | None):
+    """
+    Drop a reference to a blob, deleting it once nothing uses it. Callers remove their own link separately.
+
+    :param db: DB session.
+    :param content_hash: Hash of the blob. None (files stored before the blob store existed) is ignored.
+    """
+    if not content_hash:
+        return
+    change_blob_ref_count(db, content_hash, -1)
+    delete_unreferenced_blob(db, content_hash)
+
+
+def delete_unreferenced_blob(db: Session, content_hash: str | None):
+    """
+    Delete a blob if nothing references it any more, e.g. after its file row was deleted (the row CRUD releases the
+    reference itself, see crud.blob_crud.release_row_blob_refs).
+
+    :param db: DB session.
+    :param content_hash: Hash of the blob. None is ignored.
+    """
+    if not content_hash:
+        return
+    db_blob = get_blob(db, content_hash)
+    if db_blob is not None and db_blob.ref_count <= 0:
+        try:
+            if os.path.exists(db_blob.path):
+                os.remove(db_blob.path)
+        except OSError as e:
+            logger.error(f"Error deleting blob {content_hash}: {e}")
+            return
+        delete_blob(db, content_hash)
+        logger.info(f"Deleted unreferenced blob {content_hash}")
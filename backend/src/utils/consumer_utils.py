@@ -6,6 +6,9 @@ import zipfile
 from datetime import datetime
 from os import PathLike
 
+from config import settings
+from utils.zip_stream import file_entry, write_zip
+
 logger = logging.getLogger("utils.consumer_utils")
 
 
@@ -123,23 +126,12 @@ def make_for_processor_zip(
     # Create the zip file
     zip_path = os.path.join(processor_zip_dir, f"{zip_uuid}.zip")
     try:
-        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
-            for sgy_file_path in sgy_paths:
-                zip_file.write(
-                    sgy_file_path,
-                    os.path.join("Save", os.path.basename(sgy_file_path))
-                )
-            # Add user.cfg and for_processor.txt
-            user_cfg_path = os.path.join(unzipped_dir, "user.cfg")
-            zip_file.write(
-                user_cfg_path,
-                os.path.basename(user_cfg_path)
-            )
-            for_processor_path = os.path.join(unzipped_dir, "for_processor.txt")
-            zip_file.write(
-                for_processor_path,
-                os.path.basename(for_processor_path)
-            )
+        # SEG-Y barely deflates, so each file's compression is picked from a sample of its data
+        entries = [file_entry(sgy_file_path, f"Save/{os.path.basename(sgy_file_path)}") for sgy_file_path in sgy_paths]
+        # Add user.cfg and for_processor.txt
+        for extra_file in ("user.cfg", "for_processor.txt"):
+            entries.append(file_entry(os.path.join(unzipped_dir, extra_file), extra_file))
+        write_zip(zip_path, entries, workers=settings.ZIP_COMPRESSION_THREADS)
         logger.info(f"SGY files zipped successfully at {zip_path}")
     except Exception as e:
         logger.error(f"Failed to create zip file {zip_path}: {e}")
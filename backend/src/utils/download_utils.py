@@ -0,0 +1,153 @@
+"""
+File download responses with strong ETags, conditional requests and byte ranges.
+
+Plain files are served with FileResponse, which handles Range/If-Range itself and hands the file to the server
+(http.response.pathsend) when it supports it, so the bytes never pass through Python. Archived (compressed) records
+can't be sent as-is; their ranges are decompressed from the frame index and streamed.
+
+With DOWNLOAD_ACCEL_REDIRECT_PREFIX set, plain files are instead handed to nginx with an X-Accel-Redirect header and
+the app only does the auth check and lookup.
+"""
+import os
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from starlette.exceptions import HTTPException
+
+from config import settings
+from utils.archive_storage import is_compressed, iter_record, record_size
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def content_etag(content_hash: Optional[str]) -> Optional[str]:
+    """Strong ETag for a file's contents, or None if the hash isn't known."""
+    return f'"{content_hash}"' if content_hash else None
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Check If-None-Match against an ETag, ignoring weak prefixes as RFC 9110 requires for this header."""
+    if_none_match = request.headers.get("if-none-match")
+    if etag is None or if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single range Range header.
+
+    :param range_header: Value of the Range header.
+    :param size: Size of the full content.
+    :return: Tuple of (start, end) with end exclusive, or None to send the whole content (no header, multiple
+        ranges or a syntax the server is allowed to ignore).
+    :raises HTTPException: 416 if the range lies outside the content.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_RE.match(range_header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        end = min(int(last) + 1, size) if last else size
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def accel_redirect_response(
+    path: str, filename: str, media_type: str, etag: Optional[str] = None
+) -> Optional[Response]:
+    """
+    Hand a file under MQ_SAVE_DIR to nginx's internal download location.
+
+    nginx serves the file itself, including Range requests, with the headers set here.
+
+    :param path: File on disk.
+    :param filename: Name to download the file as.
+    :param media_type: Content type.
+    :param etag: ETag to send, if any.
+    :return: The redirect response, or None if offloading is disabled or the file is outside MQ_SAVE_DIR.
+    """
+    prefix = settings.DOWNLOAD_ACCEL_REDIRECT_PREFIX
+    if not prefix:
+        return None
+    data_dir = os.path.realpath(settings.MQ_SAVE_DIR)
+    real_path = os.path.realpath(path)
+    if os.path.commonpath([data_dir, real_path]) != data_dir:
+        return None
+    relative_path = os.path.relpath(real_path, data_dir).replace(os.sep, "/")
+    headers = {
+        "X-Accel-Redirect": quote(prefix.rstrip("/") + "/" + relative_path),
+        "Content-Disposition": _content_disposition(filename),
+    }
+    if etag:
+        headers["ETag"] = etag
+    return Response(media_type=media_type, headers=headers)
+
+
+def file_download_response(
+    request: Request,
+    path: str,
+    filename: str,
+    content_hash: Optional[str] = None,
+    media_type: Optional[str] = None,
+) -> Response:
+    """
+    Build the response for a file download.
+
+    :param request: Incoming request, for its conditional and Range headers.
+    :param path: File on disk, compressed records included.
+    :param filename: Name to download the file as.
+    :param content_hash: sha256 of the file's (decompressed) contents, used as its ETag.
+    :param media_type: Content type. Defaults to application/octet-stream.
+    """
+    media_type = media_type or "application/octet-stream"
+    etag = content_etag(content_hash)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    if not is_compressed(path):
+        accel_response = accel_redirect_response(path, filename, media_type, etag)
+        if accel_response is not None:
+            return accel_response
+        # Without a content hash FileResponse falls back to its own mtime/size ETag
+        return FileResponse(path, filename=filename, media_type=media_type, headers={"ETag": etag} if etag else None)
+
+    size = record_size(path)
+    headers = {"Accept-Ranges": "bytes", "Content-Disposition": _content_disposition(filename)}
+    if etag:
+        headers["ETag"] = etag
+    if_range = request.headers.get("if-range")
+    byte_range = None
+    if if_range is None or (etag is not None and if_range == etag):
+        byte_range = parse_range(request.headers.get("range"), size)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_record(path), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Length"] = str(end - start)
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    return StreamingResponse(iter_record(path, start, end), status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,175 @@
+"""
+Seekable framed compression for files at rest.
+
+The file is split into fixed size frames that are zlib compressed independently, followed by an index of where each
+frame starts. Any byte range can be read by decompressing only the frames it touches, so random trace access into an
+archived SEG-Y file stays cheap.
+
+Layout::
+
+    header   MAGIC (8) | frame size u32 | reserved u32
+    frames   zlib streams, one per frame
+    index    per frame: compressed offset u64 | compressed length u32
+    footer   uncompressed size u64 | frame count u32 | index offset u64 | MAGIC (8)
+"""
+import io
+import os
+import struct
+import zlib
+from typing import Iterator, Optional
+
+MAGIC = b"TFRZ\x00\x01\x00\x00"
+DEFAULT_FRAME_SIZE = 1024 * 1024
+DEFAULT_LEVEL = 6
+# Suffix of framed files written next to (and in place of) the original file
+COMPRESSED_SUFFIX = ".tfrz"
+
+_HEADER = struct.Struct("<8sII")
+_INDEX_ENTRY = struct.Struct("<QI")
+_FOOTER = struct.Struct("<QIQ8s")
+
+
+def is_compressed(path: str) -> bool:
+    return path.endswith(COMPRESSED_SUFFIX)
+
+
+def compress_file(
+    src_path: str, dst_path: str, frame_size: int = DEFAULT_FRAME_SIZE, level: int = DEFAULT_LEVEL
+) -> int:
+    """
+    Compress a file into the framed format.
+
+    :param src_path: File to compress.
+    :param dst_path: Output path.
+    :param frame_size: Uncompressed bytes per frame. Smaller frames make random reads cheaper but compress worse.
+    :param level: zlib compression level.
+    :return: Size of the compressed file in bytes.
+    """
+    index = []
+    total_size = 0
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        dst.write(_HEADER.pack(MAGIC, frame_size, 0))
+        while frame := src.read(frame_size):
+            compressed = zlib.compress(frame, level)
+            index.append((dst.tell(), len(compressed)))
+            dst.write(compressed)
+            total_size += len(frame)
+        index_offset = dst.tell()
+        for offset, length in index:
+            dst.write(_INDEX_ENTRY.pack(offset, length))
+        dst.write(_FOOTER.pack(total_size, len(index), index_offset, MAGIC))
+        return dst.tell()
+
+
+def is_frame_compressed(path: str) -> bool:
+    """Check for the framed format's magic bytes."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class FrameReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a framed compressed file. Reads decompress only the frames they touch, and
+    the most recent frame is kept so sequential small reads don't decompress it again.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._file = open(path, "rb")
+        try:
+            magic, self.frame_size, _ = _HEADER.unpack(self._file.read(_HEADER.size))
+            self._file.seek(-_FOOTER.size, os.SEEK_END)
+            self.size, frame_count, index_offset, footer_magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+            if magic != MAGIC or footer_magic != MAGIC:
+                raise ValueError(f"{path} is not a frame compressed file")
+            self._file.seek(index_offset)
+            index_bytes = self._file.read(frame_count * _INDEX_ENTRY.size)
+            self._index = list(_INDEX_ENTRY.iter_unpack(index_bytes))
+        except Exception:
+            self._file.close()
+            raise
+        self._pos = 0
+        self._cached_frame = -1
+        self._cached_data = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def _frame(self, frame_number: int) -> bytes:
+        if frame_number != self._cached_frame:
+            offset, length = self._index[frame_number]
+            self._file.seek(offset)
+            self._cached_data = zlib.decompress(self._file.read(length))
+            self._cached_frame = frame_number
+        return self._cached_data
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        written = 0
+        while written < len(view) and self._pos < self.size:
+            frame_number, frame_offset = divmod(self._pos, self.frame_size)
+            frame = self._frame(frame_number)
+            n = min(len(view) - written, len(frame) - frame_offset)
+            view[written:written + n] = frame[frame_offset:frame_offset + n]
+            written += n
+            self._pos += n
+        return written
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+            self._cached_data = b""
+        super().close()
+
+
+def iter_frame_range(
+    path: str, start: int = 0, end: Optional[int] = None, chunk_size: int = DEFAULT_FRAME_SIZE
+) -> Iterator[bytes]:
+    """
+    Yield the decompressed bytes [start, end) of a framed file.
+
+    :param path: Framed compressed file.
+    :param start: First byte.
+    :param end: One past the last byte, None for the end of the file.
+    :param chunk_size: Bytes per yielded chunk.
+    """
+    with FrameReader(path) as reader:
+        end = reader.size if end is None else min(end, reader.size)
+        reader.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = reader.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def decompress_file(src_path: str, dst_path: str):
+    """Write the decompressed contents of a framed file to dst_path."""
+    with open(dst_path, "wb") as dst:
+        for chunk in iter_frame_range(src_path):
+            dst.write(chunk)
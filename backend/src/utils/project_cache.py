@@ -0,0 +1,111 @@
+"""
+In-process cache of parsed project settings (disper settings, options and picks) for the project settings endpoints.
+
+Entries are keyed by project id and carry the revision they were read at. Every write in crud.project_crud
+invalidates the project's entry in the process that made it, and a read that raced with a write is not stored (see
+ProjectSettingsCache.put). The cache is per process, so writes from other processes (other API workers, the consumer,
+CLI tools) can't invalidate it: readers check an entry's revision against the DB before using it (see
+utils.project_utils.get_project_settings), which costs one single column query instead of the full load.
+"""
+import threading
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config import settings
+from utils.render_cache import LRUByteCache
+
+
+class ProjectSettingsCache:
+    def __init__(self, max_bytes: int):
+        self._cache = LRUByteCache(max_bytes, name="project_settings_cache")
+        # Bumped by every invalidation, so a load that started before a write can tell its data is stale
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str) -> Optional[dict]:
+        """Cached settings of a project. Shared between requests, so treat the result as read only."""
+        return self._cache.get(project_id)
+
+    def generation(self, project_id: str) -> int:
+        """Take before loading a project from the DB, and pass to put."""
+        with self._lock:
+            return self._generations[project_id]
+
+    def put(self, project_id: str, value: dict, nbytes: int, generation: int):
+        """Store a loaded project unless it was invalidated since `generation` was taken."""
+        with self._lock:
+            if self._generations[project_id] == generation:
+                self._cache.put(project_id, value, nbytes)
+
+    def invalidate(self, project_id: str):
+        with self._lock:
+            self._generations[project_id] += 1
+            self._cache.pop(project_id)
+
+    def clear(self):
+        with self._lock:
+            self._generations.clear()
+            self._cache.clear()
+
+
+class ProjectCountCache:
+    """
+    Totals of the project list, keyed by its filters. Creating, updating or deleting any project clears every entry,
+    since any total can change; a count that raced with one of those writes is not stored.
+    """
+
+    def __init__(self, max_entries: int):
+        # Entries are counted as one byte each, so the budget is a number of entries
+        self._cache = LRUByteCache(max_entries, name="project_count_cache")
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[int]:
+        return self._cache.get(key)
+
+    def generation(self) -> int:
+        """Take before counting, and pass to put."""
+        with self._lock:
+            return self._generation
+
+    def put(self, key: str, total: int, generation: int):
+        with self._lock:
+            if self._generation == generation:
+                self._cache.put(key, total, 1)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._cache.clear()
+
+
+project_settings_cache = ProjectSettingsCache(settings.PROJECT_SETTINGS_CACHE_MB * 1024 * 1024)
+project_count_cache = ProjectCountCache(1024)
+
+_PENDING_INVALIDATIONS = "pending_project_invalidations"
+
+
+def invalidate_on_commit(db: Session, project_ids: Iterable[str]):
+    """
+    Invalidate projects (and the project list totals) once the session's transaction commits. For writes made with
+    commit=False, where the caller commits later: invalidating before the commit would let a concurrent read cache the
+    old data again.
+    """
+    db.info.setdefault(_PENDING_INVALIDATIONS, set()).update(project_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    project_ids = session.info.pop(_PENDING_INVALIDATIONS, ())
+    for project_id in project_ids:
+        project_settings_cache.invalidate(project_id)
+    if project_ids:
+        project_count_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -1,9 +1,17 @@
+import json
 import logging
+from typing import Optional
 
+from fastapi import Request, Response
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from crud.aio import project_crud as async_project_crud
 from crud.project_crud import get_project, create_default_project
 from schemas.project_schema import Project
+from utils.download_utils import etag_matches
+from utils.project_cache import project_settings_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,3 +29,71 @@ def init_project(project_id: str, db: Session) -> Project:
         ret_project = Project.from_db(db_project)
     logger.info(f"Returning Project: {ret_project}")
     return ret_project
+
+
+async def init_project_fields(project_id: str, db: AsyncSession, *fields: str) -> Row:
+    """
+    Like init_project, but loads only the given columns.
+
+    :param fields: Column names.
+    """
+    row = await async_project_crud.get_project_fields(db, project_id, *fields)
+    if row is None:
+        await async_project_crud.create_default_project(db, project_id)
+        row = await async_project_crud.get_project_fields(db, project_id, *fields)
+    return row
+
+
+# Columns kept in the project settings cache, alongside the project's picks
+SETTINGS_FIELDS = ("id", "name", "revision", "disper_settings", "geometry", "record_options", "plot_limits")
+
+
+async def get_project_settings(project_id: str, db: AsyncSession) -> dict:
+    """
+    Settings of a project (SETTINGS_FIELDS plus "picks"), from the project settings cache when possible. Creates a
+    default project if it doesn't exist, like init_project. The result is shared, treat it as read only.
+
+    A cached entry is only used if its revision is still the project's revision in the DB, so writes made by other
+    processes (other API workers, the consumer, CLI tools) are never served stale.
+    """
+    project_settings = project_settings_cache.get(project_id)
+    if project_settings is not None:
+        if project_settings["revision"] == await async_project_crud.get_project_revision(db, project_id):
+            return project_settings
+        project_settings_cache.invalidate(project_id)
+
+    generation = project_settings_cache.generation(project_id)
+    row = await init_project_fields(project_id, db, *SETTINGS_FIELDS)
+    project_settings = dict(row._mapping)
+    project_settings["picks"] = await async_project_crud.get_project_picks(db, project_id)
+    project_settings_cache.put(project_id, project_settings, len(json.dumps(project_settings)), generation)
+    return project_settings
+
+
+def project_etag(revision: int) -> str:
+    """ETag of a project's data at a revision. The same for every project endpoint, since caches key by URL."""
+    return f'"r{revision}"'
+
+
+def set_project_etag(response: Response, revision: int):
+    """Tag a project response so browsers revalidate it with If-None-Match rather than refetching it."""
+    response.headers["ETag"] = project_etag(revision)
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+async def project_not_modified(request: Request, project_id: str, db: AsyncSession) -> Optional[Response]:
+    """
+    Answer a conditional GET for a project without loading it: the revision comes from a single column query. It is
+    never taken from the project settings cache, which can lag behind writes made by other processes.
+
+    :return: A 304 response if the client's If-None-Match covers the current revision, otherwise None.
+    """
+    if request.headers.get("if-none-match") is None:
+        return None
+    revision = await async_project_crud.get_project_revision(db, project_id)
+    if revision is None:
+        return None
+    etag = project_etag(revision)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    return None
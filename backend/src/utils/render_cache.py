@@ -0,0 +1,107 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LRUByteCache:
+    """
+    Thread safe least-recently-used cache bounded by the total size of its entries rather than their count.
+    """
+
+    def __init__(self, max_bytes: int, name: str = "cache"):
+        """
+        :param max_bytes: Byte budget. Entries are evicted oldest first once it is exceeded.
+        :param name: Name used in log messages.
+        """
+        self.max_bytes = max_bytes
+        self.name = name
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, nbytes: int) -> bool:
+        """
+        Add or replace an entry.
+
+        :param key: Cache key.
+        :param value: Value to store.
+        :param nbytes: Size of the value, counted against the byte budget.
+        :return: False if the value alone is larger than the budget and was not stored.
+        """
+        if nbytes > self.max_bytes:
+            logger.info(f"{self.name}: not caching {nbytes} byte entry, budget is {self.max_bytes} bytes")
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+        return True
+
+    def pop(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def hash_inputs(*parts: Any) -> str:
+    """
+    Build a stable cache key from request inputs.
+
+    Bytes are hashed as-is, everything else by its repr. Each part is length prefixed so adjacent parts can't run
+    together into the same key.
+
+    :param parts: Inputs the cached value depends on.
+    :return: Hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, (bytes, bytearray)) else repr(part).encode()
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+# Interpolated/smoothed section grids, keyed by model inputs and interpolation parameters.
+section_grid_cache = LRUByteCache(settings.RENDER_GRID_CACHE_MB * 1024 * 1024, name="section_grid_cache")
+
+# Finished figures, keyed by the grid key plus every styling parameter.
+section_png_cache = LRUByteCache(settings.RENDER_PNG_CACHE_MB * 1024 * 1024, name="section_png_cache")
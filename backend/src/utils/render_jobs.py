@@ -0,0 +1,172 @@
+"""
+Render jobs that run on the render pool. Everything here must be a picklable top level function that takes plain
+arguments (paths, numbers, arrays) and returns plain values, since it is called in a separate process.
+
+The 2D-S input readers and build_2ds_section run in the API process (in a thread), which caches the section grid
+and sends it to section_utils.render_section_png on the pool for each figure.
+"""
+import ast
+import io
+import logging
+import os
+import tempfile
+from typing import Callable, List, Optional, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+from tereancore.twodp_utils import plot_2dp_from_geoct
+from tereancore.utils import get_geom_func_from_excel, model_search_pattern
+from tereancore.VelocityModel import VelocityModel
+
+from utils.section_inputs import ElevationSource, ModelSource, SectionInputError, SectionInputs, scale_layers
+from utils.section_utils import FEET_PER_METER, SectionGrid, interpolate_2ds_section, velocity_model_layers
+from utils.utils import PROCESS_TMP_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def render_2dp_png(**plot_kwargs) -> bytes:
+    """
+    Render a 2D-P section from GeoCT model and travel time files.
+
+    :param plot_kwargs: Arguments for tereancore's plot_2dp_from_geoct. save_path and show_plot are forced off.
+    :return: PNG bytes.
+    """
+    plot_kwargs.update(save_path=None, show_plot=False)
+    _, img_buff = plot_2dp_from_geoct(**plot_kwargs)
+    try:
+        return img_buff.getvalue()
+    finally:
+        img_buff.close()
+        # Workers are long lived, don't let pyplot hold on to figures between jobs
+        plt.close("all")
+
+
+def render_vel_model_png(
+    model_path: str, to_meters_factor: float, units: str, save_path: str, pretty_model_path: Optional[str] = None
+) -> str:
+    """
+    Render a 1D velocity model plot to disk.
+
+    :param model_path: Path to the velocity model text file.
+    :param to_meters_factor: Conversion factor passed to VelocityModel.from_file.
+    :param units: Unit string for the plot labels ("m" or "ft").
+    :param save_path: Where to write the PNG.
+    :param pretty_model_path: Where to also write the model as a formatted text file, using the same parsed model.
+    :return: save_path.
+    """
+    ingested_model = VelocityModel.from_file(model_path, to_meters_factor=to_meters_factor)
+    if pretty_model_path is not None:
+        ingested_model.generate_pretty_model_file(pretty_model_path)
+    ingested_model.plot_vel_model(savefig=save_path, show_fig=False, units=units)
+    plt.close("all")
+    return save_path
+
+
+def read_velocity_models(sources: List[ModelSource], unit_override: Optional[str] = None) -> Tuple[list, str]:
+    """
+    Parse 1D model files named like tereancore's model_search_pattern (position and unit in the name).
+
+    :param sources: (file name, contents) of each model file. Files with names that don't match are skipped.
+    :param unit_override: "m" or "ft" to read every model in that unit instead of the one in its name.
+    :return: Tuple of (VelocityModels, unit they were read in).
+    :raises SectionInputError: If none of the files could be read.
+    """
+    ingested_velocity_models = []
+    unit_str = None
+    prev_units_str = None
+    for file_name, content in sources:
+        matches = model_search_pattern.search(file_name)
+        if matches is not None and len(matches.groups()) == 2:
+            position = ast.literal_eval(matches.group(1))
+            unit = matches.group(2).lower()
+            if unit_override is None:
+                if unit == "ft":
+                    to_meters_factor = FEET_PER_METER
+                    unit_str = "ft"
+                else:
+                    to_meters_factor = 1.0
+                    unit_str = "m"
+            else:
+                if unit_override == "ft":
+                    to_meters_factor = FEET_PER_METER
+                    unit_str = "ft"
+                else:
+                    to_meters_factor = 1.0
+                    unit_str = "m"
+            if (unit_str is not None
+                and prev_units_str is not None
+                and prev_units_str != unit):
+                logger.error("ERROR: Unit string changed between models!")
+            ingested_model = VelocityModel.from_file(
+                io.BytesIO(content),
+                position=position,
+                to_meters_factor=to_meters_factor,
+            )
+            ingested_velocity_models.append(ingested_model)
+        else:
+            logger.error(f"ERROR Reading file {file_name}")
+
+    if not ingested_velocity_models:
+        raise SectionInputError("No valid velocity model files found.")
+    return ingested_velocity_models, unit_str
+
+
+def read_elevation(elevation: Optional[ElevationSource]) -> Tuple[Optional[Callable], Optional[float]]:
+    """
+    Build the elevation function of a ground surface.
+
+    :param elevation: The surface, None for a flat one.
+    :return: Tuple of (elevation function, peak elevation), both None for a flat surface.
+    :raises SectionInputError: If the spreadsheet can't be parsed.
+    """
+    if elevation is None:
+        return None, None
+    if elevation.spreadsheet is None:
+        elevation_x, elevation_z = elevation.x, elevation.z
+        return (lambda x: np.interp(x, elevation_x, elevation_z)), elevation.peak_elevation
+
+    os.makedirs(PROCESS_TMP_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=elevation.extension, dir=PROCESS_TMP_DIR)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(elevation.spreadsheet)
+        return get_geom_func_from_excel(path, reverse_elevation=elevation.reverse_elevation)
+    except Exception as e:
+        logger.error(f"Failed to parse excel file: {e}")
+        raise SectionInputError("Failed to parse excel file.")
+    finally:
+        os.remove(path)
+
+
+def build_2ds_section(
+    inputs: SectionInputs,
+    unit_override: Optional[str] = None,
+    display_as_depth: Optional[bool] = None,
+    **interpolate_kwargs,
+) -> SectionGrid:
+    """
+    Interpolate a 2D-S section, for the data output and for render_section_png. Stored model sets use their parsed
+    layers, scaled if unit_override asks for the other unit; uploaded models are parsed.
+
+    :param inputs: Models and ground surface.
+    :param unit_override: "m" or "ft" to build the section in that unit.
+    :param display_as_depth: Build the section in depth below the surface instead of elevation.
+    :param interpolate_kwargs: Remaining arguments for interpolate_2ds_section.
+    :return: The section.
+    """
+    if inputs.layers is not None:
+        layers, unit_str = inputs.layers, inputs.unit
+        if unit_override is not None and unit_override != unit_str:
+            layers = scale_layers(layers, FEET_PER_METER if unit_override == "ft" else 1 / FEET_PER_METER)
+            unit_str = unit_override
+    else:
+        vel_models, unit_str = read_velocity_models(inputs.model_sources, unit_override)
+        layers = [velocity_model_layers(vel_model) for vel_model in vel_models]
+    geom_interp_func, peak_elevation = read_elevation(inputs.elevation)
+    if display_as_depth:
+        peak_elevation = None
+    return interpolate_2ds_section(
+        layers=layers, elevation_func=geom_interp_func, peak_elevation=peak_elevation, unit=unit_str,
+        **interpolate_kwargs,
+    )
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import multiprocessing
+import queue
+import threading
+import traceback
+from typing import Any, Callable, Optional
+
+from starlette.exceptions import HTTPException
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RenderTimeoutError(Exception):
+    """Raised when a render job runs longer than its timeout. The worker running it is killed and replaced."""
+
+
+class RenderWorkerError(Exception):
+    """Raised when a render worker dies or a job fails in a way that can't be passed back to the caller."""
+
+
+def _warm_up():
+    """
+    Pay matplotlib's startup costs (backend selection, font cache, first draw) once, before any job arrives.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import font_manager
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    font_manager.findfont(font_manager.FontProperties())
+    fig = Figure(figsize=(1, 1))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_title("warm up")
+    fig.canvas.draw()
+
+    # Import the plotting modules jobs will use so their import time isn't charged to the first request
+    import utils.section_utils  # noqa: F401
+    try:
+        import utils.render_jobs  # noqa: F401
+    except ImportError as e:
+        logger.warning(f"Render worker could not preload tereancore: {e}")
+
+
+def _worker_main(conn):
+    """
+    Render worker loop. Receives (func, args, kwargs) jobs over a pipe and sends back ("ok", result) or
+    ("error", exception). A None job asks the worker to exit.
+    """
+    _warm_up()
+    conn.send(("ready", None))
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        func, args, kwargs = job
+        try:
+            conn.send(("ok", func(*args, **kwargs)))
+        except Exception as e:
+            try:
+                conn.send(("error", e))
+            except Exception:
+                # The exception itself can't be pickled, send its traceback instead
+                conn.send(("error", RenderWorkerError(traceback.format_exc())))
+    conn.close()
+
+
+class _RenderWorker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True, name="render-worker")
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.jobs_done = 0
+
+    def wait_ready(self, timeout: float):
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            raise RenderWorkerError("Render worker did not start in time")
+        self.conn.recv()
+        self.ready = True
+
+    def stop(self, timeout: float = 5):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class RenderPool:
+    """
+    Pool of long lived worker processes for matplotlib rendering, so figures are drawn off the API process and the
+    matplotlib/font startup cost is paid once per worker rather than per request.
+
+    Jobs are picklable top level functions and their arguments; the function's return value (normally PNG bytes) is
+    sent back. Each job has a timeout, after which its worker is killed and replaced, and workers are recycled after
+    a fixed number of jobs to bound memory growth from matplotlib/tereancore.
+
+    When the pool has not been started (tests, scripts, or RENDER_WORKERS=0) jobs run inline in the calling thread.
+    """
+
+    def __init__(self, workers: int, max_jobs_per_worker: int, job_timeout: float, startup_timeout: float = 60):
+        """
+        :param workers: Number of worker processes.
+        :param max_jobs_per_worker: Jobs a worker runs before it is replaced with a fresh process.
+        :param job_timeout: Default seconds a job may run before its worker is killed.
+        :param startup_timeout: Seconds a new worker may take to finish warming up.
+        """
+        self.workers = workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: Optional[queue.Queue] = None
+        self._all: set[_RenderWorker] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    def start(self):
+        if self.started or self.workers <= 0:
+            return
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(self._spawn())
+        logger.info(f"Started {self.workers} render workers")
+
+    def stop(self):
+        if not self.started:
+            return
+        idle, self._idle = self._idle, None
+        # Wake jobs waiting for a free worker, each one passes the wake up on to the next
+        idle.put(None)
+        with self._lock:
+            workers, self._all = self._all, set()
+        for worker in workers:
+            worker.stop()
+        logger.info("Stopped render workers")
+
+    def _spawn(self) -> _RenderWorker:
+        worker = _RenderWorker(self._ctx)
+        with self._lock:
+            self._all.add(worker)
+        return worker
+
+    def _retire(self, worker: _RenderWorker, kill: bool = False):
+        with self._lock:
+            self._all.discard(worker)
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+
+    def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a job on a worker, blocking until it finishes.
+
+        :param func: Picklable top level function to run.
+        :param timeout: Seconds to wait for a free worker, and then again for the result. Defaults to the pool's job
+            timeout.
+        :return: The function's return value.
+        :raises RenderTimeoutError: If no worker became free in time or the job ran too long.
+        :raises RenderWorkerError: If the worker died while running the job or the pool was stopped.
+        """
+        idle = self._idle
+        if idle is None:
+            return func(*args, **kwargs)
+
+        timeout = self.job_timeout if timeout is None else timeout
+        try:
+            worker = idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RenderTimeoutError(
+                f"No render worker became free for {getattr(func, '__name__', func)} in {timeout}s"
+            )
+        if worker is None or self._idle is not idle:
+            # Pool was stopped while waiting, stop() takes care of the worker
+            idle.put(None)
+            raise RenderWorkerError("Render pool was stopped")
+        replace = False
+        try:
+            worker.wait_ready(self.startup_timeout)
+            worker.conn.send((func, args, kwargs))
+            if not worker.conn.poll(timeout):
+                replace = True
+                raise RenderTimeoutError(f"Render job {getattr(func, '__name__', func)} exceeded {timeout}s")
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError, RenderWorkerError) as e:
+            replace = True
+            raise RenderWorkerError(f"Render worker failed: {e}") from e
+        finally:
+            worker.jobs_done += 1
+            if replace or worker.jobs_done >= self.max_jobs_per_worker or not worker.process.is_alive():
+                self._retire(worker, kill=replace)
+                worker = self._spawn()
+            if self._idle is idle:
+                idle.put(worker)
+            else:
+                # Pool was stopped while the job ran
+                self._retire(worker)
+
+        if status == "error":
+            raise payload
+        return payload
+
+    async def submit(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Async wrapper around run() for use from request handlers.
+        """
+        return await asyncio.to_thread(self.run, func, *args, timeout=timeout, **kwargs)
+
+
+render_pool = RenderPool(
+    workers=settings.RENDER_WORKERS,
+    max_jobs_per_worker=settings.RENDER_WORKER_MAX_JOBS,
+    job_timeout=settings.RENDER_JOB_TIMEOUT,
+)
+
+
+async def run_render_job(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run a render job on the shared pool from a request handler, turning pool failures into HTTP errors.
+
+    :param func: Picklable top level function to run.
+    :return: The function's return value.
+    """
+    try:
+        return await render_pool.submit(func, *args, **kwargs)
+    except RenderTimeoutError as e:
+        logger.error(str(e))
+        raise HTTPException(504, "Rendering timed out.")
+    except RenderWorkerError as e:
+        logger.error(str(e))
+        raise HTTPException(500, "Rendering failed.")
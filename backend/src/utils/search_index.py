@@ -0,0 +1,191 @@
+"""
+Full-text search over project names, client names and contact names, emails and phone numbers.
+
+On SQLite the index is a set of contentless FTS5 tables kept in sync by triggers, so every write path (ORM, bulk
+UPDATE or raw SQL) updates it in the same transaction. Matching is per word, with every search word treated as a
+prefix, and results are ranked with bm25. setup_search_index creates the tables and triggers and refills them on
+startup, which also picks up rows written before the index existed and any rowid changes from VACUUM.
+
+Databases without FTS5 fall back to case-insensitive substring matching on the same columns.
+"""
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import Engine, column, literal_column, or_, text, true
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import TextualSelect
+
+from models.client_model import ClientDBModel
+from models.contact_model import ContactDBModel
+from models.project_model import ProjectDBModel
+
+logger = logging.getLogger(__name__)
+
+# Words of a search; anything else (quotes, operators) is dropped so user input can't form FTS5 syntax
+_WORD_RE = re.compile(r"\w+")
+
+
+def _digits(phone_number: str) -> str:
+    """SQL expression stripping the usual separators from a phone number, so it also matches typed as one run."""
+    expression = phone_number
+    for separator in (" ", "-", "(", ")", ".", "+"):
+        expression = f"replace({expression}, '{separator}', '')"
+    return expression
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    fts_table: str
+    model: type
+    # Indexed column name -> SQL expression over a row of the source table, with {row} for the row alias
+    columns: Dict[str, str]
+    # Source table columns a change to which must reindex the row
+    watched_columns: tuple
+
+    @property
+    def table(self) -> str:
+        return self.model.__tablename__
+
+
+SEARCH_INDEXES = {
+    "projects": SearchIndex(
+        "projects_fts", ProjectDBModel, {"name": "{row}.name"}, ("name",)
+    ),
+    "clients": SearchIndex(
+        "clients_fts", ClientDBModel, {"name": "{row}.name"}, ("name",)
+    ),
+    "contacts": SearchIndex(
+        "contacts_fts",
+        ContactDBModel,
+        {
+            "name": "{row}.name",
+            "email": "{row}.email",
+            "phone_number": "{row}.phone_number",
+            "phone_digits": _digits("{row}.phone_number"),
+        },
+        ("name", "email", "phone_number"),
+    ),
+}
+
+# Set by setup_search_index once the FTS5 tables are in place
+_fts_enabled = False
+
+
+def _values(index: SearchIndex, row: str) -> str:
+    return ", ".join(expression.format(row=row) for expression in index.columns.values())
+
+
+def _index_statements(index: SearchIndex) -> List[str]:
+    columns = ", ".join(index.columns)
+    insert = f"INSERT INTO {index.fts_table} (rowid, {columns}) VALUES (new.rowid, {_values(index, 'new')});"
+    # Contentless tables delete a row's tokens given the values it was indexed with
+    delete = (
+        f"INSERT INTO {index.fts_table} ({index.fts_table}, rowid, {columns}) "
+        f"VALUES ('delete', old.rowid, {_values(index, 'old')});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.fts_table} USING fts5({columns}, content='', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS {index.fts_table}_ai AFTER INSERT ON {index.table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.fts_table}_ad AFTER DELETE ON {index.table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.fts_table}_au AFTER UPDATE OF {', '.join(index.watched_columns)} "
+        f"ON {index.table} BEGIN {delete} {insert} END",
+    ]
+
+
+def setup_search_index(engine: Engine):
+    """
+    Create the FTS5 tables and their triggers if needed and refill them from the source tables. Safe to run on every
+    startup. Leaves search on the fallback if the database isn't SQLite or lacks FTS5.
+
+    :param engine: Engine for the application database.
+    """
+    global _fts_enabled
+    if engine.dialect.name != "sqlite":
+        logger.info("Full-text search needs SQLite FTS5, using substring matching")
+        return
+    try:
+        with engine.begin() as connection:
+            for index in SEARCH_INDEXES.values():
+                for statement in _index_statements(index):
+                    connection.execute(text(statement))
+                columns = ", ".join(index.columns)
+                connection.execute(text(f"INSERT INTO {index.fts_table} ({index.fts_table}) VALUES ('delete-all')"))
+                connection.execute(text(
+                    f"INSERT INTO {index.fts_table} (rowid, {columns}) "
+                    f"SELECT rowid, {_values(index, index.table)} FROM {index.table}"
+                ))
+    except Exception as e:
+        logger.warning(f"Could not set up the full-text search index, using substring matching: {e}")
+        return
+    _fts_enabled = True
+
+
+def fts_query(search: str) -> Optional[str]:
+    """
+    FTS5 query matching rows that contain every word of the search, each as a prefix.
+
+    :return: The query, or None if the search has no words.
+    """
+    words = _WORD_RE.findall(search)
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+def _fallback_filter(index: SearchIndex, search: str) -> ColumnElement:
+    fields = [getattr(index.model, field) for field in index.watched_columns]
+    return or_(*(field.ilike(f"%{search}%") for field in fields))
+
+
+def _rowid(index: SearchIndex) -> ColumnElement:
+    return literal_column(f"{index.table}.rowid")
+
+
+def _matching_rowids(index: SearchIndex, query: str) -> TextualSelect:
+    return text(f"SELECT rowid FROM {index.fts_table} WHERE {index.fts_table} MATCH :query").bindparams(
+        query=query
+    ).columns(column("rowid"))
+
+
+def search_filter(kind: str, search: str) -> ColumnElement:
+    """
+    Filter clause for queries on the model of an index, keeping the rows the search matches.
+
+    :param kind: Key of SEARCH_INDEXES.
+    :param search: Text as typed by the user.
+    """
+    index = SEARCH_INDEXES[kind]
+    if not _fts_enabled:
+        return _fallback_filter(index, search)
+    query = fts_query(search)
+    if query is None:
+        return true()
+    return _rowid(index).in_(_matching_rowids(index, query))
+
+
+def search_rows(db: Session, kind: str, search: str, limit: int = 20, options: Sequence = ()) -> list:
+    """
+    Rows of an index's model matching the search, best match first.
+
+    :param kind: Key of SEARCH_INDEXES.
+    :param search: Text as typed by the user.
+    :param limit: Maximum number of rows.
+    :param options: Loader options for the query, e.g. selectinload of relationships the caller reads.
+    """
+    index = SEARCH_INDEXES[kind]
+    if not _fts_enabled:
+        return (
+            db.query(index.model).filter(_fallback_filter(index, search)).options(*options)
+            .order_by(index.model.name).limit(limit).all()
+        )
+    query = fts_query(search)
+    if query is None:
+        return []
+    rowids = db.execute(
+        text(f"SELECT rowid FROM {index.fts_table} WHERE {index.fts_table} MATCH :query ORDER BY rank LIMIT :limit"),
+        {"query": query, "limit": limit},
+    ).scalars().all()
+    rows = db.query(index.model, _rowid(index)).filter(_rowid(index).in_(rowids)).options(*options).all()
+    rank = {rowid: position for position, rowid in enumerate(rowids)}
+    return [row for row, rowid in sorted(rows, key=lambda pair: rank[pair[1]])]
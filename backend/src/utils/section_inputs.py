@@ -0,0 +1,165 @@
+import hashlib
+import io
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from utils.section_utils import LayerProfile
+
+logger = logging.getLogger(__name__)
+
+# Parsed 2D-S inputs, stored per project as SectionInputs/{project_id}/{kind}_{input_id}.npz
+SECTION_INPUTS_DIR = os.path.join(settings.MQ_SAVE_DIR, "SectionInputs")
+
+MODEL_SET_KIND = "models"
+ELEVATION_KIND = "elevation"
+
+# (file name, file contents) of an uploaded 1D model. The name carries the position and unit.
+ModelSource = Tuple[str, bytes]
+
+
+class SectionInputError(ValueError):
+    """Raised when model or elevation files can't be read."""
+
+
+@dataclass
+class ElevationSource:
+    """
+    Ground surface of a 2D-S section: an uploaded spreadsheet, which is parsed wherever the section is built so
+    tereancore's own elevation function is used, or a profile stored with save_elevation.
+    """
+    spreadsheet: Optional[bytes] = None
+    extension: str = ""
+    reverse_elevation: bool = False
+    x: Optional[np.ndarray] = None
+    z: Optional[np.ndarray] = None
+    peak_elevation: Optional[float] = None
+
+
+@dataclass
+class SectionInputs:
+    """The models and ground surface of a 2D-S section."""
+    # Uploaded model files, parsed when the section is built. Empty for stored model sets.
+    model_sources: List[ModelSource]
+    elevation: Optional[ElevationSource] = None
+    # Parsed layers and the unit they were read in, when the models come from a stored model set. Sections of
+    # stored sets are built from these without parsing the model files again.
+    layers: Optional[List[LayerProfile]] = None
+    unit: Optional[str] = None
+
+
+def _input_path(project_id: str, kind: str, input_id: str) -> str:
+    return os.path.join(SECTION_INPUTS_DIR, project_id, f"{kind}_{input_id}.npz")
+
+
+def _save_input(project_id: str, kind: str, **arrays) -> str:
+    """
+    Write arrays as an .npz named after a hash of its contents, so storing the same inputs twice is a no-op and the
+    id doubles as a cache key.
+    """
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    data = buffer.getvalue()
+    input_id = hashlib.sha256(data).hexdigest()[:32]
+    path = _input_path(project_id, kind, input_id)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return input_id
+
+
+def _load_input(project_id: str, kind: str, input_id: str) -> Optional[dict]:
+    path = _input_path(project_id, kind, input_id)
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def save_model_set(project_id: str, layers: List[LayerProfile], unit: str) -> str:
+    """
+    Store a parsed set of 1D models.
+
+    Layers are ragged, so they are concatenated and offsets mark where each model starts.
+
+    :param project_id: Project the models belong to.
+    :param layers: One (position, layer bottoms, layer velocities) profile per model.
+    :param unit: Length unit the models were read in.
+    :return: Model set id.
+    """
+    offsets = np.cumsum([0] + [len(stops) for _, stops, _ in layers])
+    return _save_input(
+        project_id,
+        MODEL_SET_KIND,
+        positions=np.array([position for position, _, _ in layers], dtype=np.float64),
+        stops=np.concatenate([stops for _, stops, _ in layers]).astype(np.float64),
+        velocities=np.concatenate([velocities for _, _, velocities in layers]).astype(np.float64),
+        offsets=offsets.astype(np.int64),
+        unit=np.array(unit),
+    )
+
+
+def load_model_set(project_id: str, model_set_id: str) -> Optional[SectionInputs]:
+    """
+    Load a model set stored by `save_model_set`. Sets stored along with their model files load the same way, the
+    files are not needed anymore.
+
+    :return: The models as section inputs without an elevation, or None if there is no such model set.
+    """
+    data = _load_input(project_id, MODEL_SET_KIND, model_set_id)
+    if data is None:
+        return None
+    offsets = data["offsets"]
+    layers = [
+        (float(position), data["stops"][start:end], data["velocities"][start:end])
+        for position, start, end in zip(data["positions"], offsets[:-1], offsets[1:])
+    ]
+    return SectionInputs(model_sources=[], layers=layers, unit=str(data["unit"]))
+
+
+def save_elevation(project_id: str, x: np.ndarray, z: np.ndarray, peak_elevation: Optional[float]) -> str:
+    """
+    Store a parsed elevation profile.
+
+    :param project_id: Project the profile belongs to.
+    :param x: Array distances, increasing.
+    :param z: Ground elevation at each distance.
+    :param peak_elevation: Peak elevation reported for the profile.
+    :return: Elevation id.
+    """
+    return _save_input(
+        project_id,
+        ELEVATION_KIND,
+        x=np.asarray(x, dtype=np.float64),
+        z=np.asarray(z, dtype=np.float64),
+        peak_elevation=np.array(np.nan if peak_elevation is None else peak_elevation),
+    )
+
+
+def load_elevation(project_id: str, elevation_id: str) -> Optional[ElevationSource]:
+    """
+    Load an elevation profile stored by `save_elevation`.
+
+    :return: The profile, or None if there is no such profile.
+    """
+    data = _load_input(project_id, ELEVATION_KIND, elevation_id)
+    if data is None:
+        return None
+    peak_elevation = float(data["peak_elevation"])
+    return ElevationSource(
+        x=data["x"], z=data["z"], peak_elevation=None if np.isnan(peak_elevation) else peak_elevation
+    )
+
+
+def scale_layers(layers: List[LayerProfile], factor: float) -> List[LayerProfile]:
+    """Scale positions, layer bottoms and velocities of a model set, e.g. to change its length unit."""
+    if factor == 1:
+        return layers
+    return [(position * factor, stops * factor, velocities * factor) for position, stops, velocities in layers]
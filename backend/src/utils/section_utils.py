@@ -0,0 +1,444 @@
+import io
+import logging
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from scipy.ndimage import gaussian_filter
+
+logger = logging.getLogger(__name__)
+
+# (position, layer bottom depths, layer velocities) for a single 1D model
+LayerProfile = Tuple[float, np.ndarray, np.ndarray]
+
+FEET_PER_METER = 3.28084
+
+
+class SectionGrid:
+    """
+    An interpolated 2D velocity section, independent of any figure styling.
+
+    Values are stored row-major as (len(y), len(x)). For elevation sections `y` is elevation and cells above the
+    ground surface are NaN, otherwise `y` is depth below the surface.
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        values: np.ndarray,
+        surface_x: Optional[np.ndarray] = None,
+        surface_z: Optional[np.ndarray] = None,
+        y_is_elevation: bool = False,
+        unit: Optional[str] = None,
+        peak_elevation: Optional[float] = None,
+    ):
+        self.x = np.asarray(x, dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.float32)
+        self.values = np.asarray(values, dtype=np.float32)
+        self.surface_x = np.asarray(surface_x if surface_x is not None else [], dtype=np.float32)
+        self.surface_z = np.asarray(surface_z if surface_z is not None else [], dtype=np.float32)
+        self.y_is_elevation = y_is_elevation
+        self.unit = unit
+        self.peak_elevation = peak_elevation
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def resolution(self) -> Tuple[float, float]:
+        """Grid spacing as (y, x), 0 along an axis with fewer than two samples."""
+        dy = float(abs(self.y[1] - self.y[0])) if len(self.y) > 1 else 0.0
+        dx = float(abs(self.x[1] - self.x[0])) if len(self.x) > 1 else 0.0
+        return dy, dx
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.x.nbytes + self.y.nbytes + self.values.nbytes + self.surface_x.nbytes + self.surface_z.nbytes)
+
+    def value_range(self) -> Tuple[float, float]:
+        return float(np.nanmin(self.values)), float(np.nanmax(self.values))
+
+    def contour_levels(self, contours: Union[None, int, Sequence[float]]) -> np.ndarray:
+        """
+        Resolve a contour specification into explicit levels.
+
+        :param contours: None for no contours, an int for that many evenly spaced levels, or explicit levels.
+        :return: Array of contour levels.
+        """
+        if contours is None:
+            return np.array([], dtype=np.float32)
+        if isinstance(contours, (int, np.integer)):
+            v_min, v_max = self.value_range()
+            return np.linspace(v_min, v_max, int(contours) + 2, dtype=np.float32)[1:-1]
+        return np.asarray(contours, dtype=np.float32)
+
+    def contour_polylines(self, levels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Trace contour lines through the section.
+
+        :param levels: Levels to trace.
+        :return: Tuple of (points (N, 2), polyline start offsets into points, level index of each polyline).
+        """
+        from contourpy import contour_generator
+
+        points, offsets, level_index = [], [], []
+        if len(levels) > 0 and self.values.size > 0:
+            generator = contour_generator(x=self.x, y=self.y, z=np.ma.masked_invalid(self.values))
+            n_points = 0
+            for i, level in enumerate(levels):
+                for line in generator.lines(float(level)):
+                    offsets.append(n_points)
+                    level_index.append(i)
+                    points.append(line)
+                    n_points += len(line)
+        return (
+            np.concatenate(points).astype(np.float32) if points else np.zeros((0, 2), dtype=np.float32),
+            np.asarray(offsets, dtype=np.int32),
+            np.asarray(level_index, dtype=np.int32),
+        )
+
+    def to_npz_bytes(self, contours: Union[None, int, Sequence[float]] = None) -> bytes:
+        """
+        Pack the section, its surface profile and contour polylines into an uncompressed .npz archive.
+
+        :param contours: Contour specification, see `contour_levels`.
+        :return: Bytes of the .npz archive.
+        """
+        levels = self.contour_levels(contours)
+        contour_points, contour_offsets, contour_level_index = self.contour_polylines(levels)
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            x=self.x,
+            y=self.y,
+            values=self.values,
+            surface_x=self.surface_x,
+            surface_z=self.surface_z,
+            y_is_elevation=np.array(self.y_is_elevation),
+            contour_levels=levels,
+            contour_points=contour_points,
+            contour_offsets=contour_offsets,
+            contour_level_index=contour_level_index,
+        )
+        return buffer.getvalue()
+
+
+def velocity_model_layers(vel_model) -> LayerProfile:
+    """
+    Extract the layer bottoms and velocities of a tereancore VelocityModel.
+
+    :param vel_model: VelocityModel with a position set.
+    :return: Tuple of (position, layer bottom depths, layer velocities).
+    """
+    df = vel_model.df
+    return (
+        float(vel_model.position),
+        df['Stop'].to_numpy(dtype=np.float64),
+        df['Velocity'].to_numpy(dtype=np.float64),
+    )
+
+
+def _sample_profile(stops: np.ndarray, velocities: np.ndarray, depths: np.ndarray) -> np.ndarray:
+    # Each depth takes the velocity of the layer it falls in; anything deeper takes the last layer.
+    layer_idx = np.searchsorted(stops, depths, side="right")
+    return velocities[np.clip(layer_idx, 0, len(velocities) - 1)]
+
+
+def figure_grid_shape(plot_size: Tuple[float, float] = (10, 5), dpi: int = 100, oversample: float = 2) -> Tuple[int, int]:
+    """
+    Largest grid worth interpolating for a figure: a few cells per output pixel, more is downsampled away.
+
+    :param plot_size: Figure size in inches (width, height).
+    :param dpi: Figure dpi.
+    :param oversample: Grid cells per output pixel along each axis.
+    :return: Tuple of (rows, columns).
+    """
+    return int(plot_size[1] * dpi * oversample), int(plot_size[0] * dpi * oversample)
+
+
+def adaptive_resolution(
+    x_extent: float, depth_extent: float, res: float, max_shape: Tuple[int, int]
+) -> Tuple[float, float]:
+    """
+    Grid spacing per axis for a section, coarsened from `res` where needed so the depth grid is at most max_shape.
+
+    :param x_extent: Array distance covered by the section.
+    :param depth_extent: Depth range covered by the section.
+    :param res: Requested grid spacing; never made finer.
+    :param max_shape: Largest grid as (rows, columns), e.g. from `figure_grid_shape`.
+    :return: Tuple of (y spacing, x spacing).
+    """
+    x_res = max(res, x_extent / max(max_shape[1] - 1, 1))
+    y_res = max(res, depth_extent / max(max_shape[0] - 1, 1))
+    return y_res, x_res
+
+
+def interpolate_2ds_section(
+    layers: List[LayerProfile],
+    elevation_func: Optional[Callable] = None,
+    peak_elevation: Optional[float] = None,
+    x_min: Optional[float] = None,
+    x_max: Optional[float] = None,
+    y_min: Optional[float] = None,
+    y_max: Optional[float] = None,
+    res: float = 0.1,
+    smoothing_sigma: float = 20,
+    reverse: bool = False,
+    unit: Optional[str] = None,
+    max_shape: Optional[Tuple[int, int]] = None,
+) -> SectionGrid:
+    """
+    Interpolate a series of 1D S-wave models into a smoothed 2D section.
+
+    Models are linearly interpolated between their positions on a regular depth grid, smoothed, and then (if a
+    peak elevation is given) hung from the ground surface so the y axis becomes elevation.
+
+    :param layers: One layer profile per model, see `velocity_model_layers`.
+    :param elevation_func: Maps array distance to ground elevation. None for a flat surface.
+    :param peak_elevation: Peak ground elevation. If None, the section is returned in depth.
+    :param x_min: Minimum array distance. Defaults to the first model position.
+    :param x_max: Maximum array distance. Defaults to the last model position.
+    :param y_min: Minimum depth. Defaults to 0.
+    :param y_max: Maximum depth. Defaults to the deepest layer bottom.
+    :param res: Grid spacing in model units.
+    :param smoothing_sigma: Gaussian smoothing sigma in grid cells.
+    :param reverse: Flip the line direction.
+    :param unit: Length unit of the models, stored on the returned grid.
+    :param max_shape: Adaptive resolution. If given, `res` is coarsened per axis as needed so the depth grid is at
+        most (rows, columns), e.g. from `figure_grid_shape`. The smoothing sigma is rescaled so the smoothing
+        distance stays the same.
+    :return: The interpolated section.
+    """
+    if len(layers) == 0:
+        raise ValueError("At least one velocity model is required.")
+    layers = sorted(layers, key=lambda layer: layer[0])
+    positions = np.array([layer[0] for layer in layers], dtype=np.float64)
+    if reverse:
+        positions = positions.max() + positions.min() - positions
+        order = np.argsort(positions)
+        positions = positions[order]
+        layers = [layers[i] for i in order]
+
+    x_min = float(positions.min()) if x_min is None else x_min
+    x_max = float(positions.max()) if x_max is None else x_max
+    depth_min = 0.0 if y_min is None else y_min
+    depth_max = max(float(layer[1][-1]) for layer in layers) if y_max is None else y_max
+    x_res = y_res = res
+    if max_shape is not None:
+        y_res, x_res = adaptive_resolution(x_max - x_min, depth_max - depth_min, res, max_shape)
+    x = np.arange(x_min, x_max + x_res / 2, x_res)
+    depths = np.arange(depth_min, depth_max + y_res / 2, y_res)
+
+    # (n_models, n_depths) then linear in x for every depth row at once
+    profiles = np.stack([_sample_profile(stops, vels, depths) for _, stops, vels in layers])
+    if len(positions) == 1:
+        depth_grid = np.repeat(profiles[0][:, np.newaxis], len(x), axis=1)
+    else:
+        idx = np.clip(np.searchsorted(positions, x, side="right") - 1, 0, len(positions) - 2)
+        weight = np.clip((x - positions[idx]) / (positions[idx + 1] - positions[idx]), 0.0, 1.0)
+        depth_grid = (profiles[idx] * (1.0 - weight)[:, np.newaxis] + profiles[idx + 1] * weight[:, np.newaxis]).T
+    if smoothing_sigma:
+        # sigma is given in cells of the requested resolution, keep the same smoothing distance on each axis
+        sigma = (smoothing_sigma * res / y_res, smoothing_sigma * res / x_res)
+        depth_grid = gaussian_filter(depth_grid, sigma=sigma, mode="nearest")
+
+    if elevation_func is None or peak_elevation is None:
+        surface_z = np.zeros_like(x) if elevation_func is None else np.asarray(elevation_func(x), dtype=np.float64)
+        return SectionGrid(x=x, y=depths, values=depth_grid, surface_x=x, surface_z=surface_z, unit=unit)
+
+    surface_z = np.asarray(elevation_func(x), dtype=np.float64)
+    elevations = np.arange(surface_z.min() - depth_max, peak_elevation + y_res / 2, y_res)
+    sampler = RegularGridInterpolator((depths, x), depth_grid, bounds_error=False, fill_value=np.nan)
+    column_depths = surface_z[np.newaxis, :] - elevations[:, np.newaxis]
+    points = np.stack([column_depths, np.broadcast_to(x, column_depths.shape)], axis=-1)
+    values = sampler(points.reshape(-1, 2)).reshape(column_depths.shape)
+    return SectionGrid(
+        x=x, y=elevations, values=values, surface_x=x, surface_z=surface_z, y_is_elevation=True, unit=unit,
+        peak_elevation=peak_elevation,
+    )
+
+
+def read_geoct_model(model_text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Read a GeoCT .mdl velocity model.
+
+    The header holds the node counts in x and z, the node spacing and the x/z origin, followed by the velocities
+    one depth row at a time.
+
+    :param model_text: Contents of the .mdl file.
+    :return: Tuple of (x nodes, depth nodes, velocities shaped (len(depth), len(x))).
+    """
+    tokens = model_text.split()
+    nx, nz = int(tokens[0]), int(tokens[1])
+    spacing, x0, z0 = float(tokens[2]), float(tokens[3]), float(tokens[4])
+    velocities = np.array(tokens[6:6 + nx * nz], dtype=np.float64)
+    if velocities.size != nx * nz:
+        raise ValueError(f"Expected {nx * nz} velocities in GeoCT model, found {velocities.size}.")
+    x = x0 + spacing * np.arange(nx)
+    z = z0 + spacing * np.arange(nz)
+    return x, z, velocities.reshape(nz, nx)
+
+
+def interpolate_2dp_section(
+    model_text: str,
+    x_min: Optional[float] = None,
+    x_max: Optional[float] = None,
+    min_depth: Optional[float] = None,
+    max_depth: Optional[float] = None,
+    res: float = 0.5,
+    smoothing_sigma: float = 20,
+    reverse: bool = False,
+    unit: Optional[str] = None,
+) -> SectionGrid:
+    """
+    Resample a GeoCT P-wave model onto a regular grid and smooth it.
+
+    :param model_text: Contents of the .mdl file.
+    :param x_min: Minimum array distance. Defaults to the model extent.
+    :param x_max: Maximum array distance. Defaults to the model extent.
+    :param min_depth: Minimum depth. Defaults to the model extent.
+    :param max_depth: Maximum depth. Defaults to the model extent.
+    :param res: Grid spacing in model units.
+    :param smoothing_sigma: Gaussian smoothing sigma in grid cells.
+    :param reverse: Flip the line direction.
+    :param unit: Length unit of the model, stored on the returned grid.
+    :return: The interpolated section.
+    """
+    node_x, node_z, node_values = read_geoct_model(model_text)
+    if reverse:
+        node_values = node_values[:, ::-1]
+    x = np.arange(node_x[0] if x_min is None else x_min, (node_x[-1] if x_max is None else x_max) + res / 2, res)
+    z = np.arange(
+        node_z[0] if min_depth is None else min_depth, (node_z[-1] if max_depth is None else max_depth) + res / 2, res
+    )
+    sampler = RegularGridInterpolator((node_z, node_x), node_values, bounds_error=False, fill_value=None)
+    zz, xx = np.meshgrid(z, x, indexing="ij")
+    values = sampler(np.stack([zz.ravel(), xx.ravel()], axis=-1)).reshape(zz.shape)
+    if smoothing_sigma:
+        values = gaussian_filter(values, sigma=smoothing_sigma, mode="nearest")
+    return SectionGrid(x=x, y=z, values=values, unit=unit)
+
+
+def section_tick_params(
+    tick_right: bool = False,
+    tick_left: bool = True,
+    tick_top: bool = True,
+    tick_bottom: bool = False,
+    ticklabel_right: bool = False,
+    ticklabel_left: bool = True,
+    ticklabel_top: bool = True,
+    ticklabel_bottom: bool = False,
+) -> dict:
+    """Build the keyword arguments for `Axes.tick_params` from the tick flags used by the 2D endpoints."""
+    return {
+        "right": tick_right, "left": tick_left, "top": tick_top, "bottom": tick_bottom,
+        "labelright": ticklabel_right, "labelleft": ticklabel_left,
+        "labeltop": ticklabel_top, "labelbottom": ticklabel_bottom,
+    }
+
+
+def default_2ds_labels(
+    unit_str: str, elevation_axis: bool, x_label: Optional[str], y_label: Optional[str], cbar_label: Optional[str]
+) -> Tuple[str, str, str]:
+    """Axis and colorbar labels of a 2D-S figure, filling in the defaults for the unit where none were given."""
+    if x_label is None:
+        x_label = "Array Dist., " + unit_str
+    if y_label is None:
+        if elevation_axis:
+            y_label = "Elevation, " + unit_str
+        else:
+            y_label = "Depth, " + unit_str
+    if cbar_label is None:
+        cbar_label = "Shear-Wave Velocity, " + unit_str + "/sec"
+    return x_label, y_label, cbar_label
+
+
+def render_section_png(
+    grid: SectionGrid,
+    title: Optional[str] = None,
+    x_label: Optional[str] = None,
+    y_label: Optional[str] = None,
+    cbar_label: Optional[str] = None,
+    cbar_vmin: Optional[float] = None,
+    cbar_vmax: Optional[float] = None,
+    contours: Union[None, int, Sequence[float]] = None,
+    contour_color: str = "k",
+    contour_width: float = 0.8,
+    label_pad_size: float = -58,
+    cbar_pad_size: float = 0.10,
+    cbar_ticks: Optional[Sequence[float]] = None,
+    colorbar: bool = True,
+    invert_colorbar_axis: bool = False,
+    aboveground_color: str = "w",
+    aboveground_border_color: Optional[str] = None,
+    shift_elevation: bool = False,
+    elevation_tick_increment: Optional[float] = 50,
+    tick_params: Optional[dict] = None,
+    x_label_position: str = "top",
+    y_label_position: str = "left",
+    plot_size: Tuple[float, float] = (10, 5),
+    dpi: int = 100,
+    cmap: str = "Spectral",
+) -> bytes:
+    """
+    Render a section grid as a PNG. This is the drawing step of tereancore's plot_2ds, taking the same styling
+    arguments, without its interpolation: the grid comes from interpolate_2ds_section (usually the cached one), so
+    restyling a section never interpolates it again.
+
+    :param grid: The section. Line reversal and depth/elevation display are already applied to it.
+    :param contours: Contour specification, see `SectionGrid.contour_levels`.
+    :param shift_elevation: Label the elevation axis relative to the peak elevation.
+    :param tick_params: Tick flags, see `section_tick_params`.
+    :return: PNG bytes.
+    """
+    # Use the object oriented API directly so renders never touch pyplot's global state.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter, MultipleLocator
+
+    fig = Figure(figsize=plot_size)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    masked = np.ma.masked_invalid(grid.values)
+    mesh = ax.pcolormesh(grid.x, grid.y, masked, cmap=cmap, vmin=cbar_vmin, vmax=cbar_vmax, shading="auto")
+
+    levels = grid.contour_levels(contours)
+    if len(levels) > 0:
+        contour_set = ax.contour(grid.x, grid.y, masked, levels=levels, colors=contour_color,
+                                 linewidths=contour_width)
+        ax.clabel(contour_set, fmt="%d", fontsize=8)
+
+    if grid.y_is_elevation:
+        if grid.surface_x.size > 0:
+            ax.fill_between(grid.surface_x, grid.surface_z, float(grid.y.max()), color=aboveground_color,
+                            edgecolor=aboveground_border_color, zorder=2)
+        if elevation_tick_increment:
+            ax.yaxis.set_major_locator(MultipleLocator(elevation_tick_increment))
+        if shift_elevation and grid.peak_elevation is not None:
+            peak = grid.peak_elevation
+            ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value - peak:g}"))
+    else:
+        ax.invert_yaxis()
+
+    if title:
+        ax.set_title(title)
+    if x_label:
+        ax.set_xlabel(x_label)
+    if y_label:
+        ax.set_ylabel(y_label)
+    ax.xaxis.set_label_position(x_label_position)
+    ax.yaxis.set_label_position(y_label_position)
+    ax.tick_params(**(tick_params or section_tick_params()))
+
+    if colorbar:
+        cbar = fig.colorbar(mesh, ax=ax, pad=cbar_pad_size, ticks=cbar_ticks)
+        if cbar_label:
+            cbar.set_label(cbar_label, labelpad=label_pad_size)
+        if invert_colorbar_axis:
+            cbar.ax.invert_yaxis()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
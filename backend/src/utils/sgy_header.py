@@ -0,0 +1,54 @@
+"""
+Summary of a SEG-Y file read from its file headers alone.
+
+Uploads capture the first SGY_HEADER_SIZE bytes while they stream (see utils.blob_store.stage_upload), so the summary
+is available without reopening the file or loading it with segyio.
+"""
+import struct
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+TEXT_HEADER_SIZE = 3200
+BINARY_HEADER_SIZE = 400
+SGY_HEADER_SIZE = TEXT_HEADER_SIZE + BINARY_HEADER_SIZE
+TRACE_HEADER_SIZE = 240
+
+# Bytes per sample by data sample format code
+_SAMPLE_SIZES = {1: 4, 2: 4, 3: 2, 5: 4, 6: 8, 8: 1, 9: 8, 10: 4, 11: 2, 12: 8, 15: 3, 16: 1}
+
+
+@dataclass
+class SgyHeaderSummary:
+    sample_interval_us: int
+    samples_per_trace: int
+    format_code: int
+    # Derived from the file size, assuming fixed length traces and no extended text headers
+    trace_count: Optional[int]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_sgy_header(header: bytes, file_size: int) -> Optional[SgyHeaderSummary]:
+    """
+    Read the binary file header of a SEG-Y file.
+
+    :param header: At least the first SGY_HEADER_SIZE bytes of the file.
+    :param file_size: Size of the whole file, for the trace count.
+    :return: The summary, or None if the header doesn't look like SEG-Y.
+    """
+    if len(header) < SGY_HEADER_SIZE:
+        return None
+    binary_header = header[TEXT_HEADER_SIZE:SGY_HEADER_SIZE]
+    for byte_order in (">", "<"):
+        # Bytes 3217-3218 sample interval, 3221-3222 samples per trace, 3225-3226 format code (1-based)
+        sample_interval, samples, format_code = struct.unpack_from(f"{byte_order}H2xH2xH", binary_header, 16)
+        if format_code in _SAMPLE_SIZES and samples > 0:
+            break
+    else:
+        return None
+
+    trace_size = TRACE_HEADER_SIZE + samples * _SAMPLE_SIZES[format_code]
+    data_size = file_size - SGY_HEADER_SIZE
+    trace_count = data_size // trace_size if data_size % trace_size == 0 else None
+    return SgyHeaderSummary(sample_interval, samples, format_code, trace_count)
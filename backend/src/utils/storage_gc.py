@@ -0,0 +1,262 @@
+"""
+Disk usage accounting and garbage collection for MQ_SAVE_DIR.
+
+One pass reconciles the database against a single walk of the data directory:
+
+- record and project file rows whose file is gone are deleted,
+- files under SGYFiles/ProjectFiles that no row (or in-progress upload) points at are deleted,
+- blob reference counts are recomputed from the rows that use them, and unused blobs are deleted,
+- per-project derived data (ArchiveBundles, SectionInputs) of projects that no longer exist is deleted,
+- staging and scratch files (blob staging, ProcessTmp, *.tmp) older than the grace period are deleted,
+- resumable upload sessions untouched for longer than the grace period are deleted along with their .part files.
+
+Files modified or linked more recently than the grace period are never touched, so uploads and jobs that are
+mid-flight aren't raced (a new hard link to an old blob updates its ctime). Archive compression moves records while
+it runs, so a pass never overlaps with it, and a row is read again before it is deleted for a missing file. With
+dry_run nothing is changed and the report lists what would be removed.
+
+Run from the CLI with ``python -m utils.storage_gc [--apply]``.
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import settings
+from crud.blob_crud import delete_blob, get_all_blobs, set_blob_ref_count
+from crud.file_crud import delete_file_info, get_all_files_info
+from crud.project_crud import get_project_ids
+from crud.sgy_file_crud import delete_sgy_file_info, get_all_sgy_files_info
+from crud.upload_session_crud import delete_upload_session, get_all_upload_sessions
+from database import SessionLocal
+from utils.archive_bundles import ARCHIVE_BUNDLES_DIR
+from utils.archive_storage import _compression_lock, is_compressed
+from utils.blob_store import BLOB_DIR, BLOB_TMP_DIR
+from utils.section_inputs import SECTION_INPUTS_DIR
+from utils.utils import PROCESS_TMP_DIR
+
+logger = logging.getLogger(__name__)
+
+SGY_FILES_DIR = os.path.join(settings.MQ_SAVE_DIR, "SGYFiles")
+PROJECT_FILES_DIR = os.path.join(settings.MQ_SAVE_DIR, "ProjectFiles")
+
+# Directories holding one subdirectory of data per project
+_PROJECT_DIRS = (SGY_FILES_DIR, PROJECT_FILES_DIR, ARCHIVE_BUNDLES_DIR, SECTION_INPUTS_DIR)
+# Directories whose every file is scratch data
+_SCRATCH_DIRS = (BLOB_TMP_DIR, PROCESS_TMP_DIR)
+
+_gc_lock = threading.Lock()
+
+
+def _in_dir(path: str, directory: str) -> bool:
+    return path.startswith(directory + os.sep)
+
+
+def _project_of(path: str) -> Optional[str]:
+    """Project id of a file under one of the per-project directories."""
+    for directory in _PROJECT_DIRS:
+        if _in_dir(path, directory):
+            return os.path.relpath(path, directory).split(os.sep)[0]
+    return None
+
+
+def _timestamp(value: datetime) -> float:
+    """POSIX timestamp of a DB datetime. SQLite returns them naive, in UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _file_still_missing(db: Session, row) -> bool:
+    """
+    Read the path of a row whose file was missing from the walk again. The rows are read before the walk, so the
+    file may have been moved since (e.g. compressed), or the row deleted.
+    """
+    model = type(row)
+    path = db.scalar(select(model.path).where(model.id == row.id))
+    return path is not None and not os.path.exists(path)
+
+
+def collect_garbage(db: Session, dry_run: bool = True, grace_hours: Optional[float] = None) -> dict:
+    """
+    Reconcile the DB with MQ_SAVE_DIR, report usage and delete orphans.
+
+    :param db: DB session.
+    :param dry_run: Only report what would be removed.
+    :param grace_hours: Files modified, and upload sessions written to, more recently than this are left alone.
+        Defaults to STORAGE_GC_GRACE_HOURS.
+    :return: Report with disk usage (total, per top level directory and logical bytes per project) and what was (or
+        would be) removed.
+    """
+    grace_hours = settings.STORAGE_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    cutoff = time.time() - grace_hours * 3600
+    data_dir = os.path.abspath(settings.MQ_SAVE_DIR)
+
+    project_ids = get_project_ids(db)
+    sgy_files = get_all_sgy_files_info(db)
+    files = get_all_files_info(db)
+    blobs = {blob.hash: blob for blob in get_all_blobs(db)}
+    referenced_paths = {os.path.abspath(row.path) for row in [*sgy_files, *files]}
+    expired_sessions = []
+    for session in get_all_upload_sessions(db):
+        if _timestamp(session.updated_date) < cutoff:
+            expired_sessions.append(session)
+        else:
+            referenced_paths.add(os.path.abspath(session.path + ".part"))
+    expired_parts = {os.path.abspath(session.path + ".part") for session in expired_sessions}
+
+    report = {
+        "dry_run": dry_run,
+        "total_bytes": 0,
+        "by_directory": defaultdict(int),
+        "by_project": defaultdict(int),
+        "removed_files": [],
+        "removed_bytes": 0,
+        "removed_rows": {"sgy_files": 0, "files": 0, "blobs": 0, "upload_sessions": len(expired_sessions)},
+        "fixed_ref_counts": 0,
+    }
+    seen_inodes = set()
+    existing_paths = set()
+    recent_paths = set()
+    emptied_dirs = set()
+
+    def remove(path: str, size: int, reason: str):
+        report["removed_files"].append({"path": path, "bytes": size, "reason": reason})
+        report["removed_bytes"] += size
+        if not dry_run:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not remove {path}: {e}")
+
+    # The single walk: account for every file and sort out the ones nothing refers to
+    for root, _, names in os.walk(data_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.lstat(path)
+            except FileNotFoundError:
+                continue
+            existing_paths.add(path)
+            # Record paths are hard links into the blob store, count each inode once
+            if (stat.st_dev, stat.st_ino) not in seen_inodes:
+                seen_inodes.add((stat.st_dev, stat.st_ino))
+                report["total_bytes"] += stat.st_size
+                report["by_directory"][os.path.relpath(path, data_dir).split(os.sep)[0]] += stat.st_size
+            project_id = _project_of(path)
+            if project_id is not None:
+                report["by_project"][project_id] += stat.st_size
+
+            if path in expired_parts:
+                # The session hasn't been written to for the grace period, whatever the file times say
+                remove(path, stat.st_size, "expired upload session")
+                continue
+            if max(stat.st_mtime, stat.st_ctime) >= cutoff:
+                recent_paths.add(path)
+                continue
+            if any(_in_dir(path, directory) for directory in _SCRATCH_DIRS) or name.endswith(".tmp"):
+                remove(path, stat.st_size, "stale temp file")
+            elif _in_dir(path, SGY_FILES_DIR) or _in_dir(path, PROJECT_FILES_DIR):
+                if path not in referenced_paths:
+                    remove(path, stat.st_size, "no file row")
+                    if project_id not in project_ids:
+                        emptied_dirs.add(root)
+            elif project_id is not None and project_id not in project_ids:
+                remove(path, stat.st_size, "project deleted")
+                emptied_dirs.add(root)
+            elif _in_dir(path, BLOB_DIR) and name not in blobs:
+                remove(path, stat.st_size, "no blob row")
+
+    if not dry_run:
+        for session in expired_sessions:
+            logger.info(f"Upload session {session.id} expired, last updated {session.updated_date}")
+            delete_upload_session(db, session.id)
+
+    # Rows whose file is gone
+    for rows, delete_row, key in (
+        (sgy_files, delete_sgy_file_info, "sgy_files"),
+        (files, delete_file_info, "files"),
+    ):
+        for row in rows:
+            if os.path.abspath(row.path) not in existing_paths and _file_still_missing(db, row):
+                logger.warning(f"{key} row {row.id} points at missing file {row.path}")
+                report["removed_rows"][key] += 1
+                if not dry_run:
+                    delete_row(db, row.id)
+
+    # Blob references: every row still in place and not moved to compressed storage holds one
+    ref_counts = Counter(
+        row.content_hash for row in [*sgy_files, *files]
+        if row.content_hash and not is_compressed(row.path) and os.path.abspath(row.path) in existing_paths
+    )
+    for content_hash, blob in blobs.items():
+        ref_count = ref_counts[content_hash]
+        blob_path = os.path.abspath(blob.path)
+        if blob_path in recent_paths:
+            # Possibly being linked by an upload that committed after the rows were read
+            continue
+        if ref_count == 0:
+            size = os.path.getsize(blob_path) if blob_path in existing_paths else 0
+            if blob_path in existing_paths:
+                remove(blob_path, size, "unreferenced blob")
+            report["removed_rows"]["blobs"] += 1
+            if not dry_run:
+                delete_blob(db, content_hash)
+        elif ref_count != blob.ref_count:
+            logger.warning(f"Blob {content_hash} ref count {blob.ref_count} should be {ref_count}")
+            report["fixed_ref_counts"] += 1
+            if not dry_run:
+                set_blob_ref_count(db, content_hash, ref_count)
+
+    if not dry_run:
+        # Directories of deleted projects that are now empty
+        for path in sorted(emptied_dirs, reverse=True):
+            if os.path.isdir(path) and not os.listdir(path):
+                os.rmdir(path)
+
+    report["by_directory"] = dict(report["by_directory"])
+    report["by_project"] = dict(sorted(report["by_project"].items(), key=lambda item: -item[1]))
+    return report
+
+
+def run_storage_gc(dry_run: bool = True, grace_hours: Optional[float] = None) -> Optional[dict]:
+    """
+    Run collect_garbage with its own DB session. Returns None without doing anything if a pass or archive
+    compression is already running.
+    """
+    if not _gc_lock.acquire(blocking=False):
+        logger.info("Storage GC already running, skipping")
+        return None
+    if not _compression_lock.acquire(blocking=False):
+        _gc_lock.release()
+        logger.info("Archive compression running, skipping storage GC")
+        return None
+    try:
+        with SessionLocal() as db:
+            report = collect_garbage(db, dry_run=dry_run, grace_hours=grace_hours)
+        logger.info(
+            f"Storage GC {'dry run ' if dry_run else ''}finished: {len(report['removed_files'])} files "
+            f"({report['removed_bytes']} bytes), rows {report['removed_rows']}, "
+            f"{report['fixed_ref_counts']} ref counts fixed"
+        )
+        return report
+    finally:
+        _compression_lock.release()
+        _gc_lock.release()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report MQ_SAVE_DIR disk usage and remove orphaned files and rows.")
+    parser.add_argument("--apply", action="store_true", help="Delete orphans. Without it this is a dry run.")
+    parser.add_argument("--grace-hours", type=float, default=None,
+                        help="Leave files modified more recently than this alone (default STORAGE_GC_GRACE_HOURS).")
+    args = parser.parse_args()
+    print(json.dumps(run_storage_gc(dry_run=not args.apply, grace_hours=args.grace_hours), indent=2))
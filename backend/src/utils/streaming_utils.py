@@ -1,14 +1,19 @@
 import io
 import os
-import zipfile
 import asyncio
-from typing import AsyncGenerator, List, Optional, Tuple
+from functools import partial
+from typing import Iterator, List, Optional, Tuple
 import aiofiles
 from fastapi import BackgroundTasks
 from email.mime.base import MIMEBase
 from email import encoders
 import logging
 
+from config import settings
+from utils.archive_storage import COMPRESSED_SUFFIX, record_size
+from utils.frame_compression import FrameReader
+from utils.zip_stream import ZipEntry, archive_size, file_entry, iter_zip, policy_entry, write_zip
+
 logger = logging.getLogger(__name__)
 
 CHUNK_SIZE = 1024 * 1024  # 1MB chunks
@@ -17,69 +22,95 @@ CHUNK_SIZE = 1024 * 1024  # 1MB chunks
 class StreamingZip:
     """
     Creates a zip file on-the-fly and streams it without loading everything into memory.
-    Uses a temporary file to avoid memory issues with large archives.
+    Entries are written as their files are read (see utils.zip_stream), so the first bytes go out immediately and no
+    temp file is needed.
     """
     
-    def __init__(self, files_to_zip: List[Tuple[str, str]], chunk_size: int = CHUNK_SIZE):
+    def __init__(
+        self,
+        files_to_zip: List[Tuple[str, str]],
+        chunk_size: int = CHUNK_SIZE,
+        compression: Optional[int] = None,
+    ):
         """
         Initialize streaming zip creator.
         
         Args:
             files_to_zip: List of tuples (file_path, archive_name)
             chunk_size: Size of chunks to yield
+            compression: zipfile.ZIP_DEFLATED or zipfile.ZIP_STORED, or None to choose per file from a sample
+                of its data (see utils.zip_stream.choose_compression)
         """
         self.files_to_zip = files_to_zip
         self.chunk_size = chunk_size
-        
-    async def generate(self) -> AsyncGenerator[bytes, None]:
-        """Generate zip file chunks asynchronously."""
-        import tempfile
-        
-        # Create a temporary file for the zip
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as temp_file:
-            temp_path = temp_file.name
-            
-        try:
-            # Create zip file
-            with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
-                for file_path, archive_name in self.files_to_zip:
-                    if os.path.exists(file_path):
-                        zip_file.write(file_path, archive_name)
-                    else:
-                        logger.warning(f"File not found: {file_path}")
-            
-            # Stream the zip file
-            async with aiofiles.open(temp_path, 'rb') as f:
-                while chunk := await f.read(self.chunk_size):
-                    yield chunk
-                    
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(temp_path)
-            except Exception as e:
-                logger.error(f"Error cleaning up temp file: {e}")
-
-
-async def create_streaming_zip_response(files_to_zip: List[Tuple[str, str]], filename: str):
+        self.compression = compression
+        self.entries = self._make_entries()
+
+    def _make_entries(self) -> List[ZipEntry]:
+        entries = []
+        for file_path, archive_name in self.files_to_zip:
+            if not os.path.exists(file_path):
+                logger.warning(f"File not found: {file_path}")
+            elif file_path.endswith(COMPRESSED_SUFFIX):
+                # Archived record, store its decompressed contents
+                size = record_size(file_path)
+                open_source = partial(FrameReader, file_path)
+                mtime = os.path.getmtime(file_path)
+                if self.compression is None:
+                    entries.append(policy_entry(archive_name, size, open_source, mtime))
+                else:
+                    entries.append(ZipEntry(archive_name, size, open_source, self.compression, mtime=mtime))
+            else:
+                entries.append(file_entry(file_path, archive_name, compress_type=self.compression))
+        return entries
+
+    @property
+    def size(self) -> Optional[int]:
+        """Size of the archive if it is known before writing it (every entry STORED), otherwise None."""
+        return archive_size(self.entries)
+
+    def generate(self) -> Iterator[bytes]:
+        """
+        Generate zip file chunks. This reads files synchronously; StreamingResponse runs sync iterators in its
+        threadpool so the event loop isn't blocked.
+        """
+        return iter_zip(self.entries, self.chunk_size, workers=settings.ZIP_COMPRESSION_THREADS)
+
+    def write_zip(self, zip_path: str):
+        """Write the archive to zip_path."""
+        write_zip(zip_path, self.entries, self.chunk_size, workers=settings.ZIP_COMPRESSION_THREADS)
+
+
+async def create_streaming_zip_response(
+    files_to_zip: List[Tuple[str, str]], filename: str, compression: Optional[int] = None
+):
     """
     Create a streaming response for zip file download.
     
     Args:
         files_to_zip: List of tuples (file_path, archive_name)
         filename: Name for the downloaded zip file
+        compression: zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED or None to choose per file. Archives where every
+            entry ends up STORED are sent with a Content-Length
         
     Returns:
-        StreamingResponse object
+        StreamingResponse object. The archive is always streamed, even when downloads are offloaded to nginx:
+        writing it to disk first would delay the first byte by the whole archive and leave a copy to clean up.
+        Zips worth keeping on disk are prebuilt as archive bundles, which are offloaded like any other file.
     """
     from fastapi.responses import StreamingResponse
     
-    streamer = StreamingZip(files_to_zip)
-    
+    # Sampling files for the compression policy reads from disk, keep it off the event loop
+    streamer = await asyncio.to_thread(StreamingZip, files_to_zip, compression=compression)
+
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+    size = streamer.size
+    if size is not None:
+        headers["Content-Length"] = str(size)
     return StreamingResponse(
         streamer.generate(),
         media_type="application/x-zip-compressed",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers=headers
     )
 
 
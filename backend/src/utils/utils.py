@@ -7,9 +7,13 @@ import tempfile
 from typing import Union
 from fastapi import BackgroundTasks, UploadFile, HTTPException
 
+from config import settings
+
 logger = logging.getLogger("utils.utils")
 
 CHUNK_SIZE = 1024 * 1024  # adjust the chunk size as desired
+# Request scoped temp files. Kept under MQ_SAVE_DIR so the storage GC can sweep any a crashed request left behind
+PROCESS_TMP_DIR = os.path.join(settings.MQ_SAVE_DIR, "ProcessTmp")
 
 
 async def get_fastapi_file_locally(
@@ -33,7 +37,8 @@ async def get_fastapi_file_locally(
     elif extension == "":
         extension = None
     try:
-        fd, path = tempfile.mkstemp(suffix=extension)
+        os.makedirs(PROCESS_TMP_DIR, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=extension, dir=PROCESS_TMP_DIR)
         async with aiofiles.open(path, 'wb') as f:
             while chunk := await file_data.read(CHUNK_SIZE):
                 await f.write(chunk)
@@ -68,6 +73,7 @@ async def cache_multi_segy(upload_files, background_tasks: BackgroundTasks):
 
 _ID_RE_UNDERSCORE_HYPHEN = re.compile(r'^[a-zA-Z0-9_-]+$')
 _ID_RE_NO_UNDERSCORE_HYPHEN = re.compile(r'^[a-zA-Z0-9]+$')
+_EXTENSION_RE = re.compile(r'^[A-Za-z0-9]{1,8}$')
 
 
 def validate_id(test_id: str, allow_hyphen_underscore: bool = True) -> bool:
@@ -102,3 +108,18 @@ def validate_id(test_id: str, allow_hyphen_underscore: bool = True) -> bool:
     else:
         matched = _ID_RE_NO_UNDERSCORE_HYPHEN.match(test_id)
     return matched is not None
+
+
+def safe_file_extension(file_name: str, default: str = "") -> str:
+    """
+    Extension of a client supplied file name, for building a storage path from a generated file id.
+
+    :param file_name: The original file name.
+    :param default: Returned if the name has no extension, or one that isn't 1-8 letters and digits (which also
+        rules out path separators and "..").
+    :return: The extension without the dot.
+    """
+    if '.' not in file_name:
+        return default
+    extension = file_name.rsplit('.', 1)[-1]
+    return extension if _EXTENSION_RE.match(extension) else default
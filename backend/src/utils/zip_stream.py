@@ -0,0 +1,362 @@
+"""
+Streaming ZIP writer.
+
+Entries are emitted as they are read: a local header, the (optionally deflated) data, then a data descriptor with the
+CRC and sizes, and finally the central directory. Nothing is buffered beyond one chunk and no temp file is used, so
+the first bytes of an archive go out immediately. ZIP64 records are written for entries and archives past the 4 GiB /
+65535 entry limits. When every entry is STORED the archive size is known up front (see `archive_size`).
+
+Entries can pick STORED or DEFLATE per file from a sample of their data (`choose_compression`), since SEG-Y and
+already-compressed files gain little from deflate. Deflated data can be compressed on several threads: the entry is
+split into blocks that are deflated independently, each primed with the previous block's last 32 KiB and ended with
+a sync flush, so the concatenated blocks form one ordinary deflate stream (the approach pigz uses).
+"""
+import os
+import struct
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Sizes, offsets and counts at or past these need ZIP64 records
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP64_COUNT_LIMIT = 0xFFFF
+# Field values that point readers at the ZIP64 records
+_ZIP64_SENTINEL = 0xFFFFFFFF
+_ZIP64_COUNT_SENTINEL = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_DATA_DESCRIPTOR = struct.Struct("<4sIII")
+_DATA_DESCRIPTOR64 = struct.Struct("<4sIQQ")
+_CENTRAL_HEADER = struct.Struct("<4sBBHHHHHIIIHHHHHII")
+_ZIP64_EOCD = struct.Struct("<4sQHHIIQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<4sIQI")
+_EOCD = struct.Struct("<4sHHHHIIH")
+
+_VERSION_ZIP64 = 45
+_VERSION_DEFAULT = 20
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_UNIX_SYSTEM = 3
+_FILE_ATTRIBUTES = (0o100644 << 16)
+
+# Compression policy: sample ratios (deflated / raw) above STORED_RATIO are stored, above FAST_RATIO use FAST_LEVEL
+SAMPLE_SIZE = 64 * 1024
+SAMPLE_COUNT = 3
+STORED_RATIO = 0.9
+FAST_RATIO = 0.7
+FAST_LEVEL = 1
+DEFAULT_LEVEL = 6
+INCOMPRESSIBLE_EXTENSIONS = {".zip", ".gz", ".xz", ".bz2", ".7z", ".png", ".jpg", ".jpeg", ".pdf", ".tfrz"}
+
+# Deflate window; parallel blocks are primed with this much of the preceding data
+_WINDOW_SIZE = 32 * 1024
+# Empty final block that terminates a stream of sync flushed blocks
+_FINAL_BLOCK = zlib.compressobj(DEFAULT_LEVEL, zlib.DEFLATED, -15).flush()
+
+
+@dataclass
+class ZipEntry:
+    """
+    One file of a streamed archive.
+
+    :param name: Path inside the archive.
+    :param size: Uncompressed size in bytes.
+    :param open_source: Returns a readable binary file object with the entry's data.
+    :param compress_type: zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED.
+    :param compress_level: zlib level for deflated entries.
+    :param mtime: Modification time (seconds since the epoch). Defaults to now.
+    """
+    name: str
+    size: int
+    open_source: Callable[[], BinaryIO]
+    compress_type: int = zipfile.ZIP_DEFLATED
+    compress_level: int = 6
+    mtime: Optional[float] = None
+
+
+def choose_compression(source: BinaryIO, size: int) -> Tuple[int, int]:
+    """
+    Pick a compression method and level for a file from how well a few samples of it deflate.
+
+    :param source: Seekable binary file object. Its position is not restored.
+    :param size: Size of the file.
+    :return: Tuple of (zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED, zlib level).
+    """
+    if size == 0:
+        return zipfile.ZIP_STORED, DEFAULT_LEVEL
+    raw = 0
+    compressed = 0
+    # Samples from the start, middle and end; headers alone would make SEG-Y look compressible
+    for i in range(SAMPLE_COUNT):
+        source.seek(max(0, (size - SAMPLE_SIZE) * i // max(SAMPLE_COUNT - 1, 1)))
+        sample = source.read(SAMPLE_SIZE)
+        raw += len(sample)
+        compressed += len(zlib.compress(sample, FAST_LEVEL))
+    ratio = compressed / raw if raw else 1
+    if ratio > STORED_RATIO:
+        return zipfile.ZIP_STORED, DEFAULT_LEVEL
+    if ratio > FAST_RATIO:
+        return zipfile.ZIP_DEFLATED, FAST_LEVEL
+    return zipfile.ZIP_DEFLATED, DEFAULT_LEVEL
+
+
+def policy_entry(
+    name: str,
+    size: int,
+    open_source: Callable[[], BinaryIO],
+    mtime: Optional[float] = None,
+    extension: str = "",
+) -> ZipEntry:
+    """
+    Entry whose compression is chosen by `choose_compression`.
+
+    :param extension: File extension (with the dot). Known compressed formats are stored without sampling.
+    """
+    if extension.lower() in INCOMPRESSIBLE_EXTENSIONS:
+        compress_type, compress_level = zipfile.ZIP_STORED, DEFAULT_LEVEL
+    else:
+        with open_source() as source:
+            compress_type, compress_level = choose_compression(source, size)
+    return ZipEntry(name, size, open_source, compress_type, compress_level, mtime)
+
+
+def file_entry(
+    path: str, name: str, compress_type: Optional[int] = None, compress_level: int = DEFAULT_LEVEL
+) -> ZipEntry:
+    """
+    Entry for a plain file on disk.
+
+    :param compress_type: zipfile.ZIP_STORED or zipfile.ZIP_DEFLATED, or None to choose per file.
+    """
+    stat = os.stat(path)
+    open_source = partial(open, path, "rb")
+    if compress_type is None:
+        return policy_entry(name, stat.st_size, open_source, stat.st_mtime, os.path.splitext(path)[1])
+    return ZipEntry(name, stat.st_size, open_source, compress_type, compress_level, stat.st_mtime)
+
+
+def _dos_time(mtime: Optional[float]) -> tuple[int, int]:
+    t = time.localtime(time.time() if mtime is None else mtime)
+    year = min(max(t.tm_year, 1980), 2107)
+    dos_date = (year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday
+    dos_time = t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+    return dos_time, dos_date
+
+
+def _entry_needs_zip64(entry: ZipEntry) -> bool:
+    # Deflate can expand incompressible data slightly, leave room for that
+    return entry.size + entry.size // 100 + 1024 >= ZIP64_LIMIT
+
+
+def _local_header(name: bytes, entry: ZipEntry, zip64: bool) -> bytes:
+    dos_time, dos_date = _dos_time(entry.mtime)
+    extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0) if zip64 else b""
+    placeholder = _ZIP64_SENTINEL if zip64 else 0
+    return _LOCAL_HEADER.pack(
+        b"PK\x03\x04",
+        _VERSION_ZIP64 if zip64 else _VERSION_DEFAULT,
+        _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+        entry.compress_type,
+        dos_time,
+        dos_date,
+        0,
+        placeholder,
+        placeholder,
+        len(name),
+        len(extra),
+    ) + name + extra
+
+
+def _data_descriptor(crc: int, compressed_size: int, size: int, zip64: bool) -> bytes:
+    if zip64:
+        return _DATA_DESCRIPTOR64.pack(b"PK\x07\x08", crc, compressed_size, size)
+    return _DATA_DESCRIPTOR.pack(b"PK\x07\x08", crc, compressed_size, size)
+
+
+def _central_header(
+    name: bytes, entry: ZipEntry, crc: int, compressed_size: int, offset: int, zip64: bool
+) -> bytes:
+    dos_time, dos_date = _dos_time(entry.mtime)
+    zip64_fields = []
+    size_field, compressed_field, offset_field = entry.size, compressed_size, offset
+    if zip64 or entry.size >= ZIP64_LIMIT:
+        zip64_fields.append(entry.size)
+        size_field = _ZIP64_SENTINEL
+    if zip64 or compressed_size >= ZIP64_LIMIT:
+        zip64_fields.append(compressed_size)
+        compressed_field = _ZIP64_SENTINEL
+    if offset >= ZIP64_LIMIT:
+        zip64_fields.append(offset)
+        offset_field = _ZIP64_SENTINEL
+    extra = b""
+    if zip64_fields:
+        extra = struct.pack(f"<HH{len(zip64_fields)}Q", 0x0001, 8 * len(zip64_fields), *zip64_fields)
+    version = _VERSION_ZIP64 if zip64_fields else _VERSION_DEFAULT
+    return _CENTRAL_HEADER.pack(
+        b"PK\x01\x02",
+        version,
+        _UNIX_SYSTEM,
+        version,
+        _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+        entry.compress_type,
+        dos_time,
+        dos_date,
+        crc,
+        compressed_field,
+        size_field,
+        len(name),
+        len(extra),
+        0,
+        0,
+        0,
+        _FILE_ATTRIBUTES,
+        offset_field,
+    ) + name + extra
+
+
+def _end_records(entry_count: int, central_offset: int, central_size: int) -> bytes:
+    records = b""
+    zip64 = (
+        entry_count >= ZIP64_COUNT_LIMIT or central_offset >= ZIP64_LIMIT or central_size >= ZIP64_LIMIT
+    )
+    if zip64:
+        zip64_eocd_offset = central_offset + central_size
+        records += _ZIP64_EOCD.pack(
+            b"PK\x06\x06", _ZIP64_EOCD.size - 12, _VERSION_ZIP64, _VERSION_ZIP64, 0, 0,
+            entry_count, entry_count, central_size, central_offset,
+        )
+        records += _ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, zip64_eocd_offset, 1)
+    count_field = _ZIP64_COUNT_SENTINEL if entry_count >= ZIP64_COUNT_LIMIT else entry_count
+    records += _EOCD.pack(
+        b"PK\x05\x06", 0, 0, count_field, count_field,
+        _ZIP64_SENTINEL if central_size >= ZIP64_LIMIT else central_size,
+        _ZIP64_SENTINEL if central_offset >= ZIP64_LIMIT else central_offset,
+        0,
+    )
+    return records
+
+
+def _deflate_block(data: bytes, level: int, zdict: bytes) -> bytes:
+    if zdict:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=zdict)
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+def _deflate(
+    source: BinaryIO, level: int, chunk_size: int, executor: Optional[ThreadPoolExecutor], max_pending: int
+) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Deflate a source as a raw deflate stream, yielding (raw chunk, compressed bytes) pairs in order. With an
+    executor, up to max_pending blocks are compressed at once, which bounds memory to a few chunks per thread.
+    """
+    if executor is None:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        while chunk := source.read(chunk_size):
+            yield chunk, compressor.compress(chunk)
+        yield b"", compressor.flush()
+        return
+
+    pending = deque()
+    previous_tail = b""
+    while chunk := source.read(chunk_size):
+        pending.append((chunk, executor.submit(_deflate_block, chunk, level, previous_tail)))
+        previous_tail = chunk[-_WINDOW_SIZE:]
+        if len(pending) >= max_pending:
+            raw, future = pending.popleft()
+            yield raw, future.result()
+    while pending:
+        raw, future = pending.popleft()
+        yield raw, future.result()
+    yield b"", _FINAL_BLOCK
+
+
+def iter_zip(entries: Iterable[ZipEntry], chunk_size: int = 1024 * 1024, workers: int = 0) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the entries, reading each source as it goes.
+
+    :param entries: Entries to write, in order.
+    :param chunk_size: Bytes read from a source at a time, and the block size for parallel deflate.
+    :param workers: Threads used to deflate entries. 0 or 1 deflates in the calling thread.
+    """
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip-deflate") as executor:
+            yield from _iter_zip(entries, chunk_size, executor, max_pending=2 * workers)
+    else:
+        yield from _iter_zip(entries, chunk_size, None, max_pending=0)
+
+
+def write_zip(zip_path: str, entries: Iterable[ZipEntry], chunk_size: int = 1024 * 1024, workers: int = 0):
+    """Write the archive iter_zip produces to zip_path."""
+    with open(zip_path, "wb") as f:
+        for data in iter_zip(entries, chunk_size, workers):
+            f.write(data)
+
+
+def _iter_zip(
+    entries: Iterable[ZipEntry], chunk_size: int, executor: Optional[ThreadPoolExecutor], max_pending: int
+) -> Iterator[bytes]:
+    offset = 0
+    central_directory: List[bytes] = []
+    for entry in entries:
+        name = entry.name.encode("utf-8")
+        zip64 = _entry_needs_zip64(entry)
+        header = _local_header(name, entry, zip64)
+        header_offset = offset
+        yield header
+        offset += len(header)
+
+        crc = 0
+        size = 0
+        compressed_size = 0
+        with entry.open_source() as source:
+            if entry.compress_type == zipfile.ZIP_DEFLATED:
+                blocks = _deflate(source, entry.compress_level, chunk_size, executor, max_pending)
+            else:
+                blocks = ((chunk, chunk) for chunk in iter(partial(source.read, chunk_size), b""))
+            for chunk, data in blocks:
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                if data:
+                    compressed_size += len(data)
+                    yield data
+        if size != entry.size:
+            raise ValueError(f"{entry.name} changed size while it was being archived")
+
+        descriptor = _data_descriptor(crc, compressed_size, size, zip64)
+        yield descriptor
+        offset += compressed_size + len(descriptor)
+        central_directory.append(_central_header(name, entry, crc, compressed_size, header_offset, zip64))
+
+    central_offset = offset
+    central_size = 0
+    for record in central_directory:
+        central_size += len(record)
+        yield record
+    yield _end_records(len(central_directory), central_offset, central_size)
+
+
+def archive_size(entries: Iterable[ZipEntry]) -> Optional[int]:
+    """
+    Exact size of the archive iter_zip will produce, or None if any entry is compressed (its size isn't known until
+    it has been written).
+    """
+    offset = 0
+    central_size = 0
+    count = 0
+    for entry in entries:
+        if entry.compress_type != zipfile.ZIP_STORED:
+            return None
+        name = entry.name.encode("utf-8")
+        zip64 = _entry_needs_zip64(entry)
+        header_offset = offset
+        offset += len(_local_header(name, entry, zip64)) + entry.size + len(_data_descriptor(0, 0, 0, zip64))
+        central_size += len(_central_header(name, entry, 0, entry.size, header_offset, zip64))
+        count += 1
+    return offset + central_size + len(_end_records(count, offset, central_size))
@@ -0,0 +1,75 @@
+"""
+Fixtures for tests that run API routers against a temporary database and data directory.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  (registers every table on Base)
+from database import Base, get_async_db, get_db
+from models.project_model import ProjectDBModel
+from schemas.user_schema import User
+from utils import blob_store
+from utils.authentication import get_current_user
+from utils.project_cache import project_count_cache, project_settings_cache
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the blob store at a temporary directory."""
+    monkeypatch.setattr(blob_store, "BLOB_DIR", str(tmp_path / "Blobs"))
+    monkeypatch.setattr(blob_store, "BLOB_TMP_DIR", str(tmp_path / "Blobs" / "tmp"))
+    return tmp_path
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    # A file rather than :memory:, so the sync and async engines see the same database
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def test_db(db_path):
+    """A fresh database holding one project, "project"."""
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autoflush=False, bind=engine)()
+    db.add(ProjectDBModel(id="project", name="Project"))
+    db.commit()
+    # The caches outlive the database of a single test
+    project_settings_cache.clear()
+    project_count_cache.clear()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def make_client(test_db, db_path, data_dir):
+    """Build a test client for some routers, signed in as a level 1 user."""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async_session = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    clients = []
+
+    async def get_test_async_db():
+        async with async_session() as db:
+            yield db
+
+    def make(*routers) -> TestClient:
+        app = FastAPI()
+        for router in routers:
+            app.include_router(router)
+        app.dependency_overrides[get_db] = lambda: test_db
+        app.dependency_overrides[get_async_db] = get_test_async_db
+        app.dependency_overrides[get_current_user] = lambda: User(username="tester", auth_level=1, disabled=False)
+        client = TestClient(app)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+    async_engine.sync_engine.dispose()
@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import text
+
+from crud.aio import project_crud as async_project_crud
+from crud.project_crud import update_project_columns
+from router.project_router import project_router
+from utils.project_cache import project_settings_cache
+
+PICK = {"d1": 1.0, "d2": 2.0, "frequency": 10.0, "d3": 3.0, "slowness": 0.004, "d4": 4.0, "d5": 5.0}
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(project_router)
+
+
+def _project_data(client):
+    response = client.get("/project/project/project-data")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestProjectSettingsCache:
+    """Test that cached project settings never outlive the data they were read from."""
+
+    def test_write_during_load_is_not_cached(self, client, test_db, monkeypatch):
+        """Test that a load overtaken by a committed write returns its data but does not cache it."""
+        read_picks = async_project_crud.get_project_picks
+
+        async def read_picks_after_write(db, project_id):
+            # The project's columns were read already, the write commits before the load finishes
+            update_project_columns(test_db, project_id, name="Renamed")
+            return await read_picks(db, project_id)
+
+        monkeypatch.setattr(async_project_crud, "get_project_picks", read_picks_after_write)
+        assert _project_data(client)["name"] == "Project"
+        assert project_settings_cache.get("project") is None
+
+        monkeypatch.setattr(async_project_crud, "get_project_picks", read_picks)
+        assert _project_data(client)["name"] == "Renamed"
+        assert project_settings_cache.get("project")["name"] == "Renamed"
+
+    def test_revision_from_another_process(self, client, test_db):
+        """Test that an entry is served until the DB revision moves, as writes of other processes make it."""
+        assert _project_data(client)["name"] == "Project"
+
+        # Raw SQL, so this process's cache is not invalidated
+        test_db.execute(text("UPDATE projects SET name = 'Unseen' WHERE id = 'project'"))
+        test_db.commit()
+        assert _project_data(client)["name"] == "Project"
+
+        test_db.execute(text("UPDATE projects SET name = 'Other', revision = revision + 1 WHERE id = 'project'"))
+        test_db.commit()
+        assert _project_data(client)["name"] == "Other"
@@ -0,0 +1,43 @@
+import pytest
+
+from crud.project_crud import update_project_columns
+from router.project_router import project_router
+
+PICK = {"d1": 1.0, "d2": 2.0, "frequency": 10.0, "d3": 3.0, "slowness": 0.004, "d4": 4.0, "d5": 5.0}
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(project_router)
+
+
+class TestProjectEtags:
+    """Test conditional GETs of project data and of the project list."""
+
+    def test_project_data_not_modified(self, client):
+        """Test that If-None-Match gets 304 until the project is written to."""
+        etag = client.get("/project/project/project-data").headers["ETag"]
+
+        response = client.get("/project/project/project-data", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        client.post("/project/project/picks", json=[PICK])
+        response = client.get("/project/project/project-data", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["picks"][0]["frequency"] == 10.0
+
+    def test_project_list_not_modified(self, client, test_db):
+        """Test that If-None-Match gets 304 on the list until a project on the page changes."""
+        params = {"view": "summary"}
+        etag = client.get("/project/", params=params).headers["ETag"]
+
+        response = client.get("/project/", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+        update_project_columns(test_db, "project", name="Renamed")
+        response = client.get("/project/", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["items"][0]["name"] == "Renamed"
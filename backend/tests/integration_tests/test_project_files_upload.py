@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from models.file_model import FileDBModel
+from router import project_router as project_router_module
+from router.project_router import project_router
+from utils import blob_store
+
+
+@pytest.fixture
+def client(make_client, data_dir, monkeypatch):
+    monkeypatch.setattr(project_router_module, "GLOBAL_PROJECT_FILES_DIR", str(data_dir / "ProjectFiles"))
+    return make_client(project_router)
+
+
+def _upload(client, project_id: str = "project"):
+    return client.post(
+        f"/project/{project_id}/upload-files",
+        files=[("files", ("notes.txt", b"field notes", "text/plain")), ("files", ("map.pdf", b"%PDF", None))],
+    )
+
+
+class TestProjectFilesUpload:
+    """Test uploading additional files to a project."""
+
+    def test_upload(self, client, test_db):
+        """Test that every file gets a row and a file on disk."""
+        response = _upload(client)
+        assert response.status_code == 201, response.text
+        file_infos = response.json()["file_infos"]
+        assert [info["original_name"] for info in file_infos] == ["notes.txt", "map.pdf"]
+        assert test_db.query(FileDBModel).count() == 2
+        for info in file_infos:
+            assert os.path.exists(info["path"])
+
+    def test_unknown_project(self, client, test_db, data_dir):
+        """Test that uploading to a project that doesn't exist is a 404 before anything is staged or written."""
+        assert _upload(client, project_id="missing").status_code == 404
+        assert test_db.query(FileDBModel).count() == 0
+        assert not os.path.exists(data_dir / "ProjectFiles" / "missing")
+        assert not os.path.exists(blob_store.BLOB_TMP_DIR) or os.listdir(blob_store.BLOB_TMP_DIR) == []
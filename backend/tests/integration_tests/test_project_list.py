@@ -0,0 +1,102 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from models.project_model import ProjectDBModel
+from router.project_router import SortField, SortOrder, project_router
+from utils.custom_types.Priority import Priority
+from utils.custom_types.ProjectStatus import ProjectStatus
+
+# Repeating values, with gaps, so every sort field has ties and NULLs for the id to break
+NAMES = ["Beta", "Alpha", "Beta", "Alpha", "Gamma"]
+STATUSES = [None, ProjectStatus.completed, ProjectStatus.in_progress, ProjectStatus.completed]
+PRIORITIES = [Priority.high, None, Priority.low, Priority.high, None, Priority.medium]
+DATES = [None, datetime(2024, 5, 1), datetime(2024, 5, 1), datetime(2023, 1, 15)]
+
+
+@pytest.fixture
+def client(make_client, test_db):
+    test_db.add_all(
+        ProjectDBModel(
+            id=f"p{i:02d}",
+            name=NAMES[i % len(NAMES)],
+            status=STATUSES[i % len(STATUSES)],
+            priority=PRIORITIES[i % len(PRIORITIES)],
+            survey_date=DATES[i % len(DATES)],
+            received_date=DATES[(i + 1) % len(DATES)],
+        )
+        for i in range(13)
+    )
+    test_db.commit()
+    return make_client(project_router)
+
+
+def _expected_ids(test_db, sort_by: SortField, sort_order: SortOrder) -> list:
+    """Project ids in the order the list should have: by the field, then id, with NULLs first ascending."""
+
+    def key(project):
+        value = getattr(project, sort_by.value)
+        if isinstance(value, (ProjectStatus, Priority)):
+            # Enum columns store, and so sort by, the member name
+            value = value.name
+        return value is not None, value if value is not None else "", project.id
+
+    projects = sorted(test_db.query(ProjectDBModel), key=key, reverse=sort_order == SortOrder.DESC)
+    return [project.id for project in projects]
+
+
+def _list(client, **params):
+    response = client.get("/project/", params={"view": "summary", "include_total": False, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestProjectListCursor:
+    """Test keyset paging of the project list."""
+
+    @pytest.mark.parametrize("sort_order", list(SortOrder))
+    @pytest.mark.parametrize("sort_by", list(SortField))
+    def test_walk(self, client, test_db, sort_by, sort_order):
+        """Test that following next_cursor visits every project once, in the order of one unpaged listing."""
+        params = {"sort_by": sort_by.value, "sort_order": sort_order.value}
+        expected = _expected_ids(test_db, sort_by, sort_order)
+        assert [item["id"] for item in _list(client, limit=100, **params)["items"]] == expected
+
+        walked, cursor = [], None
+        for _ in range(len(expected)):
+            page = _list(client, limit=3, **params, **({"cursor": cursor} if cursor else {}))
+            walked += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert walked == expected
+
+    def test_last_page_full(self, client, test_db):
+        """Test that a cursor after the last project gives an empty page and no further cursor."""
+        total = test_db.query(ProjectDBModel).count()
+        page = _list(client, limit=total)
+        assert page["next_cursor"] is not None
+
+        page = _list(client, limit=total, cursor=page["next_cursor"])
+        assert page["items"] == []
+        assert page["next_cursor"] is None
+
+    def test_page_number(self, client):
+        """Test that skip/limit pages report their number and cursor pages, whose position is unknown, report none."""
+        assert _list(client, limit=3, skip=6)["page"] == 3
+        page = _list(client, limit=3)
+        assert page["page"] == 1
+        assert _list(client, limit=3, cursor=page["next_cursor"])["page"] is None
+
+    @pytest.mark.parametrize("cursor", [
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(json.dumps(["not a date", "p01"]).encode()).decode(),
+        base64.urlsafe_b64encode(json.dumps(["2024-05-01T00:00:00"]).encode()).decode(),
+    ])
+    def test_invalid_cursor(self, client, cursor):
+        """Test that a malformed cursor is rejected with 400 rather than failing the query."""
+        response = client.get("/project/", params={"cursor": cursor, "sort_by": "survey_date"})
+        assert response.status_code == 400
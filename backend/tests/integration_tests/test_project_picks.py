@@ -0,0 +1,60 @@
+import pytest
+
+from router.project_router import project_router
+
+PICK = {"d1": 1.0, "d2": 2.0, "frequency": 10.0, "d3": 3.0, "slowness": 0.004, "d4": 4.0, "d5": 5.0}
+
+
+@pytest.fixture
+def client(make_client):
+    return make_client(project_router)
+
+
+def _patch(client, edits: list, base_revision: int | None = None):
+    return client.patch("/project/project/picks", json={"base_revision": base_revision, "edits": edits})
+
+
+class TestPatchPicks:
+    """Test editing single picks with the project revision as a conflict check."""
+
+    def test_edits_bump_revision(self, client):
+        """Test that add, move and delete apply together and return the next revision and the new ids."""
+        revision = client.post("/project/project/picks", json=[PICK, PICK]).json()["revision"]
+        first, second = [pick["id"] for pick in client.get("/project/project/picks").json()]
+
+        response = _patch(client, [
+            {"op": "add", "pick": {**PICK, "frequency": 30.0}},
+            {"op": "move", "id": first, "pick": {**PICK, "frequency": 15.0}},
+            {"op": "delete", "id": second},
+        ], base_revision=revision)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["revision"] == revision + 1
+
+        picks = client.get("/project/project/picks").json()
+        assert [pick["id"] for pick in picks] == [first, *body["added_ids"]]
+        assert [pick["frequency"] for pick in picks] == [15.0, 30.0]
+
+    def test_stale_base_revision(self, client):
+        """Test that edits based on an old revision are rejected with 409 and the current revision, writing nothing."""
+        revision = client.post("/project/project/picks", json=[PICK]).json()["revision"]
+        assert _patch(client, [{"op": "add", "pick": PICK}], base_revision=revision).status_code == 200
+
+        response = _patch(client, [{"op": "add", "pick": PICK}], base_revision=revision)
+        assert response.status_code == 409
+        assert response.json()["detail"]["revision"] == revision + 1
+        assert len(client.get("/project/project/picks").json()) == 2
+
+    def test_without_base_revision(self, client):
+        """Test that edits without a base revision skip the check."""
+        client.post("/project/project/picks", json=[PICK])
+        client.post("/project/project/picks", json=[PICK])
+        assert _patch(client, [{"op": "add", "pick": PICK}]).status_code == 200
+
+    def test_unknown_pick(self, client):
+        """Test that moving a pick of another project is a 404 and leaves the revision alone."""
+        revision = client.post("/project/project/picks", json=[PICK]).json()["revision"]
+
+        response = _patch(client, [{"op": "delete", "id": 999}], base_revision=revision)
+        assert response.status_code == 404
+        assert _patch(client, [], base_revision=revision).status_code == 200
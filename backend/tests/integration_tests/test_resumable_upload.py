@@ -0,0 +1,120 @@
+import hashlib
+import os
+
+import pytest
+
+from crud.blob_crud import get_blob
+from models.project_model import ProjectDBModel
+from models.sgy_file_model import SgyFileDBModel
+from models.upload_session_model import UploadSessionDBModel
+from router import sgy_file_router as sgy_file_router_module
+from router.sgy_file_router import sgy_file_router
+from utils.blob_store import blob_path
+
+DATA = b"\x01" * 3000 + b"\x02" * 2000
+
+
+@pytest.fixture
+def client(make_client, data_dir, monkeypatch):
+    monkeypatch.setattr(sgy_file_router_module, "GLOBAL_SGY_FILES_DIR", str(data_dir / "SGYFiles"))
+    monkeypatch.setattr(sgy_file_router_module, "schedule_bundle_build", lambda project_id: None)
+    return make_client(sgy_file_router)
+
+
+def _start(client, size: int = len(DATA), checksum: str | None = None, project_id: str = "project"):
+    return client.post(
+        f"/sgy-files/project/{project_id}/uploads",
+        json={"original_name": "line1.sgy", "size": size, "checksum": checksum},
+    )
+
+
+def _put(client, upload_id: str, offset: int, chunk: bytes):
+    return client.put(f"/sgy-files/uploads/{upload_id}", params={"offset": offset}, content=chunk)
+
+
+class TestResumableUpload:
+    """Test uploading a SEG-Y file in chunks and finalizing it into the project."""
+
+    def test_chunks_and_finalize(self, client, test_db):
+        """Test that chunks append at the recorded offset and finalize registers the file and its blob."""
+        upload_id = _start(client, checksum=hashlib.sha256(DATA).hexdigest()).json()["id"]
+        assert _put(client, upload_id, 0, DATA[:3000]).json()["offset"] == 3000
+        assert client.get(f"/sgy-files/uploads/{upload_id}").json()["offset"] == 3000
+        assert _put(client, upload_id, 3000, DATA[3000:]).json()["offset"] == len(DATA)
+
+        response = client.post(f"/sgy-files/uploads/{upload_id}/finalize")
+        assert response.status_code == 201
+        path = response.json()["path"]
+        assert path.endswith(f"{upload_id}.sgy")
+        with open(path, "rb") as f:
+            assert f.read() == DATA
+        row = test_db.get(SgyFileDBModel, upload_id)
+        assert row.content_hash == hashlib.sha256(DATA).hexdigest()
+        assert get_blob(test_db, row.content_hash).ref_count == 1
+        assert os.path.samefile(path, blob_path(row.content_hash))
+        assert test_db.get(UploadSessionDBModel, upload_id) is None
+        assert client.get(f"/sgy-files/uploads/{upload_id}").status_code == 404
+
+    def test_offset_mismatch(self, client):
+        """Test that a chunk at the wrong offset is rejected with the offset to resume from."""
+        upload_id = _start(client).json()["id"]
+        _put(client, upload_id, 0, DATA[:1000])
+
+        response = _put(client, upload_id, 500, DATA[500:1500])
+        assert response.status_code == 409
+        assert response.json()["detail"]["offset"] == 1000
+
+    def test_chunk_past_declared_size(self, client):
+        """Test that data beyond the declared size is refused."""
+        upload_id = _start(client, size=100).json()["id"]
+        assert _put(client, upload_id, 0, DATA[:101]).status_code == 413
+
+    def test_finalize_incomplete(self, client):
+        """Test that an upload can't be finalized before all of its bytes arrived."""
+        upload_id = _start(client).json()["id"]
+        _put(client, upload_id, 0, DATA[:1000])
+
+        response = client.post(f"/sgy-files/uploads/{upload_id}/finalize")
+        assert response.status_code == 409
+        assert response.json()["detail"]["offset"] == 1000
+
+    def test_checksum_mismatch_restarts(self, client, test_db):
+        """Test that a checksum mismatch on finalize discards the data and restarts the upload."""
+        upload_id = _start(client, checksum=hashlib.sha256(b"something else").hexdigest()).json()["id"]
+        _put(client, upload_id, 0, DATA)
+
+        assert client.post(f"/sgy-files/uploads/{upload_id}/finalize").status_code == 422
+        assert client.get(f"/sgy-files/uploads/{upload_id}").json()["offset"] == 0
+        assert test_db.query(SgyFileDBModel).count() == 0
+        assert _put(client, upload_id, 0, DATA[:10]).status_code == 200
+
+    def test_unknown_project(self, client, test_db):
+        """Test that uploads can only be started, and finalized, in a project that exists."""
+        assert _start(client, project_id="missing").status_code == 404
+
+        upload_id = _start(client).json()["id"]
+        _put(client, upload_id, 0, DATA)
+        test_db.query(ProjectDBModel).delete()
+        test_db.commit()
+        assert client.post(f"/sgy-files/uploads/{upload_id}/finalize").status_code == 404
+        assert test_db.query(SgyFileDBModel).count() == 0
+
+    def test_finalize_is_atomic(self, client, test_db, monkeypatch):
+        """Test that a failure while registering the file leaves no row, blob or file and restarts the upload."""
+        upload_id = _start(client).json()["id"]
+        _put(client, upload_id, 0, DATA)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(sgy_file_router_module, "create_sgy_files_info", fail)
+        response = client.post(f"/sgy-files/uploads/{upload_id}/finalize")
+        assert response.status_code == 500
+
+        content_hash = hashlib.sha256(DATA).hexdigest()
+        assert test_db.query(SgyFileDBModel).count() == 0
+        assert get_blob(test_db, content_hash) is None
+        assert not os.path.exists(blob_path(content_hash))
+        session = test_db.get(UploadSessionDBModel, upload_id)
+        assert session is not None and session.offset == 0
+        assert not os.path.exists(session.path)
@@ -0,0 +1,126 @@
+"""
+Throughput of the SQLite tuning profile against SQLite's defaults.
+
+Several processes (standing in for the API workers and the consumer) share one database file and run a mix of project
+writes and project list reads, first with the engine set up the way database.py used to (rollback journal, default
+pragmas and pool) and then with the profile from the settings (SQLITE_* and DB_POOL_*).
+
+Run from backend/src:
+
+    python ../tests/manual_tests/sqlite_tuning_benchmark.py [--processes 4] [--threads 4] [--seconds 10]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, SQLITE_PRAGMAS, engine_options, tune_sqlite_engine
+import models  # noqa: F401  (registers every table on Base)
+from models.project_model import ProjectDBModel
+
+PROFILES = ("default", "tuned")
+
+
+def make_engine(url: str, profile: str):
+    if profile == "default":
+        return create_engine(url, connect_args={"check_same_thread": False})
+    engine = create_engine(url, **engine_options(url))
+    tune_sqlite_engine(engine, SQLITE_PRAGMAS)
+    return engine
+
+
+def run_worker(url: str, profile: str, threads: int, seconds: float, write_ratio: float) -> dict:
+    """One process: threads running transactions until the time is up."""
+    engine = make_engine(url, profile)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def loop():
+        rng = random.Random()
+        local = {"reads": 0, "writes": 0, "locked": 0}
+        while time.monotonic() < deadline:
+            try:
+                with Session() as db:
+                    if rng.random() < write_ratio:
+                        project_id = uuid.uuid4().hex
+                        db.add(ProjectDBModel(id=project_id, name=f"Benchmark {project_id[:8]}"))
+                        db.flush()
+                        db.execute(
+                            update(ProjectDBModel).where(ProjectDBModel.id == project_id)
+                            .values(revision=ProjectDBModel.revision + 1)
+                        )
+                        db.commit()
+                        local["writes"] += 1
+                    else:
+                        db.scalar(select(func.count()).select_from(ProjectDBModel))
+                        db.scalars(
+                            select(ProjectDBModel).order_by(ProjectDBModel.received_date.desc()).limit(50)
+                        ).all()
+                        local["reads"] += 1
+            except OperationalError as e:
+                if "locked" not in str(e):
+                    raise
+                local["locked"] += 1
+        with lock:
+            for key, value in local.items():
+                counts[key] += value
+
+    workers = [threading.Thread(target=loop) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    engine.dispose()
+    return counts
+
+
+def run_profile(profile: str, processes: int, threads: int, seconds: float, write_ratio: float) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), f"{profile}.db")
+    url = f"sqlite:///{path}"
+    setup_engine = make_engine(url, profile)
+    Base.metadata.create_all(bind=setup_engine)
+    setup_engine.dispose()
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(
+            run_worker, *zip(*[(url, profile, threads, seconds, write_ratio)] * processes)
+        ))
+    totals = {key: sum(result[key] for result in results) for key in results[0]}
+    totals["ops_per_second"] = (totals["reads"] + totals["writes"]) / seconds
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare SQLite throughput with and without the tuning profile.")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4, help="Threads per process")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of transactions that write")
+    args = parser.parse_args()
+
+    print(
+        f"=== {args.processes} processes x {args.threads} threads, {args.seconds}s, "
+        f"{args.write_ratio:.0%} writes ==="
+    )
+    print(f"Tuned pragmas: {SQLITE_PRAGMAS}")
+    results = {}
+    for profile in PROFILES:
+        results[profile] = run_profile(profile, args.processes, args.threads, args.seconds, args.write_ratio)
+        result = results[profile]
+        print(
+            f"{profile:>8}: {result['ops_per_second']:8.1f} ops/s  "
+            f"({result['reads']} reads, {result['writes']} writes, {result['locked']} 'database is locked' errors)"
+        )
+    if results["default"]["ops_per_second"]:
+        speedup = results["tuned"]["ops_per_second"] / results["default"]["ops_per_second"]
+        print(f"Speedup: {speedup:.1f}x")
@@ -0,0 +1,131 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import models  # noqa: F401  (registers every table on Base)
+from crud.aio import file_crud, project_crud, sgy_file_crud
+from crud.project_crud import RevisionConflict
+from database import Base
+from models.file_model import FileDBModel
+from models.project_model import ProjectDBModel
+from models.sgy_file_model import SgyFileDBModel
+from schemas.project_schema import ProjectUpdate
+from utils.custom_types.ProjectStatus import ProjectStatus
+from utils.project_cache import project_settings_cache
+
+PICK = {"d1": 1.0, "d2": 2.0, "frequency": 10.0, "d3": 3.0, "slowness": 0.004, "d4": 4.0, "d5": 5.0}
+
+
+@pytest.fixture
+def async_session(tmp_path):
+    """Sessions on a fresh database holding "project", with one record and one additional file."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(ProjectDBModel.__table__.insert(), {"id": "project", "name": "Project"})
+        connection.execute(SgyFileDBModel.__table__.insert(), {
+            "id": "record", "original_name": "record.sgy", "path": "record.sgy", "size": 1, "type": "SGY",
+            "project_id": "project",
+        })
+        connection.execute(FileDBModel.__table__.insert(), {
+            "id": "file", "original_name": "notes.txt", "path": "notes.txt", "size": 1, "mime_type": "text/plain",
+            "file_extension": "txt", "project_id": "project",
+        })
+    engine.dispose()
+    project_settings_cache.clear()
+
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    yield async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    async_engine.sync_engine.dispose()
+
+
+class TestAsyncProjectCrud:
+    """Test the async project CRUD functions against a database."""
+
+    @pytest.mark.asyncio
+    async def test_get_project_loads_relationships(self, async_session):
+        """Test that the project comes with its records, files and picks readable outside the session."""
+        async with async_session() as db:
+            await project_crud.replace_project_picks(db, "project", [PICK])
+        async with async_session() as db:
+            project = await project_crud.get_project(db, "project")
+            assert await project_crud.get_project(db, "missing") is None
+        assert [record.id for record in project.records] == ["record"]
+        assert [file.id for file in project.additional_files] == ["file"]
+        assert [pick.frequency for pick in project.picks] == [10.0]
+        assert project.client is None
+
+    @pytest.mark.asyncio
+    async def test_fields_and_revision(self, async_session):
+        """Test reading single columns, and that column writes bump the revision."""
+        async with async_session() as db:
+            assert await project_crud.get_project_revision(db, "project") == 0
+            assert await project_crud.update_project_columns(db, "project", name="Renamed")
+            assert not await project_crud.update_project_columns(db, "missing", name="Renamed")
+            assert tuple(await project_crud.get_project_fields(db, "project", "name", "revision")) == ("Renamed", 1)
+            assert await project_crud.get_project_fields(db, "missing", "name") is None
+            assert await project_crud.get_project_revision(db, "missing") is None
+
+    @pytest.mark.asyncio
+    async def test_picks(self, async_session):
+        """Test replacing and patching picks, including a patch against a stale revision."""
+        async with async_session() as db:
+            revision = await project_crud.replace_project_picks(db, "project", [PICK, {**PICK, "frequency": 20.0}])
+            first, second = [pick["id"] for pick in await project_crud.get_project_picks(db, "project")]
+
+            new_revision, added_ids = await project_crud.patch_project_picks(
+                db, "project", [{**PICK, "frequency": 30.0}], {first: {**PICK, "frequency": 15.0}}, [second], revision
+            )
+            assert new_revision == revision + 1
+            picks = await project_crud.get_project_picks(db, "project")
+            assert [pick["id"] for pick in picks] == [first, *added_ids]
+            assert [pick["frequency"] for pick in picks] == [15.0, 30.0]
+
+            with pytest.raises(RevisionConflict) as conflict:
+                await project_crud.patch_project_picks(db, "project", [PICK], {}, [], revision)
+            assert conflict.value.current_revision == new_revision
+            assert len(await project_crud.get_project_picks(db, "project")) == 2
+
+    @pytest.mark.asyncio
+    async def test_create_update_delete(self, async_session):
+        """Test that writes run through the sync CRUD and update returns the reloaded project."""
+        async with async_session() as db:
+            await project_crud.create_default_project(db, "other")
+            assert await project_crud.get_project_revision(db, "other") == 0
+
+            updated = await project_crud.update_project(
+                db, "project", ProjectUpdate(name="Updated", status=ProjectStatus.completed)
+            )
+            assert (updated.name, updated.status) == ("Updated", ProjectStatus.completed)
+            assert [record.id for record in updated.records] == ["record"]
+            assert await project_crud.update_project(db, "missing", ProjectUpdate(name="Updated")) is None
+
+            assert await project_crud.delete_project(db, "other")
+            assert not await project_crud.delete_project(db, "missing")
+            assert await project_crud.get_project(db, "other") is None
+
+
+class TestAsyncFileCrud:
+    """Test the async record and additional file CRUD functions."""
+
+    @pytest.mark.asyncio
+    async def test_sgy_files(self, async_session):
+        """Test reading records by id and by project, and deleting one."""
+        async with async_session() as db:
+            assert (await sgy_file_crud.get_sgy_file_info(db, "record")).original_name == "record.sgy"
+            assert [row.id for row in await sgy_file_crud.get_sgy_files_info_by_project(db, "project")] == ["record"]
+            assert await sgy_file_crud.get_sgy_files_info_by_project(db, "project", skip=1) == []
+            assert await sgy_file_crud.delete_sgy_file_info(db, "record")
+            assert await sgy_file_crud.get_sgy_file_info(db, "record") is None
+            assert await project_crud.get_project_revision(db, "project") == 1
+
+    @pytest.mark.asyncio
+    async def test_files(self, async_session):
+        """Test reading additional files by id and by project, and deleting one."""
+        async with async_session() as db:
+            assert (await file_crud.get_file_info(db, "file")).original_name == "notes.txt"
+            assert [row.id for row in await file_crud.get_files_info_by_project(db, "project")] == ["file"]
+            assert await file_crud.delete_file_info(db, "file")
+            assert not await file_crud.delete_file_info(db, "file")
+            assert await file_crud.get_files_info_by_project(db, "project") == []
@@ -0,0 +1,130 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  (registers every table on Base)
+from crud.project_crud import get_project_picks
+from database import Base
+from migrations.schema_updates import apply_schema_updates, migrate_project_data
+from models.project_model import ProjectDBModel
+
+# The tables as they were created before content hashes, revisions, pick rows and packed arrays
+BASELINE_DDL = [
+    """
+    CREATE TABLE projects (
+        id VARCHAR NOT NULL PRIMARY KEY,
+        name VARCHAR NOT NULL,
+        status VARCHAR(11),
+        priority VARCHAR(9),
+        survey_date DATETIME,
+        received_date DATETIME,
+        geometry VARCHAR,
+        record_options VARCHAR,
+        plot_limits VARCHAR,
+        freq VARCHAR,
+        slow VARCHAR,
+        picks VARCHAR,
+        disper_settings VARCHAR,
+        display_units VARCHAR(2) DEFAULT 'm',
+        asce_version VARCHAR(9) DEFAULT 'ASCE 7-22',
+        client_id INTEGER
+    )
+    """,
+    """
+    CREATE TABLE sgy_files (
+        id VARCHAR NOT NULL PRIMARY KEY,
+        original_name VARCHAR NOT NULL,
+        path VARCHAR NOT NULL,
+        size INTEGER NOT NULL,
+        upload_date DATETIME DEFAULT (CURRENT_TIMESTAMP),
+        type VARCHAR NOT NULL,
+        project_id VARCHAR REFERENCES projects (id)
+    )
+    """,
+]
+
+PICK = {"d1": 1.0, "d2": 2.0, "frequency": 10.0, "d3": 3.0, "slowness": 0.004, "d4": 4.0, "d5": 5.0}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        for ddl in BASELINE_DDL:
+            connection.execute(text(ddl))
+        connection.execute(
+            # Enum columns hold member names, as the ORM wrote them
+            text(
+                "INSERT INTO projects (id, name, freq, slow, picks, display_units, asce_version) "
+                "VALUES (:id, :name, :freq, :slow, :picks, 'meters', 'asce_722')"
+            ),
+            [
+                {"id": "legacy", "name": "Legacy", "freq": "[1.5, 2.5]", "slow": "[0.01, 0.02]",
+                 "picks": json.dumps([PICK, {**PICK, "frequency": 20.0}])},
+                {"id": "empty", "name": "Empty", "freq": None, "slow": None, "picks": "[]"},
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+def _upgrade(engine):
+    """Run the schema steps of the application startup."""
+    Base.metadata.create_all(bind=engine)
+    apply_schema_updates(engine)
+    migrate_project_data(engine)
+
+
+class TestSchemaUpdates:
+    """Test upgrading a database created before the schema changes."""
+
+    def test_added_columns(self, engine):
+        """Test that missing columns are added, with defaults for the existing rows."""
+        _upgrade(engine)
+        inspector = inspect(engine)
+        assert "content_hash" in {c["name"] for c in inspector.get_columns("sgy_files")}
+        assert "ix_sgy_files_content_hash" in {i["name"] for i in inspector.get_indexes("sgy_files")}
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT DISTINCT revision FROM projects")).scalars().all() == [0]
+
+    def test_legacy_picks_moved(self, engine):
+        """Test that JSON picks become ordered pick rows and the legacy column is cleared."""
+        _upgrade(engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            picks = get_project_picks(db, "legacy")
+            assert [pick["frequency"] for pick in picks] == [10.0, 20.0]
+            assert {key: value for key, value in picks[0].items() if key != "id"} == PICK
+            assert get_project_picks(db, "empty") == []
+        finally:
+            db.close()
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM projects WHERE picks IS NOT NULL")).scalar() == 0
+
+    def test_text_arrays_packed(self, engine):
+        """Test that freq/slow JSON text is rewritten as packed bytes and reads back as the same lists."""
+        _upgrade(engine)
+        with engine.connect() as connection:
+            assert connection.execute(
+                text("SELECT typeof(freq), typeof(slow) FROM projects WHERE id = 'legacy'")
+            ).one() == ("blob", "blob")
+        db = sessionmaker(bind=engine)()
+        try:
+            project = db.get(ProjectDBModel, "legacy")
+            assert project.freq == [1.5, 2.5]
+            assert project.slow == [0.01, 0.02]
+            assert db.get(ProjectDBModel, "empty").freq is None
+        finally:
+            db.close()
+
+    def test_idempotent(self, engine):
+        """Test that running the upgrade again, as every startup does, changes nothing."""
+        _upgrade(engine)
+        _upgrade(engine)
+        with engine.connect() as connection:
+            assert connection.execute(
+                text("SELECT count(*) FROM project_picks WHERE project_id = 'legacy'")
+            ).scalar() == 2
+            assert connection.execute(text("SELECT typeof(freq) FROM projects WHERE id = 'legacy'")).scalar() == "blob"
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import zipfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  (registers every table on Base)
+from config import settings
+from database import Base
+from models.project_model import ProjectDBModel
+from models.sgy_file_model import SgyFileDBModel
+from utils import archive_bundles, archive_storage
+from utils.archive_bundles import bundle_key, build_bundle, get_bundle, invalidate_bundles, schedule_bundle_build
+from utils.blob_store import hash_file
+from utils.custom_types.ProjectStatus import ProjectStatus
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A database holding "project" with two records on disk, used by the bundle builder too."""
+    monkeypatch.setattr(archive_bundles, "ARCHIVE_BUNDLES_DIR", str(tmp_path / "ArchiveBundles"))
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, bind=engine)
+    monkeypatch.setattr(archive_bundles, "SessionLocal", factory)
+    monkeypatch.setattr(archive_storage, "SessionLocal", factory)
+
+    session = factory()
+    session.add(ProjectDBModel(id="project", name="Project"))
+    for file_id, data in (("a", b"first record"), ("b", b"second record")):
+        _add_record(session, tmp_path, file_id, data)
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_record(db, tmp_path, file_id: str, data: bytes) -> SgyFileDBModel:
+    path = tmp_path / "SGYFiles" / "project" / f"{file_id}.sgy"
+    os.makedirs(path.parent, exist_ok=True)
+    path.write_bytes(data)
+    record = SgyFileDBModel(
+        id=file_id, original_name=f"{file_id}.sgy", path=str(path), size=len(data), type="SGY",
+        project_id="project", content_hash=hash_file(str(path))[0],
+    )
+    db.add(record)
+    return record
+
+
+def _records(db) -> list:
+    return db.query(SgyFileDBModel).all()
+
+
+class TestBundleKey:
+    """Test the keys identifying a project's record set."""
+
+    def test_key_follows_record_set(self, db):
+        """Test that the key ignores order but changes with the ids, names and contents of the records."""
+        records = _records(db)
+        key = bundle_key(records)
+        assert bundle_key(list(reversed(records))) == key
+
+        records[0].original_name = "renamed.sgy"
+        assert bundle_key(records) != key
+        db.rollback()
+        records[0].content_hash = "0" * 64
+        assert bundle_key(records) != key
+        db.rollback()
+        assert bundle_key(records[:1]) != key
+
+    def test_records_without_hash(self, db):
+        """Test that records stored before content hashes key by their file, so rewriting one changes the key."""
+        records = _records(db)
+        for record in records:
+            record.content_hash = None
+        key = bundle_key(records)
+        assert bundle_key(records) == key
+
+        with open(records[0].path, "wb") as f:
+            f.write(b"rewritten record")
+        assert bundle_key(records) != key
+
+
+class TestBundles:
+    """Test building, serving and dropping archive bundles."""
+
+    def test_build_and_get(self, db):
+        """Test that a built bundle is served for its record set and holds every record."""
+        assert get_bundle("project", _records(db)) is None
+
+        path = build_bundle("project")
+        assert get_bundle("project", _records(db)) == (path, bundle_key(_records(db)))
+        with zipfile.ZipFile(path) as bundle:
+            assert sorted(bundle.namelist()) == ["a.sgy", "b.sgy"]
+            assert bundle.read("a.sgy") == b"first record"
+        assert build_bundle("project") == path
+
+    def test_rebuild_after_change(self, db, tmp_path):
+        """Test that a changed record set misses the old bundle, and rebuilding replaces it."""
+        old_path = build_bundle("project")
+        _add_record(db, tmp_path, "c", b"third record")
+        db.commit()
+        assert get_bundle("project", _records(db)) is None
+
+        new_path = build_bundle("project")
+        assert new_path != old_path
+        assert not os.path.exists(old_path)
+        assert os.listdir(os.path.dirname(new_path)) == [os.path.basename(new_path)]
+
+    def test_invalidate(self, db):
+        """Test that invalidating deletes the project's bundles."""
+        build_bundle("project")
+        invalidate_bundles("project")
+        assert get_bundle("project", _records(db)) is None
+        assert not os.path.exists(os.path.join(archive_bundles.ARCHIVE_BUNDLES_DIR, "project"))
+
+    @pytest.mark.asyncio
+    async def test_schedule_build(self, db, monkeypatch):
+        """Test that scheduling drops the current bundle right away and a burst of changes builds once."""
+        monkeypatch.setattr(settings, "ARCHIVE_BUNDLE_DELAY_SECONDS", 0.05)
+        build_bundle("project")
+
+        schedule_bundle_build("project")
+        first = archive_bundles._pending_builds["project"]
+        assert get_bundle("project", _records(db)) is None
+        schedule_bundle_build("project")
+        second = archive_bundles._pending_builds["project"]
+
+        await asyncio.gather(first, second, return_exceptions=True)
+        assert first.cancelled()
+        assert "project" not in archive_bundles._pending_builds
+        assert get_bundle("project", _records(db)) is not None
+
+    def test_compressed_records_get_no_bundle(self, db):
+        """Test that compressing a project's records drops its bundle and no new one is built."""
+        build_bundle("project")
+        db.get(ProjectDBModel, "project").status = ProjectStatus.completed
+        db.commit()
+
+        assert archive_storage.compress_completed_projects(db)["compressed"] == 2
+        assert not os.path.exists(os.path.join(archive_bundles.ARCHIVE_BUNDLES_DIR, "project"))
+        assert build_bundle("project") is None
+        assert get_bundle("project", _records(db)) is None
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import models  # noqa: F401  (registers every table on Base)
+from crud.blob_crud import get_blob
+from crud.project_crud import delete_project
+from crud.sgy_file_crud import create_sgy_files_info, delete_sgy_file_info
+from database import Base
+from models.project_model import ProjectDBModel
+from models.sgy_file_model import SgyFileDBModel
+from schemas.sgy_file_schema import SgyFileCreate
+from utils import blob_store
+from utils.blob_store import StagedFile, blob_path, commit_staged_batch, delete_unreferenced_blob, hash_file
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, "BLOB_DIR", str(tmp_path / "Blobs"))
+    monkeypatch.setattr(blob_store, "BLOB_TMP_DIR", str(tmp_path / "Blobs" / "tmp"))
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    session.add(ProjectDBModel(id="project", name="Project"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _stage(tmp_path, data: bytes) -> StagedFile:
+    os.makedirs(blob_store.BLOB_TMP_DIR, exist_ok=True)
+    path = os.path.join(blob_store.BLOB_TMP_DIR, f"staged_{len(os.listdir(blob_store.BLOB_TMP_DIR))}")
+    with open(path, "wb") as f:
+        f.write(data)
+    content_hash, size = hash_file(path)
+    return StagedFile(path, content_hash, size)
+
+
+def _row(file_id: str, path: str, staged: StagedFile) -> SgyFileCreate:
+    return SgyFileCreate(
+        id=file_id, original_name=f"{file_id}.sgy", path=path, size=staged.size, type="SGY", project_id="project",
+        content_hash=staged.content_hash,
+    )
+
+
+def _commit(db, tmp_path, files: dict) -> dict:
+    """Commit {file_id: data} as one batch of record rows, returning {file_id: link path}."""
+    staged = {file_id: _stage(tmp_path, data) for file_id, data in files.items()}
+    paths = {file_id: str(tmp_path / "SGYFiles" / "project" / f"{file_id}.sgy") for file_id in files}
+    commit_staged_batch(
+        db,
+        [(staged[file_id], paths[file_id]) for file_id in files],
+        lambda: create_sgy_files_info(
+            db, [_row(file_id, paths[file_id], staged[file_id]) for file_id in files], commit=False
+        ),
+    )
+    return paths
+
+
+class TestBlobStore:
+    """Test the deduplicating blob store and the reference counts kept by file rows."""
+
+    def test_duplicates_share_one_blob(self, db, tmp_path):
+        """Test that identical uploads are stored once, hard linked at each path and counted per row."""
+        paths = _commit(db, tmp_path, {"a": b"trace data", "b": b"trace data", "c": b"other data"})
+        content_hash, _ = hash_file(paths["a"])
+
+        assert get_blob(db, content_hash).ref_count == 2
+        assert os.path.samefile(paths["a"], paths["b"])
+        assert os.path.samefile(paths["a"], blob_path(content_hash))
+        assert not os.path.samefile(paths["a"], paths["c"])
+        assert os.listdir(blob_store.BLOB_TMP_DIR) == []
+
+    def test_deleting_rows_releases_references(self, db, tmp_path):
+        """Test that deleting a row drops its reference, and the blob is removed once nothing uses it."""
+        paths = _commit(db, tmp_path, {"a": b"trace data", "b": b"trace data"})
+        content_hash, _ = hash_file(paths["a"])
+
+        assert delete_sgy_file_info(db, "a")
+        delete_unreferenced_blob(db, content_hash)
+        assert get_blob(db, content_hash).ref_count == 1
+        assert os.path.exists(blob_path(content_hash))
+
+        assert delete_sgy_file_info(db, "b")
+        delete_unreferenced_blob(db, content_hash)
+        assert get_blob(db, content_hash) is None
+        assert not os.path.exists(blob_path(content_hash))
+
+    def test_deleting_project_releases_references(self, db, tmp_path):
+        """Test that deleting a project deletes its rows and their references in one go."""
+        paths = _commit(db, tmp_path, {"a": b"trace data", "b": b"trace data"})
+        content_hash, _ = hash_file(paths["a"])
+
+        assert delete_project(db, "project")
+        assert db.query(SgyFileDBModel).count() == 0
+        assert get_blob(db, content_hash).ref_count == 0
+
+    def test_failed_batch_rolls_back(self, db, tmp_path):
+        """Test that a batch whose rows fail to write leaves no rows, blobs, links or staging files."""
+        _commit(db, tmp_path, {"existing": b"already stored"})
+        existing_hash, _ = hash_file(str(tmp_path / "SGYFiles" / "project" / "existing.sgy"))
+        staged = [_stage(tmp_path, b"new data"), _stage(tmp_path, b"already stored")]
+        paths = [str(tmp_path / "SGYFiles" / "project" / name) for name in ("new.sgy", "dup.sgy")]
+
+        def write_rows():
+            create_sgy_files_info(db, [_row("new", paths[0], staged[0])], commit=False)
+            raise RuntimeError("row write failed")
+
+        with pytest.raises(RuntimeError):
+            commit_staged_batch(db, list(zip(staged, paths)), write_rows)
+
+        assert db.query(SgyFileDBModel.id).all() == [("existing",)]
+        assert get_blob(db, staged[0].content_hash) is None
+        assert not os.path.exists(blob_path(staged[0].content_hash))
+        assert get_blob(db, existing_hash).ref_count == 1
+        assert os.path.exists(blob_path(existing_hash))
+        assert not any(os.path.lexists(path) for path in paths)
+        assert os.listdir(blob_store.BLOB_TMP_DIR) == []
@@ -0,0 +1,32 @@
+import pytest
+from starlette.exceptions import HTTPException
+
+from utils.download_utils import parse_range
+
+
+class TestParseRange:
+    """Test Range header parsing for file downloads."""
+
+    @pytest.mark.parametrize("header,expected", [
+        ("bytes=0-99", (0, 100)),
+        ("bytes=100-", (100, 1000)),
+        ("bytes=-10", (990, 1000)),
+        ("bytes=900-5000", (900, 1000)),
+        ("bytes=-5000", (0, 1000)),
+    ])
+    def test_single_range(self, header, expected):
+        """Test that satisfiable ranges are clamped to the content and returned with an exclusive end."""
+        assert parse_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", [None, "", "bytes=0-1,5-6", "items=0-1", "bytes=-"])
+    def test_ignored_ranges(self, header):
+        """Test that missing, multi-range and malformed headers fall back to the whole file."""
+        assert parse_range(header, 1000) is None
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=500-100"])
+    def test_unsatisfiable_range(self, header):
+        """Test that ranges outside the content are rejected with 416."""
+        with pytest.raises(HTTPException) as exc_info:
+            parse_range(header, 1000)
+        assert exc_info.value.status_code == 416
+        assert exc_info.value.headers["Content-Range"] == "bytes */1000"
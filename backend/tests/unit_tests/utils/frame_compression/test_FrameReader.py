@@ -0,0 +1,54 @@
+import os
+
+from utils.frame_compression import FrameReader, compress_file, is_frame_compressed, iter_frame_range
+
+
+def _write_source(tmp_path, size: int) -> bytes:
+    data = os.urandom(size // 2) + bytes(size - size // 2)
+    (tmp_path / "record.sgy").write_bytes(data)
+    return data
+
+
+class TestFrameReader:
+    """Test reading the seekable framed compression format."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test that a compressed file reads back to its original contents."""
+        data = _write_source(tmp_path, 10_000)
+        compress_file(str(tmp_path / "record.sgy"), str(tmp_path / "record.tfrz"), frame_size=1024)
+
+        assert is_frame_compressed(str(tmp_path / "record.tfrz"))
+        assert not is_frame_compressed(str(tmp_path / "record.sgy"))
+        with FrameReader(str(tmp_path / "record.tfrz")) as reader:
+            assert reader.size == len(data)
+            assert reader.read() == data
+
+    def test_random_access(self, tmp_path):
+        """Test that reads at arbitrary offsets, including across frame boundaries, return the right bytes."""
+        data = _write_source(tmp_path, 10_000)
+        compress_file(str(tmp_path / "record.sgy"), str(tmp_path / "record.tfrz"), frame_size=1024)
+
+        with FrameReader(str(tmp_path / "record.tfrz")) as reader:
+            for offset, length in [(0, 10), (1020, 10), (5000, 3000), (9990, 100)]:
+                reader.seek(offset)
+                assert reader.read(length) == data[offset:offset + length]
+            reader.seek(-5, os.SEEK_END)
+            assert reader.read() == data[-5:]
+
+    def test_iter_range(self, tmp_path):
+        """Test that a byte range streams back in chunks."""
+        data = _write_source(tmp_path, 10_000)
+        compress_file(str(tmp_path / "record.sgy"), str(tmp_path / "record.tfrz"), frame_size=1024)
+
+        chunks = list(iter_frame_range(str(tmp_path / "record.tfrz"), 100, 4100, chunk_size=1000))
+        assert [len(chunk) for chunk in chunks] == [1000] * 4
+        assert b"".join(chunks) == data[100:4100]
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file compresses and reads back empty."""
+        (tmp_path / "empty.sgy").write_bytes(b"")
+        compress_file(str(tmp_path / "empty.sgy"), str(tmp_path / "empty.tfrz"))
+
+        with FrameReader(str(tmp_path / "empty.tfrz")) as reader:
+            assert reader.size == 0
+            assert reader.read() == b""
@@ -0,0 +1,106 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from utils.project_cache import (
+    ProjectCountCache,
+    ProjectSettingsCache,
+    invalidate_on_commit,
+    project_count_cache,
+    project_settings_cache,
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    session = sessionmaker(bind=engine)()
+    # Begin a transaction, so commit and rollback fire their events
+    session.execute(text("SELECT 1"))
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def shared_caches():
+    """The process wide caches, emptied before and after the test."""
+    project_settings_cache.clear()
+    project_count_cache.clear()
+    yield project_settings_cache, project_count_cache
+    project_settings_cache.clear()
+    project_count_cache.clear()
+
+
+class TestProjectSettingsCache:
+    """Test the generation guard of the project settings cache."""
+
+    def test_put_and_invalidate(self):
+        """Test that a load stores its entry, and invalidating the project drops it."""
+        cache = ProjectSettingsCache(max_bytes=1024)
+        cache.put("project", {"revision": 1}, 10, cache.generation("project"))
+        assert cache.get("project") == {"revision": 1}
+
+        cache.invalidate("project")
+        assert cache.get("project") is None
+
+    def test_load_racing_a_write_is_not_stored(self):
+        """Test that a load which started before a write was invalidated is dropped, and other projects are not."""
+        cache = ProjectSettingsCache(max_bytes=1024)
+        generation = cache.generation("project")
+        other_generation = cache.generation("other")
+        cache.invalidate("project")
+
+        cache.put("project", {"revision": 1}, 10, generation)
+        cache.put("other", {"revision": 1}, 10, other_generation)
+        assert cache.get("project") is None
+        assert cache.get("other") == {"revision": 1}
+
+        cache.put("project", {"revision": 2}, 10, cache.generation("project"))
+        assert cache.get("project") == {"revision": 2}
+
+
+class TestProjectCountCache:
+    """Test the project list totals cache."""
+
+    def test_count_racing_a_write_is_not_stored(self):
+        """Test that clearing drops every total, and a count taken before the clear is not stored."""
+        cache = ProjectCountCache(max_entries=10)
+        cache.put("a", 5, cache.generation())
+        generation = cache.generation()
+        cache.clear()
+
+        cache.put("b", 6, generation)
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+
+
+class TestInvalidateOnCommit:
+    """Test invalidating the caches for writes committed later by the caller."""
+
+    def test_invalidated_after_commit(self, db, shared_caches):
+        """Test that nothing is invalidated until the commit, and a load started before it is then dropped."""
+        settings_cache, count_cache = shared_caches
+        settings_cache.put("project", {"revision": 1}, 10, settings_cache.generation("project"))
+        count_cache.put("all", 3, count_cache.generation())
+
+        invalidate_on_commit(db, ["project"])
+        generation = settings_cache.generation("project")
+        assert settings_cache.get("project") == {"revision": 1}
+
+        db.commit()
+        assert settings_cache.get("project") is None
+        assert count_cache.get("all") is None
+        settings_cache.put("project", {"revision": 1}, 10, generation)
+        assert settings_cache.get("project") is None
+
+    def test_rollback_drops_pending(self, db, shared_caches):
+        """Test that rolled back writes invalidate nothing, then or at a later commit."""
+        settings_cache, _ = shared_caches
+        settings_cache.put("project", {"revision": 1}, 10, settings_cache.generation("project"))
+
+        invalidate_on_commit(db, ["project"])
+        db.rollback()
+        db.execute(text("SELECT 1"))
+        db.commit()
+        assert settings_cache.get("project") == {"revision": 1}
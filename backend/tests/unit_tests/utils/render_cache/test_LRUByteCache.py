@@ -0,0 +1,47 @@
+from utils.render_cache import LRUByteCache, hash_inputs
+
+
+class TestLRUByteCache:
+    """Test the byte bounded LRU cache used for rendered sections."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted once the budget is exceeded."""
+        cache = LRUByteCache(max_bytes=10)
+        cache.put("a", 1, 4)
+        cache.put("b", 2, 4)
+        assert cache.get("a") == 1
+        cache.put("c", 3, 4)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.current_bytes == 8
+
+    def test_oversized_entry_is_not_stored(self):
+        """Test that an entry larger than the whole budget is rejected."""
+        cache = LRUByteCache(max_bytes=10)
+        assert not cache.put("a", 1, 11)
+        assert len(cache) == 0
+        assert cache.get("a") is None
+        assert cache.misses == 1
+
+    def test_replace_updates_size(self):
+        """Test that replacing a key does not double count its size."""
+        cache = LRUByteCache(max_bytes=10)
+        cache.put("a", 1, 6)
+        cache.put("a", 2, 3)
+        assert cache.get("a") == 2
+        assert cache.current_bytes == 3
+
+
+class TestHashInputs:
+    """Test cache key generation."""
+
+    def test_stable_and_order_sensitive(self):
+        """Test that keys are repeatable and depend on the order of the parts."""
+        assert hash_inputs(b"model", 1.0, "m") == hash_inputs(b"model", 1.0, "m")
+        assert hash_inputs(b"model", 1.0, "m") != hash_inputs(b"model", "m", 1.0)
+
+    def test_parts_do_not_run_together(self):
+        """Test that splitting the same bytes differently gives a different key."""
+        assert hash_inputs(b"ab", b"c") != hash_inputs(b"a", b"bc")
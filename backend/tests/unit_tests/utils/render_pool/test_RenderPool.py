@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from utils.render_pool import RenderPool, RenderTimeoutError, RenderWorkerError
+
+
+class TestRenderPool:
+    """Test the render worker pool."""
+
+    def test_runs_inline_when_not_started(self):
+        """Test that jobs run in the calling process when the pool has no workers."""
+        pool = RenderPool(workers=0, max_jobs_per_worker=10, job_timeout=5)
+        pool.start()
+        assert not pool.started
+        assert pool.run(sum, [1, 2, 3]) == 6
+
+    def test_runs_jobs_and_recycles_workers(self):
+        """Test that results and job exceptions come back from workers, and workers are replaced after N jobs."""
+        pool = RenderPool(workers=1, max_jobs_per_worker=2, job_timeout=30)
+        pool.start()
+        try:
+            first_worker = next(iter(pool._all))
+            assert pool.run(sum, [1, 2, 3]) == 6
+            with pytest.raises(ValueError):
+                pool.run(int, "not a number")
+            assert first_worker not in pool._all
+            assert not first_worker.process.is_alive()
+            assert pool.run(len, b"abcd") == 4
+        finally:
+            pool.stop()
+
+    def test_timeout_replaces_worker(self):
+        """Test that a job running past its timeout raises and its worker is killed and replaced."""
+        pool = RenderPool(workers=1, max_jobs_per_worker=10, job_timeout=30)
+        pool.start()
+        try:
+            # Let the worker finish warming up so only the job counts against the timeout
+            assert pool.run(sum, [1]) == 1
+            stuck_worker = next(iter(pool._all))
+            start = time.monotonic()
+            with pytest.raises(RenderTimeoutError):
+                pool.run(time.sleep, 10, timeout=0.5)
+            assert time.monotonic() - start < 5
+            assert not stuck_worker.process.is_alive()
+            assert pool.run(sum, [2, 3]) == 5
+        finally:
+            pool.stop()
+
+    def test_waiting_for_a_worker_times_out(self):
+        """Test that a job waiting for a busy pool raises instead of waiting forever."""
+        pool = RenderPool(workers=1, max_jobs_per_worker=10, job_timeout=30)
+        pool.start()
+        try:
+            assert pool.run(sum, [1]) == 1
+            busy = threading.Thread(target=pool.run, args=(time.sleep, 2))
+            busy.start()
+            time.sleep(0.2)
+            start = time.monotonic()
+            with pytest.raises(RenderTimeoutError):
+                pool.run(sum, [1], timeout=0.5)
+            assert time.monotonic() - start < 2
+            busy.join()
+            assert pool.run(sum, [2, 3]) == 5
+        finally:
+            pool.stop()
+
+    def test_stop_wakes_waiting_jobs(self):
+        """Test that jobs waiting for a worker fail as soon as the pool is stopped."""
+        pool = RenderPool(workers=1, max_jobs_per_worker=10, job_timeout=30)
+        pool.start()
+        assert pool.run(sum, [1]) == 1
+        errors = []
+
+        def run(func, *args):
+            try:
+                func(*args)
+            except RenderWorkerError as e:
+                errors.append(e)
+
+        # The busy job may or may not finish before its worker is stopped, only the waiters have to fail
+        busy = threading.Thread(target=run, args=(pool.run, time.sleep, 1))
+        busy.start()
+        time.sleep(0.2)
+        waiters = [threading.Thread(target=run, args=(pool.run, sum, [1])) for _ in range(2)]
+        for waiter in waiters:
+            waiter.start()
+        time.sleep(0.2)
+        pool.stop()
+        for waiter in waiters:
+            waiter.join(5)
+            assert not waiter.is_alive()
+        busy.join(5)
+        assert len(errors) >= 2
@@ -0,0 +1,22 @@
+import pytest
+
+from utils.utils import safe_file_extension
+
+
+class TestSafeFileExtension:
+    """Test extension extraction from client supplied file names."""
+
+    @pytest.mark.parametrize("file_name,expected", [
+        ("0361.sgy", "sgy"),
+        ("record.v2.SEGY", "SEGY"),
+        ("notes.txt", "txt"),
+    ])
+    def test_plain_extension(self, file_name, expected):
+        """Test that ordinary extensions are returned without the dot."""
+        assert safe_file_extension(file_name, "sgy") == expected
+
+    @pytest.mark.parametrize("file_name", ["a./../../x", "a.sgy/x", "a.sgy\\x", "a.", "a.toolongextension", "noext"])
+    def test_unsafe_or_missing_extension(self, file_name):
+        """Test that names whose extension could escape the write directory, or that have none, get the default."""
+        assert safe_file_extension(file_name, "sgy") == "sgy"
+        assert safe_file_extension(file_name) == ""
@@ -0,0 +1,19 @@
+from utils.search_index import fts_query
+
+
+class TestFtsQuery:
+    """Test building FTS5 queries from user input."""
+
+    def test_words_are_prefixes(self):
+        """Test that every word must match, each as a prefix."""
+        assert fts_query("Bridge si") == '"Bridge"* "si"*'
+
+    def test_separators_split_words(self):
+        """Test that emails and phone numbers split into their parts."""
+        assert fts_query("jane@acme.com") == '"jane"* "acme"* "com"*'
+        assert fts_query("(555) 123") == '"555"* "123"*'
+
+    def test_syntax_is_dropped(self):
+        """Test that quotes and operators can't reach the FTS5 query parser."""
+        assert fts_query('a" OR b*') == '"a"* "OR"* "b"*'
+        assert fts_query('"*(') is None
@@ -0,0 +1,51 @@
+import io
+
+import numpy as np
+
+from utils.section_utils import SectionGrid
+
+
+def _grid() -> SectionGrid:
+    x = np.arange(5, dtype=np.float64)
+    y = np.arange(4, dtype=np.float64)
+    # Velocity increases with x, so every contour is a vertical line
+    values = np.tile(100.0 * x, (len(y), 1))
+    values[0, 0] = np.nan
+    return SectionGrid(x=x, y=y, values=values, surface_x=x, surface_z=np.zeros_like(x), unit="m")
+
+
+class TestSectionGrid:
+    """Test the interpolated section container and its data encoding."""
+
+    def test_contour_levels(self):
+        """Test that an int asks for evenly spaced levels strictly inside the value range, ignoring NaN."""
+        grid = _grid()
+        np.testing.assert_allclose(grid.contour_levels(3), [100, 200, 300])
+        np.testing.assert_allclose(grid.contour_levels([150, 250]), [150, 250])
+        assert len(grid.contour_levels(None)) == 0
+
+    def test_npz_roundtrip(self):
+        """Test that the .npz archive carries the grid, its surface and the contour polylines."""
+        grid = _grid()
+        with np.load(io.BytesIO(grid.to_npz_bytes(contours=[150]))) as data:
+            np.testing.assert_array_equal(data["x"], grid.x)
+            np.testing.assert_array_equal(data["y"], grid.y)
+            np.testing.assert_array_equal(data["values"], grid.values)
+            np.testing.assert_array_equal(data["surface_z"], grid.surface_z)
+            assert not data["y_is_elevation"]
+            np.testing.assert_allclose(data["contour_levels"], [150])
+            points = data["contour_points"]
+            assert len(points) > 0
+            np.testing.assert_allclose(points[:, 0], 1.5)
+            assert list(data["contour_level_index"]) == [0] * len(data["contour_offsets"])
+
+    def test_npz_without_contours(self):
+        """Test that no contours gives empty contour arrays."""
+        with np.load(io.BytesIO(_grid().to_npz_bytes())) as data:
+            assert data["contour_points"].shape == (0, 2)
+            assert len(data["contour_offsets"]) == 0
+
+    def test_resolution(self):
+        """Test that the grid spacing is reported per axis."""
+        assert _grid().resolution == (1.0, 1.0)
+        assert SectionGrid(x=[0.0], y=[0.0], values=[[1.0]]).resolution == (0.0, 0.0)
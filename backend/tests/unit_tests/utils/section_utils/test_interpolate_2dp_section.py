@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from utils.section_utils import interpolate_2dp_section, read_geoct_model
+
+# 3 x 2 nodes, spacing 1, origin (0, 0), one depth row at a time
+GEOCT_MODEL = "3 2 1.0 0.0 0.0 0\n100 200 300\n400 500 600\n"
+
+
+class TestInterpolate2dpSection:
+    """Test resampling GeoCT P-wave models onto a regular grid."""
+
+    def test_read_geoct_model(self):
+        """Test that the header sets the node coordinates and velocities are read row by row."""
+        x, z, values = read_geoct_model(GEOCT_MODEL)
+        np.testing.assert_allclose(x, [0, 1, 2])
+        np.testing.assert_allclose(z, [0, 1])
+        np.testing.assert_allclose(values, [[100, 200, 300], [400, 500, 600]])
+
+    def test_truncated_model(self):
+        """Test that a model with fewer velocities than its header promises is rejected."""
+        with pytest.raises(ValueError):
+            read_geoct_model("3 2 1.0 0.0 0.0 0\n100 200 300\n")
+
+    def test_resample(self):
+        """Test that the grid passes through the nodes and is linear between them."""
+        grid = interpolate_2dp_section(GEOCT_MODEL, res=0.5, smoothing_sigma=0, unit="m")
+
+        assert grid.shape == (3, 5)
+        assert grid.unit == "m"
+        np.testing.assert_allclose(grid.values[0], [100, 150, 200, 250, 300])
+        np.testing.assert_allclose(grid.values[:, 0], [100, 250, 400])
+
+    def test_limits_extrapolate(self):
+        """Test that limits outside the model extrapolate instead of leaving gaps."""
+        grid = interpolate_2dp_section(GEOCT_MODEL, x_max=3, max_depth=1, res=1, smoothing_sigma=0)
+        np.testing.assert_allclose(grid.values[0], [100, 200, 300, 400])
+
+    def test_reverse(self):
+        """Test that reversing flips the line direction."""
+        grid = interpolate_2dp_section(GEOCT_MODEL, res=1, smoothing_sigma=0)
+        reversed_grid = interpolate_2dp_section(GEOCT_MODEL, res=1, smoothing_sigma=0, reverse=True)
+        np.testing.assert_allclose(reversed_grid.values, grid.values[:, ::-1])
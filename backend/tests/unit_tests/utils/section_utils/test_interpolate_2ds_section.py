@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from utils.section_utils import adaptive_resolution, interpolate_2ds_section
+
+
+def _layers():
+    # Two models 10 units apart, each with a layer boundary at 2 and a bottom at 5
+    return [
+        (0.0, np.array([2.0, 5.0]), np.array([100.0, 200.0])),
+        (10.0, np.array([2.0, 5.0]), np.array([300.0, 400.0])),
+    ]
+
+
+class TestInterpolate2dsSection:
+    """Test interpolating 1D S-wave models into a 2D section."""
+
+    def test_depth_section(self):
+        """Test that layers are sampled by depth and models are blended linearly between their positions."""
+        grid = interpolate_2ds_section(_layers(), res=1.0, smoothing_sigma=0, unit="m")
+
+        assert grid.shape == (6, 11)
+        assert not grid.y_is_elevation
+        assert grid.unit == "m"
+        np.testing.assert_allclose(grid.x, np.arange(11))
+        np.testing.assert_allclose(grid.y, np.arange(6))
+        np.testing.assert_allclose(grid.values[:, 0], [100, 100, 200, 200, 200, 200])
+        np.testing.assert_allclose(grid.values[:, 10], [300, 300, 400, 400, 400, 400])
+        np.testing.assert_allclose(grid.values[0, 5], 200)
+        np.testing.assert_allclose(grid.surface_z, 0)
+
+    def test_reverse(self):
+        """Test that reversing the line puts the last model at the start."""
+        grid = interpolate_2ds_section(_layers(), res=1.0, smoothing_sigma=0)
+        reversed_grid = interpolate_2ds_section(_layers(), res=1.0, smoothing_sigma=0, reverse=True)
+
+        np.testing.assert_allclose(reversed_grid.values, grid.values[:, ::-1])
+
+    def test_elevation_masks_above_ground(self):
+        """Test that an elevation section is hung from the surface and is NaN above it."""
+        grid = interpolate_2ds_section(
+            _layers(), elevation_func=lambda x: 10.0 - 0.5 * x, peak_elevation=10.0, res=1.0, smoothing_sigma=0
+        )
+
+        assert grid.y_is_elevation
+        assert grid.peak_elevation == 10.0
+        np.testing.assert_allclose(grid.y[[0, -1]], [0.0, 10.0])
+        np.testing.assert_allclose(grid.surface_z, 10.0 - 0.5 * grid.x)
+        above_ground = grid.y[:, np.newaxis] > grid.surface_z[np.newaxis, :]
+        assert np.isnan(grid.values[above_ground]).all()
+        in_ground = ~above_ground & (grid.y[:, np.newaxis] >= grid.surface_z[np.newaxis, :] - 5.0)
+        assert not np.isnan(grid.values[in_ground]).any()
+        # The top of the first column is at the surface, in the shallow layer
+        assert grid.values[list(grid.y).index(10.0), 0] == 100
+
+    def test_display_as_depth(self):
+        """Test that without a peak elevation the section stays in depth and keeps its surface profile."""
+        grid = interpolate_2ds_section(_layers(), elevation_func=lambda x: 10.0 - 0.5 * x, res=1.0, smoothing_sigma=0)
+
+        assert not grid.y_is_elevation
+        assert grid.peak_elevation is None
+        assert not np.isnan(grid.values).any()
+        np.testing.assert_allclose(grid.surface_z, 10.0 - 0.5 * grid.x)
+
+    def test_requires_a_model(self):
+        """Test that an empty model list is rejected."""
+        with pytest.raises(ValueError):
+            interpolate_2ds_section([])
+
+    def test_adaptive_resolution_caps_shape(self):
+        """Test that max_shape coarsens each axis so the grid never exceeds it."""
+        layers = [
+            (0.0, np.array([20.0, 50.0]), np.array([100.0, 200.0])),
+            (1000.0, np.array([20.0, 50.0]), np.array([300.0, 400.0])),
+        ]
+        full = interpolate_2ds_section(layers, res=0.5, smoothing_sigma=0)
+        capped = interpolate_2ds_section(layers, res=0.5, smoothing_sigma=4, max_shape=(20, 40))
+
+        assert full.shape == (101, 2001)
+        assert capped.shape[0] <= 20
+        assert capped.shape[1] <= 40
+        np.testing.assert_allclose(capped.x[[0, -1]], [0, 1000])
+
+    def test_adaptive_resolution_never_refines(self):
+        """Test that a section already within max_shape keeps the requested resolution."""
+        grid = interpolate_2ds_section(_layers(), res=1.0, smoothing_sigma=0, max_shape=(1000, 1000))
+        assert grid.shape == (6, 11)
+
+
+class TestAdaptiveResolution:
+    """Test choosing grid spacing for a maximum grid shape."""
+
+    def test_spacing_per_axis(self):
+        """Test that each axis is coarsened independently, and only as far as needed."""
+        y_res, x_res = adaptive_resolution(x_extent=1000, depth_extent=50, res=0.5, max_shape=(101, 201))
+        assert x_res == pytest.approx(5.0)
+        assert y_res == 0.5
+
+    def test_degenerate_shape(self):
+        """Test that a one cell max_shape doesn't divide by zero."""
+        assert adaptive_resolution(x_extent=10, depth_extent=5, res=1, max_shape=(1, 1)) == (5, 10)
@@ -0,0 +1,58 @@
+import io
+
+import numpy as np
+from PIL import Image
+
+from utils.section_utils import default_2ds_labels, interpolate_2ds_section, render_section_png, section_tick_params
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _layers():
+    return [
+        (0.0, np.array([2.0, 5.0]), np.array([100.0, 200.0])),
+        (10.0, np.array([2.0, 5.0]), np.array([300.0, 400.0])),
+    ]
+
+
+def _size(png: bytes) -> tuple:
+    with Image.open(io.BytesIO(png)) as image:
+        return image.size
+
+
+class TestRenderSectionPng:
+    """Test drawing figures from an interpolated section grid."""
+
+    def test_depth_section(self):
+        """Test that a depth section renders with contours and a colorbar at the figure size."""
+        grid = interpolate_2ds_section(_layers(), res=0.5, smoothing_sigma=0, unit="m")
+        png = render_section_png(grid, title="Line 1", contours=3, dpi=50)
+
+        assert png.startswith(PNG_SIGNATURE)
+        width, height = _size(png)
+        assert 0 < width <= 10 * 50 and 0 < height <= 5 * 50
+
+    def test_elevation_section(self):
+        """Test that an elevation section with NaN above ground renders, with shifted elevation labels."""
+        grid = interpolate_2ds_section(
+            _layers(), elevation_func=lambda x: 10.0 - 0.5 * x, peak_elevation=10.0, res=0.5, smoothing_sigma=0
+        )
+        png = render_section_png(
+            grid, shift_elevation=True, aboveground_border_color="k", colorbar=False, contours=[250], dpi=50
+        )
+        assert png.startswith(PNG_SIGNATURE)
+
+    def test_styling_only(self):
+        """Test that figures differing only in styling come from the same grid and differ."""
+        grid = interpolate_2ds_section(_layers(), res=0.5, smoothing_sigma=0, unit="m")
+        plain = render_section_png(grid, dpi=50)
+        assert render_section_png(grid, dpi=50) == plain
+        assert render_section_png(grid, cbar_vmin=0, cbar_vmax=1000, dpi=50) != plain
+        assert render_section_png(grid, tick_params=section_tick_params(tick_bottom=True), dpi=50) != plain
+
+    def test_default_labels(self):
+        """Test that missing labels default to the unit and axis of the section and given ones are kept."""
+        assert default_2ds_labels("ft", True, None, None, None) == (
+            "Array Dist., ft", "Elevation, ft", "Shear-Wave Velocity, ft/sec"
+        )
+        assert default_2ds_labels("m", False, "X", None, "V") == ("X", "Depth, m", "V")
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from utils import section_inputs
+from utils.section_inputs import (
+    load_elevation,
+    load_model_set,
+    save_elevation,
+    save_model_set,
+    scale_layers,
+)
+
+
+@pytest.fixture(autouse=True)
+def inputs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(section_inputs, "SECTION_INPUTS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _layers():
+    return [
+        (0.0, np.array([2.0, 5.0]), np.array([100.0, 200.0])),
+        (10.0, np.array([1.0, 3.0, 6.0]), np.array([150.0, 250.0, 350.0])),
+    ]
+
+
+class TestSectionInputs:
+    """Test storing parsed 2D-S inputs per project."""
+
+    def test_model_set_roundtrip(self):
+        """Test that ragged layers come back as stored, with no model files to parse."""
+        model_set_id = save_model_set("project", _layers(), "m")
+        inputs = load_model_set("project", model_set_id)
+
+        assert inputs.unit == "m"
+        assert inputs.model_sources == []
+        assert inputs.elevation is None
+        assert len(inputs.layers) == 2
+        for (position, stops, velocities), (expected_position, expected_stops, expected_velocities) in zip(
+            inputs.layers, _layers()
+        ):
+            assert position == expected_position
+            np.testing.assert_array_equal(stops, expected_stops)
+            np.testing.assert_array_equal(velocities, expected_velocities)
+
+    def test_model_set_with_files(self, inputs_dir):
+        """Test that a set stored along with its model files still loads, from its layers."""
+        stored = section_inputs._save_input(
+            "project",
+            section_inputs.MODEL_SET_KIND,
+            positions=np.array([0.0, 10.0]),
+            stops=np.array([2.0, 5.0, 1.0, 3.0, 6.0]),
+            velocities=np.array([100.0, 200.0, 150.0, 250.0, 350.0]),
+            offsets=np.array([0, 2, 5]),
+            unit=np.array("ft"),
+            source_names=np.array(["model_0.0_ft.txt", "model_10.0_ft.txt"]),
+            source_data=np.frombuffer(b"firstsecond", dtype=np.uint8),
+            source_offsets=np.array([0, 5, 11]),
+        )
+        inputs = load_model_set("project", stored)
+
+        assert inputs.unit == "ft"
+        assert inputs.model_sources == []
+        assert [position for position, _, _ in inputs.layers] == [0.0, 10.0]
+        np.testing.assert_array_equal(inputs.layers[1][2], [150.0, 250.0, 350.0])
+
+    def test_ids_are_content_hashes(self, inputs_dir):
+        """Test that storing the same inputs twice gives the same id and one file."""
+        first = save_model_set("project", _layers(), "m")
+        assert save_model_set("project", _layers(), "m") == first
+        assert save_model_set("project", _layers(), "ft") != first
+        assert len(list((inputs_dir / "project").iterdir())) == 2
+
+    def test_missing_inputs(self):
+        """Test that unknown ids, or ids of another project, load as None."""
+        model_set_id = save_model_set("project", _layers(), "m")
+        assert load_model_set("other", model_set_id) is None
+        assert load_model_set("project", "0" * 32) is None
+        assert load_elevation("project", "0" * 32) is None
+
+    def test_elevation_roundtrip(self):
+        """Test that a stored profile loads with its peak elevation, and a missing peak stays None."""
+        x, z = np.linspace(0, 10, 5), np.array([5.0, 6.0, 7.0, 6.0, 5.0])
+        elevation = load_elevation("project", save_elevation("project", x, z, 7.0))
+        np.testing.assert_array_equal(elevation.x, x)
+        np.testing.assert_array_equal(elevation.z, z)
+        assert elevation.peak_elevation == 7.0
+        assert elevation.spreadsheet is None
+
+        assert load_elevation("project", save_elevation("project", x, z, None)).peak_elevation is None
+
+    def test_scale_layers(self):
+        """Test that positions, depths and velocities all scale, and a factor of one is a no-op."""
+        layers = _layers()
+        assert scale_layers(layers, 1) is layers
+        position, stops, velocities = scale_layers(layers, 2)[1]
+        assert position == 20.0
+        np.testing.assert_array_equal(stops, [2.0, 6.0, 12.0])
+        np.testing.assert_array_equal(velocities, [300.0, 500.0, 700.0])
@@ -0,0 +1,40 @@
+import struct
+
+from utils.sgy_header import SGY_HEADER_SIZE, TEXT_HEADER_SIZE, TRACE_HEADER_SIZE, parse_sgy_header
+
+
+def _header(sample_interval: int, samples: int, format_code: int, byte_order: str = ">") -> bytes:
+    binary_header = bytearray(400)
+    struct.pack_into(f"{byte_order}H", binary_header, 16, sample_interval)
+    struct.pack_into(f"{byte_order}H", binary_header, 20, samples)
+    struct.pack_into(f"{byte_order}H", binary_header, 24, format_code)
+    return b" " * TEXT_HEADER_SIZE + bytes(binary_header)
+
+
+class TestParseSgyHeader:
+    """Test reading the SEG-Y binary file header."""
+
+    def test_big_endian(self):
+        """Test the fields and the trace count derived from the file size."""
+        size = SGY_HEADER_SIZE + 24 * (TRACE_HEADER_SIZE + 1000 * 4)
+        summary = parse_sgy_header(_header(500, 1000, 5), size)
+        assert summary.sample_interval_us == 500
+        assert summary.samples_per_trace == 1000
+        assert summary.format_code == 5
+        assert summary.trace_count == 24
+
+    def test_little_endian(self):
+        """Test that a little endian header is recognized."""
+        summary = parse_sgy_header(_header(250, 2000, 1, "<"), SGY_HEADER_SIZE)
+        assert summary.sample_interval_us == 250
+        assert summary.samples_per_trace == 2000
+        assert summary.trace_count == 0
+
+    def test_irregular_size(self):
+        """Test that the trace count is left unknown when the traces don't divide the file."""
+        assert parse_sgy_header(_header(500, 1000, 5), SGY_HEADER_SIZE + 10).trace_count is None
+
+    def test_not_sgy(self):
+        """Test that short or unrecognized headers give no summary."""
+        assert parse_sgy_header(b"abc", 3) is None
+        assert parse_sgy_header(b"\x00" * SGY_HEADER_SIZE, SGY_HEADER_SIZE) is None
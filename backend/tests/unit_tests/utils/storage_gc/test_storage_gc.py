@@ -0,0 +1,205 @@
+import datetime
+import os
+
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+import models  # noqa: F401  (registers every table on Base)
+from config import settings
+from crud.blob_crud import get_blob, set_blob_ref_count
+from crud.sgy_file_crud import create_sgy_files_info, get_sgy_file_info
+from crud.upload_session_crud import create_upload_session, get_upload_session
+from database import Base
+from models.project_model import ProjectDBModel
+from models.sgy_file_model import SgyFileDBModel
+from models.upload_session_model import UploadSessionDBModel
+from schemas.sgy_file_schema import SgyFileCreate
+from utils import blob_store, storage_gc
+from utils.blob_store import StagedFile, commit_staged_batch, hash_file
+from utils.storage_gc import collect_garbage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point MQ_SAVE_DIR and every directory the GC knows about at a temporary directory."""
+    data_dir = tmp_path / "data"
+    sgy_files_dir = str(data_dir / "SGYFiles")
+    project_files_dir = str(data_dir / "ProjectFiles")
+    monkeypatch.setattr(settings, "MQ_SAVE_DIR", str(data_dir))
+    monkeypatch.setattr(blob_store, "BLOB_DIR", str(data_dir / "Blobs"))
+    monkeypatch.setattr(blob_store, "BLOB_TMP_DIR", str(data_dir / "Blobs" / "tmp"))
+    monkeypatch.setattr(storage_gc, "BLOB_DIR", str(data_dir / "Blobs"))
+    monkeypatch.setattr(storage_gc, "SGY_FILES_DIR", sgy_files_dir)
+    monkeypatch.setattr(storage_gc, "PROJECT_FILES_DIR", project_files_dir)
+    monkeypatch.setattr(storage_gc, "_PROJECT_DIRS", (
+        sgy_files_dir, project_files_dir, str(data_dir / "ArchiveBundles"), str(data_dir / "SectionInputs")
+    ))
+    monkeypatch.setattr(storage_gc, "_SCRATCH_DIRS", (str(data_dir / "Blobs" / "tmp"), str(data_dir / "ProcessTmp")))
+    os.makedirs(data_dir / "SGYFiles" / "project")
+    return data_dir
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # A file outside the data directory, so the walk doesn't count it and two sessions see the same data
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(ProjectDBModel(id="project", name="Project"))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as db:
+        yield db
+
+
+def _write(path, data: bytes) -> str:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+def _commit_records(db, data_dir, files: dict) -> dict:
+    """Commit {file_id: data} as record rows linked from the blob store, returning {file_id: path}."""
+    staged, paths = {}, {}
+    for file_id, data in files.items():
+        staged_path = _write(os.path.join(blob_store.BLOB_TMP_DIR, f"staged_{file_id}"), data)
+        staged[file_id] = StagedFile(staged_path, *hash_file(staged_path))
+        paths[file_id] = str(data_dir / "SGYFiles" / "project" / f"{file_id}.sgy")
+    rows = [
+        SgyFileCreate(
+            id=file_id, original_name=f"{file_id}.sgy", path=paths[file_id], size=staged[file_id].size, type="SGY",
+            project_id="project", content_hash=staged[file_id].content_hash,
+        )
+        for file_id in files
+    ]
+    commit_staged_batch(
+        db, [(staged[file_id], paths[file_id]) for file_id in files],
+        lambda: create_sgy_files_info(db, rows, commit=False),
+    )
+    return paths
+
+
+def _removed(report) -> dict:
+    return {os.path.basename(entry["path"]): entry["reason"] for entry in report["removed_files"]}
+
+
+class TestStorageGc:
+    """Test reconciling the database with the data directory."""
+
+    def test_dry_run_and_apply(self, db, data_dir):
+        """Test that a dry run only reports orphans, and applying removes the same files and rows."""
+        _commit_records(db, data_dir, {"kept": b"trace data"})
+        orphan = _write(data_dir / "SGYFiles" / "project" / "orphan.sgy", b"orphan")
+        scratch = _write(data_dir / "ProcessTmp" / "model.txt", b"model")
+        db.add(SgyFileDBModel(
+            id="missing", original_name="missing.sgy", path=str(data_dir / "SGYFiles" / "project" / "missing.sgy"),
+            size=1, type="SGY", project_id="project",
+        ))
+        db.commit()
+
+        report = collect_garbage(db, dry_run=True, grace_hours=0)
+        assert report["dry_run"]
+        assert _removed(report) == {"orphan.sgy": "no file row", "model.txt": "stale temp file"}
+        assert report["removed_rows"]["sgy_files"] == 1
+        assert os.path.exists(orphan) and os.path.exists(scratch)
+        assert get_sgy_file_info(db, "missing") is not None
+
+        report = collect_garbage(db, dry_run=False, grace_hours=0)
+        assert _removed(report) == {"orphan.sgy": "no file row", "model.txt": "stale temp file"}
+        assert not os.path.exists(orphan) and not os.path.exists(scratch)
+        assert get_sgy_file_info(db, "missing") is None
+        assert get_sgy_file_info(db, "kept") is not None
+
+        assert collect_garbage(db, dry_run=False, grace_hours=0)["removed_files"] == []
+
+    def test_grace_period(self, db, data_dir):
+        """Test that files changed within the grace period are left alone."""
+        orphan = _write(data_dir / "SGYFiles" / "project" / "orphan.sgy", b"orphan")
+        report = collect_garbage(db, dry_run=False, grace_hours=1)
+        assert report["removed_files"] == []
+        assert os.path.exists(orphan)
+
+    def test_hard_links_counted_once(self, db, data_dir):
+        """Test that records sharing a blob count once on disk and once per record for their project."""
+        _commit_records(db, data_dir, {"a": b"trace data", "b": b"trace data"})
+        report = collect_garbage(db, dry_run=True, grace_hours=0)
+
+        assert report["total_bytes"] == len(b"trace data")
+        assert report["by_directory"] == {"Blobs": len(b"trace data")}
+        assert report["by_project"] == {"project": 2 * len(b"trace data")}
+
+    def test_ref_count_repair(self, db, data_dir):
+        """Test that a wrong blob ref count is reported, and only fixed when applying."""
+        paths = _commit_records(db, data_dir, {"a": b"trace data", "b": b"trace data"})
+        content_hash, _ = hash_file(paths["a"])
+        set_blob_ref_count(db, content_hash, 5)
+
+        assert collect_garbage(db, dry_run=True, grace_hours=0)["fixed_ref_counts"] == 1
+        assert get_blob(db, content_hash).ref_count == 5
+        assert collect_garbage(db, dry_run=False, grace_hours=0)["fixed_ref_counts"] == 1
+        db.expire_all()
+        assert get_blob(db, content_hash).ref_count == 2
+
+    def test_unreferenced_blob(self, db, data_dir):
+        """Test that a blob no row uses is removed with its row."""
+        paths = _commit_records(db, data_dir, {"a": b"trace data"})
+        content_hash, _ = hash_file(paths["a"])
+        db.delete(get_sgy_file_info(db, "a"))
+        db.commit()
+        os.remove(paths["a"])
+
+        report = collect_garbage(db, dry_run=False, grace_hours=0)
+        assert _removed(report) == {content_hash: "unreferenced blob"}
+        assert get_blob(db, content_hash) is None
+
+    def test_expired_upload_sessions(self, db, data_dir):
+        """Test that sessions untouched for the grace period are deleted with their .part file, others are kept."""
+        for upload_id in ("stale", "active"):
+            path = str(data_dir / "SGYFiles" / "project" / f"{upload_id}.sgy")
+            create_upload_session(db, upload_id, "project", f"{upload_id}.sgy", path, "SGY", 10)
+            _write(path + ".part", b"chunk")
+        db.execute(
+            update(UploadSessionDBModel).where(UploadSessionDBModel.id == "stale")
+            .values(updated_date=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=2))
+        )
+        db.commit()
+
+        report = collect_garbage(db, dry_run=True, grace_hours=1)
+        assert _removed(report) == {"stale.sgy.part": "expired upload session"}
+        assert report["removed_rows"]["upload_sessions"] == 1
+        assert get_upload_session(db, "stale") is not None
+
+        collect_garbage(db, dry_run=False, grace_hours=1)
+        assert get_upload_session(db, "stale") is None
+        assert not os.path.exists(data_dir / "SGYFiles" / "project" / "stale.sgy.part")
+        assert get_upload_session(db, "active") is not None
+        assert os.path.exists(data_dir / "SGYFiles" / "project" / "active.sgy.part")
+
+    def test_row_moved_during_pass(self, db, session_factory, data_dir, monkeypatch):
+        """Test that a row whose file was moved after the rows were read, as compression does, is not deleted."""
+        paths = _commit_records(db, data_dir, {"a": b"trace data"})
+        read_rows = storage_gc.get_all_sgy_files_info
+
+        def read_then_compress(session):
+            rows = read_rows(session)
+            moved_path = _write(paths["a"] + ".tfrz", b"compressed")
+            os.remove(paths["a"])
+            with session_factory() as other:
+                other.execute(update(SgyFileDBModel).where(SgyFileDBModel.id == "a").values(path=moved_path))
+                other.commit()
+            return rows
+
+        monkeypatch.setattr(storage_gc, "get_all_sgy_files_info", read_then_compress)
+        report = collect_garbage(db, dry_run=False, grace_hours=1)
+
+        assert report["removed_rows"]["sgy_files"] == 0
+        db.expire_all()
+        assert get_sgy_file_info(db, "a").path.endswith(".tfrz")
@@ -0,0 +1,99 @@
+import io
+import os
+import zipfile
+
+import pytest
+
+from utils import zip_stream
+from utils.zip_stream import ZipEntry, archive_size, choose_compression, iter_zip
+
+
+def _entry(name: str, data: bytes, compress_type: int) -> ZipEntry:
+    return ZipEntry(name=name, size=len(data), open_source=lambda: io.BytesIO(data), compress_type=compress_type)
+
+
+FILES = {
+    "a.sgy": os.urandom(50_000),
+    "dir/b.txt": b"hello " * 10_000,
+    "empty": b"",
+    "ünïcode.txt": b"x",
+}
+
+
+class TestIterZip:
+    """Test the streaming ZIP writer against the standard library reader."""
+
+    @pytest.mark.parametrize("compress_type", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+    def test_roundtrip(self, compress_type):
+        """Test that every entry reads back with the right contents and passes its CRC check."""
+        data = b"".join(iter_zip([_entry(name, body, compress_type) for name, body in FILES.items()], chunk_size=4096))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == list(FILES)
+            for name, body in FILES.items():
+                assert archive.read(name) == body
+                assert archive.getinfo(name).compress_type == compress_type
+
+    @pytest.mark.parametrize("workers", [2, 4])
+    def test_parallel_deflate(self, workers):
+        """Test that blocks deflated on several threads form a valid stream, including repeats across blocks."""
+        body = (os.urandom(3000) * 20 + b"pattern " * 5000) * 3
+        entries = [_entry("a", body, zipfile.ZIP_DEFLATED), _entry("b", b"", zipfile.ZIP_DEFLATED)]
+        data = b"".join(iter_zip(entries, chunk_size=10_000, workers=workers))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            assert archive.read("a") == body
+            assert archive.read("b") == b""
+        # Priming each block with the previous one's tail keeps the ratio close to a serial deflate
+        serial = b"".join(iter_zip(entries, chunk_size=10_000))
+        assert len(data) < len(serial) * 1.1
+
+    def test_stored_size_is_exact(self):
+        """Test that the precomputed size of a STORED archive matches what is written."""
+        entries = [_entry(name, body, zipfile.ZIP_STORED) for name, body in FILES.items()]
+        assert archive_size(entries) == len(b"".join(iter_zip(entries)))
+
+    def test_deflated_size_is_unknown(self):
+        """Test that no size is claimed when an entry is compressed."""
+        entries = [_entry("a", b"a", zipfile.ZIP_STORED), _entry("b", b"b", zipfile.ZIP_DEFLATED)]
+        assert archive_size(entries) is None
+
+    def test_zip64(self, monkeypatch):
+        """Test that ZIP64 records are readable, using lowered limits so the test doesn't need 4 GiB of data."""
+        monkeypatch.setattr(zip_stream, "ZIP64_LIMIT", 1000)
+        monkeypatch.setattr(zip_stream, "ZIP64_COUNT_LIMIT", 3)
+        entries = [_entry(name, body, zipfile.ZIP_STORED) for name, body in FILES.items()]
+        data = b"".join(iter_zip(entries))
+
+        assert archive_size(entries) == len(data)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            for name, body in FILES.items():
+                assert archive.read(name) == body
+
+    def test_size_change_is_detected(self):
+        """Test that a source shorter than its declared size fails instead of producing a corrupt archive."""
+        entry = ZipEntry(name="a", size=10, open_source=lambda: io.BytesIO(b"short"))
+        with pytest.raises(ValueError):
+            b"".join(iter_zip([entry]))
+
+
+class TestChooseCompression:
+    """Test the per-file compression policy."""
+
+    def test_random_data_is_stored(self):
+        """Test that incompressible data is stored rather than deflated."""
+        data = os.urandom(500_000)
+        assert choose_compression(io.BytesIO(data), len(data))[0] == zipfile.ZIP_STORED
+
+    def test_text_is_deflated(self):
+        """Test that compressible data is deflated at the default level."""
+        data = b"velocity,depth\n" * 50_000
+        assert choose_compression(io.BytesIO(data), len(data)) == (zipfile.ZIP_DEFLATED, 6)
+
+    def test_small_file(self):
+        """Test that files smaller than one sample are handled."""
+        data = b"a" * 100
+        assert choose_compression(io.BytesIO(data), len(data))[0] == zipfile.ZIP_DEFLATED
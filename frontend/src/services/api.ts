@@ -249,13 +249,17 @@ export const getAllProjects = async (params: {
   received_date_end?: string;
   sort_by?: 'name' | 'status' | 'priority' | 'survey_date' | 'received_date';
   sort_order?: 'asc' | 'desc';
+  cursor?: string;
+  view?: 'full' | 'summary';
+  include_total?: boolean;
 } = {}) => {
   try {
     const defaultParams = {
       skip: 0,
       limit: 100,
       sort_by: 'name' as const,
-      sort_order: 'asc' as const
+      sort_order: 'asc' as const,
+      view: 'summary' as const
     };
 
     const queryParams = { ...defaultParams, ...params };
@@ -82,7 +82,8 @@ export interface ProjectUpdate {
 export interface ProjectListResponse {
   items: Project[];
   total: number;
-  page: number;
+  page: number | null;
   size: number;
   pages: number;
+  next_cursor?: string | null;
 } 
\ No newline at end of file